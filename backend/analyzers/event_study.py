@@ -0,0 +1,197 @@
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import get_all_stocks, get_sector_index
+
+# Event windows in trading days relative to the event day (day 0), inclusive
+DEFAULT_WINDOWS = {
+    "pre_5d": (-5, -1),
+    "1d": (0, 0),
+    "5d": (0, 4),
+    "20d": (0, 19),
+}
+PRIMARY_WINDOW = "5d"
+RECOVERY_HORIZON = 60
+PRICE_FILE_EXTENSIONS = (".parquet", ".csv")
+COMBINED_PRICE_FILE = "prices"
+
+def _read_price_file(path: str) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        frame = pd.read_parquet(path)
+    else:
+        frame = pd.read_csv(path)
+    frame.columns = [str(c).strip().lower() for c in frame.columns]
+    if "adj_close" in frame.columns:
+        frame["close"] = frame["adj_close"]
+    frame["date"] = pd.to_datetime(frame["date"]).dt.tz_localize(None).dt.normalize()
+    return frame
+
+def load_price_history(price_dir: str, symbols: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Loads daily closes from local files into a date x symbol frame.
+
+    Reads either one file per ticker (``XOM.csv``, ``XOM.parquet`` with
+    ``date``/``close`` columns) or a single long-format ``prices.csv`` /
+    ``prices.parquet`` with ``date``/``symbol``/``close`` columns.
+    """
+    symbols = list(symbols) if symbols is not None else sorted(get_all_stocks())
+    series = {}
+    for ext in PRICE_FILE_EXTENSIONS:
+        combined = os.path.join(price_dir, COMBINED_PRICE_FILE + ext)
+        if os.path.exists(combined):
+            frame = _read_price_file(combined)
+            frame = frame[frame["symbol"].isin(symbols)]
+            wide = frame.pivot_table(index="date", columns="symbol", values="close", aggfunc="last")
+            series.update({s: wide[s] for s in wide.columns})
+            break
+    for symbol in symbols:
+        if symbol in series:
+            continue
+        for ext in PRICE_FILE_EXTENSIONS:
+            path = os.path.join(price_dir, symbol + ext)
+            if os.path.exists(path):
+                frame = _read_price_file(path)
+                series[symbol] = frame.groupby("date")["close"].last()
+                break
+    if not series:
+        return pd.DataFrame(dtype=float)
+    return pd.DataFrame(series).sort_index()
+
+def compute_event_impacts(
+    prices: pd.DataFrame,
+    event_dates: Sequence[datetime],
+    windows: Dict[str, Tuple[int, int]] = DEFAULT_WINDOWS,
+    recovery_horizon: int = RECOVERY_HORIZON,
+    benchmark: Optional[str] = None,
+) -> pd.DataFrame:
+    """Computes abnormal/cumulative returns and recovery times for every event x ticker x window.
+
+    Abnormal returns are log returns in excess of ``benchmark`` (or the
+    equal-weighted mean of all tickers when no benchmark column is given).
+    The whole event set is gathered into an (events, offsets, tickers) cube
+    and windows are read off cumulative sums, so there is no per-event loop.
+    Returns a frame indexed by (event, symbol) with ``car_<window>`` and
+    ``cr_<window>`` columns as simple percentage returns, plus
+    ``recovery_days`` (NaN when the pre-event close is not regained within
+    ``recovery_horizon`` trading days).
+    """
+    names = list(windows)
+    starts = np.array([windows[n][0] for n in names])
+    ends = np.array([windows[n][1] for n in names])
+    symbols = [s for s in prices.columns if s != benchmark]
+    closes = prices[symbols].to_numpy(dtype=float)
+    num_days, num_symbols = closes.shape
+
+    log_returns = np.full_like(closes, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_returns[1:] = np.log(closes[1:] / closes[:-1])
+        if benchmark is not None:
+            bench = prices[benchmark].to_numpy(dtype=float)
+            market = np.full(num_days, np.nan)
+            market[1:] = np.log(bench[1:] / bench[:-1])
+        else:
+            valid = ~np.isnan(log_returns)
+            market = np.where(valid.any(axis=1), np.nansum(log_returns, axis=1) / np.maximum(valid.sum(axis=1), 1), np.nan)
+    abnormal = log_returns - market[:, None]
+
+    dates = pd.DatetimeIndex(pd.to_datetime(list(event_dates))).tz_localize(None).normalize()
+    positions = prices.index.searchsorted(dates, side="left")
+    # Events outside the price history produce all-NaN rows rather than errors
+    in_range = (positions >= 1) & (positions < num_days)
+
+    low = min(int(starts.min()), 0)
+    high = max(int(ends.max()), recovery_horizon)
+    offsets = np.arange(low, high + 1)
+    idx = positions[:, None] + offsets[None, :]
+    idx_ok = (idx >= 1) & (idx < num_days) & in_range[:, None]
+    idx = np.clip(idx, 0, num_days - 1)
+
+    def window_sums(returns: np.ndarray) -> np.ndarray:
+        cube = np.where(idx_ok[:, :, None], returns[idx], np.nan)
+        missing = np.isnan(cube)
+        zero = np.zeros((cube.shape[0], 1, num_symbols))
+        sums = np.concatenate([zero, np.cumsum(np.where(missing, 0.0, cube), axis=1)], axis=1)
+        gaps = np.concatenate([zero, np.cumsum(missing, axis=1)], axis=1)
+        lo, hi = starts - low, ends - low + 1
+        total = sums[:, hi, :] - sums[:, lo, :]
+        return np.where(gaps[:, hi, :] - gaps[:, lo, :] > 0, np.nan, np.expm1(total) * 100.0)
+
+    car = window_sums(abnormal)
+    cumulative = window_sums(log_returns)
+
+    pre_close = np.where(in_range[:, None], closes[np.clip(positions - 1, 0, num_days - 1)], np.nan)
+    path_idx = idx[:, -low:-low + recovery_horizon + 1]
+    path_ok = idx_ok[:, -low:-low + recovery_horizon + 1]
+    path = np.where(path_ok[:, :, None], closes[path_idx], np.nan)
+    recovered = path >= pre_close[:, None, :]
+    recovery_days = np.where(recovered.any(axis=1), recovered.argmax(axis=1), np.nan)
+
+    num_events = len(dates)
+    columns = {}
+    for w, name in enumerate(names):
+        columns[f"car_{name}"] = car[:, w, :].reshape(-1)
+        columns[f"cr_{name}"] = cumulative[:, w, :].reshape(-1)
+    columns["recovery_days"] = recovery_days.reshape(-1)
+    index = pd.MultiIndex.from_product([range(num_events), symbols], names=["event", "symbol"])
+    return pd.DataFrame(columns, index=index)
+
+def summarize_by_sector(
+    impacts: pd.DataFrame,
+    sectors: Optional[Dict[str, List[str]]] = None,
+    primary_window: str = PRIMARY_WINDOW,
+) -> pd.DataFrame:
+    """Aggregates per-ticker impacts to per-(event, sector) rows.
+
+    ``confidence_score`` is the share of the sector's tickers with a
+    computable primary-window return, ``impact_severity`` the absolute mean
+    abnormal return over that window in percent.
+    """
+    sectors = sectors or get_sector_index().sectors
+    membership = pd.DataFrame(
+        [(symbol, sector) for sector, stocks in sectors.items() for symbol in stocks],
+        columns=["symbol", "sector"],
+    )
+    sizes = membership.groupby("sector").size()
+    joined = impacts.reset_index().merge(membership, on="symbol")
+    grouped = joined.groupby(["event", "sector"])
+    summary = grouped.mean(numeric_only=True).drop(columns="symbol", errors="ignore")
+    coverage = grouped[f"car_{primary_window}"].count()
+    summary["confidence_score"] = coverage / sizes.reindex(coverage.index.get_level_values("sector")).to_numpy()
+    summary["impact_severity"] = summary[f"car_{primary_window}"].abs()
+    return summary
+
+def build_stock_impacts(
+    impacts: pd.DataFrame,
+    sectors: Optional[Dict[str, List[str]]] = None,
+    windows: Dict[str, Tuple[int, int]] = DEFAULT_WINDOWS,
+    primary_window: str = PRIMARY_WINDOW,
+) -> Dict[int, Dict[str, Dict]]:
+    """Shapes results into ``EventStockImpact`` field values keyed by event index, then sector."""
+    sectors = sectors or get_sector_index().sectors
+    summary = summarize_by_sector(impacts, sectors, primary_window)
+    performance = impacts.astype(object).where(impacts.notna(), None)
+    by_event: Dict[int, Dict[str, Dict]] = {}
+    for (event, symbol), record in zip(performance.index, performance.to_dict(orient="records")):
+        by_event.setdefault(event, {})[symbol] = record
+    result: Dict[int, Dict[str, Dict]] = {}
+    for (event, sector), row in summary.iterrows():
+        records = by_event.get(event, {})
+        stocks = {s: records[s] for s in sectors[sector] if s in records}
+        result.setdefault(int(event), {})[sector] = {
+            "impact_severity": _optional_float(row["impact_severity"]),
+            "confidence_score": _optional_float(row["confidence_score"]),
+            "historical_performance": {
+                "windows": {name: list(bounds) for name, bounds in windows.items()},
+                "primary_window": primary_window,
+                "sector_mean": {k: _optional_float(v) for k, v in row.items()
+                                if k not in ("impact_severity", "confidence_score")},
+                "stocks": stocks,
+            },
+        }
+    return result
+
+def _optional_float(value) -> Optional[float]:
+    return None if pd.isna(value) else float(value)
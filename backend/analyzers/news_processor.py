@@ -1,6 +1,7 @@
 import re
 from typing import List, Dict, Any
 from scrapers.news_api_client import GEO_KEYWORDS, REGIONS
+from analyzers.sentiment import score_sentiment
 
 EVENT_TYPES = {
     "sanctions": ["sanction", "embargo", "ban"],
@@ -11,26 +12,55 @@ EVENT_TYPES = {
     "cyber": ["cyber", "hack", "cyberattack", "ransomware"],
     "political": ["election", "coup", "protest", "vote", "referendum"]
 }
-SENTIMENT = {
-    "negative": ["sanction", "conflict", "attack", "ban", "crisis", "protest", "coup", "war", "embargo"],
-    "positive": ["talks", "negotiation", "deal", "agreement", "peace", "summit"],
-}
 
 def relevance_score(text: str) -> float:
     """Simple relevance score based on keyword count."""
     text = text.lower()
     return min(1.0, sum(text.count(k) for k in GEO_KEYWORDS) / 5.0)
 
+# Whole-word patterns for every region name, compiled once. All-caps short names
+# ("US", "EU", "UK") are matched as written, or "told us" would count as the US;
+# the others are matched case-insensitively.
+REGION_PATTERNS = [
+    (region, name, needle, name.isupper(), re.compile(rf"\b{re.escape(needle)}\b"))
+    for region, names in REGIONS.items()
+    for name in names
+    for needle in [name if name.isupper() else name.lower()]
+]
+
+# Names in REGIONS that refer to the same country, stored under one canonical name
+COUNTRY_ALIASES = {
+    "US": "United States",
+    "USA": "United States",
+    "America": "United States",
+    "PRC": "China",
+    "Russian": "Russia",
+    "Tehran": "Iran",
+    "UK": "United Kingdom",
+    "Britain": "United Kingdom",
+}
+
+# Stored country name by lower-cased name or alias, for looking up user input
+COUNTRY_NAMES = {name.lower(): COUNTRY_ALIASES.get(name, name) for _, name, _, _, _ in REGION_PATTERNS}
+COUNTRY_NAMES.update({name.lower(): name for name in COUNTRY_ALIASES.values()})
+
+def canonical_country(name: str) -> str:
+    """The name extract_countries_regions stores for ``name`` or one of its aliases, matched case-insensitively."""
+    name = name.strip()
+    return COUNTRY_NAMES.get(name.lower(), name)
+
 def extract_countries_regions(text: str) -> (List[str], str):
     """Extracts countries and region from text."""
-    found_countries = []
+    lowered = text.lower()
+    found_countries = set()
     found_region = None
-    for region, names in REGIONS.items():
-        for name in names:
-            if re.search(rf"\\b{name.lower()}\\b", text.lower()):
-                found_countries.append(name)
-                found_region = region
-    return list(set(found_countries)), found_region
+    for region, name, needle, exact, pattern in REGION_PATTERNS:
+        haystack = text if exact else lowered
+        # The substring test is much cheaper and rules out most names
+        if needle in haystack and pattern.search(haystack):
+            found_countries.add(COUNTRY_ALIASES.get(name, name))
+            found_region = region
+    return sorted(found_countries), found_region
 
 def categorize_event(text: str) -> str:
     """Categorizes event type based on keywords."""
@@ -41,13 +71,8 @@ def categorize_event(text: str) -> str:
     return "other"
 
 def sentiment_analysis(text: str) -> str:
-    """Basic sentiment analysis for market impact."""
-    text = text.lower()
-    if any(k in text for k in SENTIMENT["negative"]):
-        return "negative"
-    if any(k in text for k in SENTIMENT["positive"]):
-        return "positive"
-    return "neutral"
+    """Market sentiment label from the weighted lexicon scorer (analyzers/sentiment.py)."""
+    return score_sentiment(text)[1]
 
 def process_article(article: Dict[str, Any]) -> Dict[str, Any]:
     """Processes a single news article for all fields."""
@@ -55,7 +80,7 @@ def process_article(article: Dict[str, Any]) -> Dict[str, Any]:
     score = relevance_score(text)
     countries, region = extract_countries_regions(text)
     event_type = categorize_event(text)
-    sentiment = sentiment_analysis(text)
+    sentiment_score, sentiment = score_sentiment(text)
     return {
         "id": article.get("raw", {}).get("link", article.get("title", ""))[:64],  # crude unique id
         "title": article.get("title"),
@@ -67,5 +92,6 @@ def process_article(article: Dict[str, Any]) -> Dict[str, Any]:
         "countries": countries,
         "event_type": event_type,
         "market_sentiment": sentiment,
+        "sentiment_score": sentiment_score,  # not stored by database.store_news_articles, which keeps the label
         "affected_sectors": [],  # can be filled in later
     } 
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""
+Lexicon-based market sentiment for news text.
+
+Each text is lower-cased and tokenized once. Every token is then one dict
+lookup in TOKEN_TABLE, which maps lexicon words (with their plural, past and
+-ing forms), negations, intensifiers and clause punctuation to their role:
+
+- A lexicon word adds its weight to the raw score.
+- An intensifier or dampener ("major", "slightly") scales the next weighted
+  word within INTENSITY_SCOPE tokens.
+- A negation ("not", "no", "never", "without", "isn't") flips and damps the
+  weighted words in the next NEGATION_SCOPE tokens.
+- Punctuation ends any pending negation or intensity.
+
+The raw sum is squashed into (-1, 1) with x / sqrt(x^2 + NORMALIZATION_ALPHA).
+So several "agreement"/"peace" hits outweigh a single "ban", rather than the
+first matching keyword list deciding. Scores within LABEL_THRESHOLD of zero
+are labelled neutral.
+"""
+
+import math
+import re
+from typing import Dict, Iterable, List, Tuple
+
+# Weights on a -3..3 scale; market-relevant geopolitical vocabulary
+LEXICON: Dict[str, float] = {
+    # negative
+    "war": -3.0, "invasion": -3.0, "invade": -3.0, "coup": -3.0, "bomb": -3.0, "bombing": -3.0,
+    "terror": -3.0, "terrorist": -3.0, "kill": -3.0, "casualty": -2.5, "casualties": -2.5,
+    "attack": -2.5, "conflict": -2.5, "crisis": -2.5, "collapse": -2.5, "recession": -2.5,
+    "violence": -2.5, "riot": -2.5, "ransomware": -2.5, "cyberattack": -2.5,
+    "missile": -2.0, "drone": -1.0, "sanction": -2.0, "embargo": -2.0, "blockade": -2.0,
+    "escalate": -2.0, "escalation": -2.0, "threat": -2.0, "threaten": -2.0, "retaliate": -2.0,
+    "retaliation": -2.0, "shortage": -2.0, "disrupt": -2.0, "disruption": -2.0, "unrest": -2.0,
+    "hack": -2.0, "default": -2.0, "plunge": -2.0, "slump": -2.0, "downturn": -2.0,
+    "ban": -1.5, "strike": -1.5, "protest": -1.5, "tension": -1.5, "fear": -1.5, "loss": -1.5,
+    "tariff": -1.0, "inflation": -1.0, "concern": -1.0, "risk": -1.0, "volatility": -1.0,
+    "volatile": -1.0, "decline": -1.0, "uncertainty": -1.0, "sell-off": -1.5,
+    # positive
+    "peace": 2.5, "ceasefire": 2.5, "truce": 2.0, "agreement": 2.0, "accord": 2.0,
+    "cooperation": 2.0, "cooperate": 2.0, "stability": 2.0, "recovery": 2.0, "recover": 2.0,
+    "optimism": 2.0, "optimistic": 2.0, "de-escalation": 2.0, "breakthrough": 2.0,
+    "deal": 1.5, "treaty": 1.5, "partnership": 1.5, "resolve": 1.5, "resolution": 1.5,
+    "stable": 1.5, "growth": 1.5, "rally": 1.5, "boost": 1.5, "easing": 1.5, "ease": 1.5,
+    "talks": 1.0, "negotiation": 1.0, "negotiate": 1.0, "summit": 1.0, "diplomacy": 1.0,
+    "diplomatic": 1.0, "alliance": 1.0, "aid": 1.0, "support": 1.0, "gain": 1.0, "surge": 0.5,
+}
+NEGATIONS = {
+    "not", "no", "never", "without", "nor", "neither", "none", "cannot", "lack", "lacks",
+    "don't", "doesn't", "didn't", "isn't", "aren't", "wasn't", "weren't", "won't", "wouldn't",
+    "can't", "couldn't", "shouldn't", "hasn't", "haven't", "hadn't",
+}
+INTENSIFIERS = {
+    "very": 1.3, "highly": 1.3, "extremely": 1.5, "major": 1.3, "massive": 1.5, "severe": 1.5,
+    "sharp": 1.3, "sharply": 1.3, "deeply": 1.3, "significant": 1.2, "significantly": 1.2,
+    "slightly": 0.5, "minor": 0.6, "limited": 0.7, "modest": 0.7, "partial": 0.7, "somewhat": 0.7,
+}
+NEGATION_SCOPE = 3  # tokens after a negation whose weights are flipped
+INTENSITY_SCOPE = 2  # tokens after an intensifier that it can reach
+NEGATION_FACTOR = -0.75  # "no deal" is negative, but weaker than an outright negative word
+NORMALIZATION_ALPHA = 15.0
+LABEL_THRESHOLD = 0.05
+
+# Words, keeping inner hyphens/apostrophes ("de-escalation", "isn't"), and clause punctuation
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:['\-][a-z]+)*|[.,;:!?]")
+
+# Token roles in TOKEN_TABLE
+_NEGATE, _SCALE, _BREAK = 'negate', 'scale', 'break'
+_VOWELS = set('aeiou')
+
+def _inflections(word: str) -> Iterable[str]:
+    yield word
+    if word.endswith(('s', 'x', 'z', 'ch', 'sh', 'o')):
+        yield word + 'es'  # "embargoes"
+    elif word.endswith('y') and word[-2:-1] not in _VOWELS:
+        yield from (word[:-1] + 'ies', word[:-1] + 'ied')  # "rallies", "rallied"
+    else:
+        yield word + 's'
+    stem = word[:-1] if word.endswith('e') else word
+    yield from (stem + 'ed', stem + 'ing')
+    # Consonant-vowel-consonant endings double the consonant: "banned", "warring"
+    if (len(word) >= 3 and word[-1] not in _VOWELS and word[-1] not in 'wxy'
+            and word[-2] in _VOWELS and word[-3] not in _VOWELS):
+        yield from (word + word[-1] + 'ed', word + word[-1] + 'ing')
+
+def _build_token_table() -> Dict[str, Tuple]:
+    table = {}
+    for word, weight in LEXICON.items():
+        for form in _inflections(word):
+            table.setdefault(form, (None, weight))
+    for word, factor in INTENSIFIERS.items():
+        table[word] = (_SCALE, factor)
+    for word in NEGATIONS:
+        table[word] = (_NEGATE, 0.0)
+    for mark in '.,;:!?':
+        table[mark] = (_BREAK, 0.0)
+    # Explicit entries win over generated inflections
+    table.update((word, (None, weight)) for word, weight in LEXICON.items())
+    return table
+
+TOKEN_TABLE = _build_token_table()
+
+def raw_score(tokens: List[str]) -> float:
+    """Sum of lexicon weights over ``tokens``, with negation and intensity applied"""
+    total = 0.0
+    negated_until = scaled_until = -1
+    scale = 1.0
+    # Most tokens play no part; only the positions of the ones that do matter for the scopes
+    hits = [(i, entry) for i, entry in enumerate(map(TOKEN_TABLE.get, tokens)) if entry is not None]
+    for i, (role, value) in hits:
+        if role is None:
+            weight = value
+            if i <= scaled_until:
+                weight *= scale
+                scaled_until = -1
+            if i <= negated_until:
+                weight *= NEGATION_FACTOR
+            total += weight
+        elif role is _SCALE:
+            # "very severe" stacks; a modifier only reaches the next INTENSITY_SCOPE tokens
+            scale = scale * value if i <= scaled_until else value
+            scaled_until = i + INTENSITY_SCOPE
+        elif role is _NEGATE:
+            negated_until = i + NEGATION_SCOPE
+        else:
+            negated_until = scaled_until = -1
+    return total
+
+def normalize(total: float) -> float:
+    """Squash a raw score into (-1, 1)"""
+    return total / math.sqrt(total * total + NORMALIZATION_ALPHA) if total else 0.0
+
+def label_for(score: float) -> str:
+    if score >= LABEL_THRESHOLD:
+        return "positive"
+    if score <= -LABEL_THRESHOLD:
+        return "negative"
+    return "neutral"
+
+def score_sentiment(text: str) -> Tuple[float, str]:
+    """(score in (-1, 1), label) for one text"""
+    score = normalize(raw_score(TOKEN_PATTERN.findall((text or '').lower())))
+    return score, label_for(score)
+
+def score_batch(texts: Iterable[str]) -> Tuple[List[float], List[str]]:
+    """Scores and labels for many texts, with the lookups bound once for the whole batch"""
+    findall, score, label = TOKEN_PATTERN.findall, raw_score, label_for
+    scores = [normalize(score(findall((text or '').lower()))) for text in texts]
+    return scores, [label(s) for s in scores]
@@ -0,0 +1,221 @@
+"""
+ASGI entry point: the upstream-bound routes run natively on the event loop,
+everything else is served by the Flask app on a thread pool.
+
+``GET /api/news`` and ``POST /api/analysis/full`` spend almost all their time
+waiting on NewsData.io and Alpha Vantage. Here they await a shared httpx
+connection pool (scrapers/http_pool.py) and issue independent upstream calls
+concurrently, so one worker holds many in-flight requests instead of one per
+thread. They apply the same rate limit as the Flask views and answer errors
+with the same bodies as the Flask errorhandlers. The stack sampler in
+profiling.py follows a request's thread, so these views are not profiled.
+
+``GET /api/news/stream`` is served here as an async generator too. An open
+Server-Sent Events connection then waits on the event loop instead of
+holding one of the WSGI pool's threads for as long as the client listens.
+
+Frontend files are answered here too, from the precompressed manifest built
+by create_app (static_assets.py), without a hop to the WSGI thread pool.
+
+Run with ``python serve.py --asgi`` (gunicorn + uvicorn workers) or
+``uvicorn --factory asgi:create_asgi_app``.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+from werkzeug.exceptions import HTTPException
+
+import metrics
+from mainApp import (create_app, analyze_geopolitical_impact, check_rate_limit, get_affected_stocks,
+                     get_stock_data_async, http_error_payload, internal_error_payload, news_payload,
+                     full_analysis_payload)
+from news_stream import broadcaster
+from responses import encode_json
+from scrapers.http_pool import close_async_client
+from scrapers.news_api_client import fetch_latest_news_async
+
+logger = logging.getLogger(__name__)
+
+class AsyncRequest:
+    """The parts of an ASGI HTTP request the async views need"""
+
+    def __init__(self, scope, body: bytes):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.headers = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in scope['headers']}
+        self.args = {k: v[0] for k, v in parse_qs(scope.get('query_string', b'').decode('latin-1')).items()}
+        self.body = body
+        self.remote_addr = scope['client'][0] if scope.get('client') else None
+
+    def arg_int(self, name, default):
+        try:
+            return int(self.args[name])
+        except (KeyError, ValueError):
+            return default
+
+    def get_json(self):
+        try:
+            return json.loads(self.body) if self.body else None
+        except ValueError:
+            return None
+
+    def encode(self, payload, status=200):
+        return encode_json(payload, status, accept_encoding=self.headers.get('accept-encoding', ''),
+                           if_none_match=self.headers.get('if-none-match'))
+
+async def news_view(app, req):
+    """Async GET /api/news"""
+    try:
+        limit = req.arg_int('limit', app.config['MAX_NEWS_ARTICLES'])
+        articles, stale = await fetch_latest_news_async(limit)
+        return req.encode(news_payload(articles, limit, stale))
+    except Exception as e:
+        logger.error(f"Error in get_news: {e}")
+        return req.encode({'error': 'Failed to fetch news', 'message': str(e)}, 500)
+
+async def full_analysis_view(app, req):
+    """Async POST /api/analysis/full; quote lookups for all sectors run concurrently"""
+    try:
+        data = req.get_json()
+        if not data or 'text' not in data:
+            return req.encode({'error': 'Missing required field: text'}, 400)
+
+        news_text = data['text']
+        impact_analysis = analyze_geopolitical_impact(news_text)
+        affected_stocks = get_affected_stocks(impact_analysis.get('affected_sectors', []))
+        stock_data = {}
+        for sector_data in await asyncio.gather(*(get_stock_data_async(s) for s in affected_stocks.values())):
+            stock_data.update(sector_data)
+        return req.encode(full_analysis_payload(news_text, impact_analysis, affected_stocks, stock_data))
+    except Exception as e:
+        logger.error(f"Error in full_analysis: {e}")
+        return req.encode({'error': 'Failed to perform full analysis', 'message': str(e)}, 500)
+
+ASYNC_ROUTES = {
+    ('GET', '/api/news'): news_view,
+    ('POST', '/api/analysis/full'): full_analysis_view,
+}
+RATE_LIMITED_VIEWS = {news_view, full_analysis_view}  # their Flask views carry @rate_limit
+
+async def call_view(app, view, req):
+    """Run an async view behind the Flask rate limit and errorhandlers"""
+    if view in RATE_LIMITED_VIEWS:
+        exceeded = check_rate_limit(app.config, req.remote_addr)
+        if exceeded:
+            return req.encode(exceeded, 429)
+    try:
+        return await view(app, req)
+    except HTTPException as e:
+        return req.encode(http_error_payload(e), e.code)
+    except Exception as e:
+        return req.encode(internal_error_payload(e), 500)
+
+SSE_HEADERS = [
+    (b'content-type', b'text/event-stream; charset=utf-8'),
+    (b'cache-control', b'no-cache'),
+    (b'x-accel-buffering', b'no'),
+]
+
+async def _wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+async def news_stream_view(req, receive, send):
+    """Body of the async GET /api/news/stream: events until the client disconnects"""
+    events = broadcaster.astream(
+        last_event_id=req.headers.get('last-event-id') or req.args.get('last_event_id'),
+        region=req.args.get('region'),
+        event_type=req.args.get('event_type')
+    )
+
+    async def pump():
+        async for message in events:
+            await send({'type': 'http.response.body', 'body': message.encode('utf-8'), 'more_body': True})
+
+    tasks = [asyncio.ensure_future(pump()), asyncio.ensure_future(_wait_for_disconnect(receive))]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await events.aclose()
+
+async def static_view(app, req):
+    """Frontend file from the static manifest, as serve_frontend sends it"""
+    return app.extensions['static_manifest'].serve(req.path.lstrip('/') or 'index.html',
+                                                   req.headers.get('accept-encoding', ''),
+                                                   req.headers.get('if-none-match'))
+
+def _is_static(scope) -> bool:
+    return scope['method'] in ('GET', 'HEAD') and not scope['path'].startswith('/api/')
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await close_async_client()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+def create_asgi_app(config_name=None, wsgi_threads=None):
+    """Build the Flask app and wrap it with the async routes"""
+    app = create_app(config_name)
+    wsgi = WSGIMiddleware(app, workers=wsgi_threads or app.config['SERVER_THREADS'])
+    record_metrics = app.config['METRICS_ENABLED']
+    manifest = app.extensions.get('static_manifest')
+
+    def record(req, route, status, start):
+        if record_metrics:
+            labels = {'method': req.method, 'route': route, 'status': status}
+            metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, **labels)
+            metrics.HTTP_REQUESTS_TOTAL.inc(**labels)
+
+    async def asgi_app(scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await _lifespan(receive, send)
+        if scope['type'] == 'http' and (scope['method'], scope['path']) == ('GET', '/api/news/stream'):
+            start = time.perf_counter()
+            req = AsyncRequest(scope, await _read_body(receive))
+            await send({'type': 'http.response.start', 'status': 200, 'headers': SSE_HEADERS})
+            record(req, req.path, 200, start)  # up to the headers, as the Flask route is timed
+            with app.app_context():
+                return await news_stream_view(req, receive, send)
+        view = ASYNC_ROUTES.get((scope.get('method'), scope.get('path'))) if scope['type'] == 'http' else None
+        if view is None and manifest is not None and scope['type'] == 'http' and _is_static(scope):
+            view = static_view
+        if view is None:
+            return await wsgi(scope, receive, send)
+
+        start = time.perf_counter()
+        req = AsyncRequest(scope, await _read_body(receive))
+        with app.app_context():
+            status, headers, body = await call_view(app, view, req)
+        headers['Content-Length'] = str(len(body))
+        if req.method == 'HEAD':
+            body = b''
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers.items()],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+        # Labelled with the Flask rule, as metrics.init_app does
+        record(req, '/<path:path>' if view is static_view else req.path, status, start)
+
+    return asgi_app
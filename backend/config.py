@@ -1,14 +1,19 @@
 import os
+import re
+import json
+import threading
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+DEFAULT_SECRET_KEY = 'your-secret-key-change-in-production'
+
 class Config:
     """Base configuration class"""
     
     # Flask Configuration
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'your-secret-key-change-in-production'
+    SECRET_KEY = os.environ.get('SECRET_KEY') or DEFAULT_SECRET_KEY
     DEBUG = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
     
     # Database Configuration
@@ -21,11 +26,11 @@ class Config:
     
     # NewsData.io specific configuration
     NEWSDATA_API_KEY = os.environ.get('NEWS_API_KEY')  # Using same env var
-    NEWSDATA_BASE_URL = 'https://newsdata.io/api/1/news'
+    NEWSDATA_BASE_URL = os.environ.get('NEWSDATA_BASE_URL', 'https://newsdata.io/api/1/news')
     
     # Alternative news APIs
     ALPHA_VANTAGE_API_KEY = os.environ.get('ALPHA_VANTAGE_API_KEY')
-    ALPHA_VANTAGE_BASE_URL = 'https://www.alphavantage.co/query'
+    ALPHA_VANTAGE_BASE_URL = os.environ.get('ALPHA_VANTAGE_BASE_URL', 'https://www.alphavantage.co/query')
     
     # Reuters API (if available)
     REUTERS_API_KEY = os.environ.get('REUTERS_API_KEY')
@@ -60,6 +65,9 @@ class Config:
     IEX_API_KEY = os.environ.get('IEX_API_KEY')
     IEX_BASE_URL = 'https://cloud.iexapis.com/stable'
     
+    # Local price history store (see price_store.py)
+    PRICE_STORE_DIR = os.environ.get('PRICE_STORE_DIR', 'data/prices')
+    
     # Stock Sectors for Analysis
     SECTORS = {
         'energy': ['XOM', 'CVX', 'COP', 'EOG', 'SLB', 'HAL', 'KMI', 'PSX'],
@@ -73,6 +81,23 @@ class Config:
         'materials': ['LIN', 'APD', 'FCX', 'NEM', 'DOW', 'DD', 'CAT', 'DE']
     }
     
+    # Keywords mapping event text to affected sectors
+    SECTOR_KEYWORDS = {
+        'energy': ['oil', 'gas', 'energy', 'petroleum', 'renewable', 'solar', 'wind'],
+        'defense': ['military', 'defense', 'weapons', 'nato', 'army', 'navy', 'air force'],
+        'airlines': ['airline', 'aviation', 'flight', 'airport', 'travel'],
+        'shipping': ['shipping', 'cargo', 'freight', 'logistics', 'supply chain'],
+        'tech': ['technology', 'cyber', 'digital', 'internet', 'software'],
+        'finance': ['bank', 'financial', 'currency', 'market', 'trading'],
+        'healthcare': ['health', 'medical', 'pharmaceutical', 'hospital'],
+        'consumer': ['retail', 'consumer', 'shopping', 'goods'],
+        'materials': ['steel', 'aluminum', 'copper', 'mining', 'chemicals']
+    }
+    
+    # Optional JSON file overriding SECTORS/SECTOR_KEYWORDS, e.g.
+    # {"energy": {"symbols": ["XOM"], "keywords": ["oil"]}, ...}
+    SECTOR_DATA_FILE = os.environ.get('SECTOR_DATA_FILE')
+    
     # Geopolitical Keywords for Event Detection
     GEOPOLITICAL_KEYWORDS = [
         # Conflicts and Wars
@@ -116,6 +141,15 @@ class Config:
     # Application Settings
     MAX_NEWS_ARTICLES = int(os.environ.get('MAX_NEWS_ARTICLES', '50'))
     NEWS_UPDATE_INTERVAL = int(os.environ.get('NEWS_UPDATE_INTERVAL', '300'))  # 5 minutes in seconds
+    NEWS_REFRESH_MAX_PAGES = int(os.environ.get('NEWS_REFRESH_MAX_PAGES', '5'))  # upstream pages per refresh while catching up
+    MAX_NEWS_PAGE_SIZE = int(os.environ.get('MAX_NEWS_PAGE_SIZE', '500'))  # cap for ?limit= on listing endpoints
+    HOT_SET_SIZE = int(os.environ.get('HOT_SET_SIZE', '2000'))  # recent articles kept in memory for listings; 0 disables
+    HOT_SET_REFRESH_SECONDS = float(os.environ.get('HOT_SET_REFRESH_SECONDS', '60'))  # reload to pick up other workers' inserts
+    HOT_SET_COMPLETE_SECONDS = float(os.environ.get('HOT_SET_COMPLETE_SECONDS', '5'))  # after a reload, trust a short set to hold every article for this long
+    STATS_DEFAULT_DAYS = int(os.environ.get('STATS_DEFAULT_DAYS', '30'))  # /api/stats window when ?since= is omitted
+    STATS_MAX_BUCKETS = int(os.environ.get('STATS_MAX_BUCKETS', '2000'))  # largest since..until range in buckets
+    STATS_CACHE_SECONDS = int(os.environ.get('STATS_CACHE_SECONDS', '60'))
+    STATIC_ASSET_CACHE = os.environ.get('STATIC_ASSET_CACHE', 'True').lower() == 'true'  # fingerprinted, precompressed frontend (see static_assets.py)
     
     # Impact Analysis Settings
     IMPACT_ANALYSIS_ENABLED = os.environ.get('IMPACT_ANALYSIS_ENABLED', 'True').lower() == 'true'
@@ -129,11 +163,45 @@ class Config:
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FILE = os.environ.get('LOG_FILE', 'geopoli_news.log')
     
+    # Instrumentation
+    SLOW_QUERY_THRESHOLD = float(os.environ.get('SLOW_QUERY_THRESHOLD', '0.5'))  # seconds
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+    
+    # Opt-in request profiling (see profiling.py); no hooks are installed unless enabled
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'False').lower() == 'true'
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0.01'))
+    PROFILE_INTERVAL = float(os.environ.get('PROFILE_INTERVAL', '0.005'))  # seconds between stack samples
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+    
     # Rate Limiting
     RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'True').lower() == 'true'
     RATE_LIMIT_REQUESTS = int(os.environ.get('RATE_LIMIT_REQUESTS', '100'))
     RATE_LIMIT_WINDOW = int(os.environ.get('RATE_LIMIT_WINDOW', '3600'))  # 1 hour
     
+    # Upstream HTTP (shared async connection pool, see scrapers/http_pool.py)
+    UPSTREAM_TIMEOUT = float(os.environ.get('UPSTREAM_TIMEOUT', '10'))  # seconds
+    UPSTREAM_MAX_CONNECTIONS = int(os.environ.get('UPSTREAM_MAX_CONNECTIONS', '100'))
+    UPSTREAM_MAX_KEEPALIVE = int(os.environ.get('UPSTREAM_MAX_KEEPALIVE', '20'))
+    MAX_QUOTE_SYMBOLS = int(os.environ.get('MAX_QUOTE_SYMBOLS', '5'))  # upstream quote lookups per sector
+    UPSTREAM_RETRIES = int(os.environ.get('UPSTREAM_RETRIES', '2'))  # extra attempts after a timeout, 429 or 5xx
+    UPSTREAM_RETRY_BACKOFF = float(os.environ.get('UPSTREAM_RETRY_BACKOFF', '0.2'))  # seconds, doubled per attempt, full jitter
+    UPSTREAM_RETRY_MAX_BACKOFF = float(os.environ.get('UPSTREAM_RETRY_MAX_BACKOFF', '2'))
+    UPSTREAM_BREAKER_FAILURES = int(os.environ.get('UPSTREAM_BREAKER_FAILURES', '5'))  # consecutive failed calls, each counted once its retries are exhausted, that open the circuit
+    UPSTREAM_BREAKER_RESET = float(os.environ.get('UPSTREAM_BREAKER_RESET', '30'))  # seconds before a trial call
+    NEWS_CACHE_TTL = float(os.environ.get('NEWS_CACHE_TTL', '60'))  # seconds upstream news is served as fresh
+    NEWS_CACHE_MAX_STALE = float(os.environ.get('NEWS_CACHE_MAX_STALE', '3600'))  # and then as stale while refreshing
+    QUOTE_CACHE_TTL = float(os.environ.get('QUOTE_CACHE_TTL', '60'))
+    QUOTE_CACHE_MAX_STALE = float(os.environ.get('QUOTE_CACHE_MAX_STALE', '86400'))
+    
+    # Production server (see serve.py)
+    SERVER_BIND = os.environ.get('SERVER_BIND', '0.0.0.0:' + os.environ.get('PORT', '5001'))
+    SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', str(min(2 * (os.cpu_count() or 1) + 1, 8))))
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS', '4'))  # threads per worker
+    SERVER_MAX_REQUESTS = int(os.environ.get('SERVER_MAX_REQUESTS', '2000'))  # recycle a worker after this many requests; 0 disables
+    SERVER_MAX_REQUESTS_JITTER = int(os.environ.get('SERVER_MAX_REQUESTS_JITTER', '200'))
+    SERVER_TIMEOUT = int(os.environ.get('SERVER_TIMEOUT', '60'))  # seconds
+    SERVER_GRACEFUL_TIMEOUT = int(os.environ.get('SERVER_GRACEFUL_TIMEOUT', '30'))  # seconds
+    
     # Security Settings
     CORS_ENABLED = os.environ.get('CORS_ENABLED', 'True').lower() == 'true'
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
@@ -150,6 +218,8 @@ class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     LOG_LEVEL = 'DEBUG'
+    # Serve frontend files straight from disk so edits show up without a restart
+    STATIC_ASSET_CACHE = os.environ.get('STATIC_ASSET_CACHE', 'False').lower() == 'true'
 
 class ProductionConfig(Config):
     """Production configuration"""
@@ -222,45 +292,129 @@ def validate_required_keys():
     
     return True
 
+def _trie_pattern(words):
+    """Build a regex alternation shaped as a prefix trie, so matching cost does not grow with the word count"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node):
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != '']
+        if not alternatives:
+            return ''
+        if len(alternatives) == 1 and '' not in node:
+            return alternatives[0]
+        body = '(?:' + '|'.join(alternatives) + ')'
+        return body + '?' if '' in node else body
+
+    return build(trie)
+
+class KeywordMatcher:
+    """Finds every keyword occurring as a substring of a text in a single regex pass.
+
+    Keywords map to arbitrary labels. A lookahead over a trie-shaped
+    alternation reports the longest keyword starting at each position;
+    labels of any keyword contained inside a matched one are folded into it
+    at build time, so the result equals checking ``keyword in text`` for
+    every keyword.
+    """
+
+    def __init__(self, keyword_labels):
+        keywords = sorted((k for k in keyword_labels if k), key=len)
+        self.pattern = re.compile('(?=(' + _trie_pattern(keywords) + '))') if keywords else None
+        self.labels = {}
+        # Shorter keywords are folded first; every proper substring of a
+        # keyword lies in the keyword minus its first or last character.
+        for keyword in keywords:
+            labels = set(keyword_labels[keyword])
+            for part in (keyword[:-1], keyword[1:]):
+                for other in self.pattern.findall(part):
+                    labels |= self.labels[other]
+            self.labels[keyword] = frozenset(labels)
+
+    def match(self, text):
+        """Return the set of labels whose keywords appear in ``text``."""
+        if not self.pattern or not text:
+            return set()
+        found = set()
+        for keyword in set(self.pattern.findall(text.lower())):
+            found |= self.labels[keyword]
+        return found
+
+    def matches_any(self, text):
+        return bool(self.pattern and text and self.pattern.search(text.lower()))
+
+class SectorIndex:
+    """Precomputed sector lookups built once from a sector -> symbols/keywords mapping."""
+
+    def __init__(self, sectors, sector_keywords):
+        self.sectors = {name.lower(): list(symbols) for name, symbols in sectors.items()}
+        self.keyword_sectors = {}
+        for sector, keywords in sector_keywords.items():
+            for keyword in keywords:
+                self.keyword_sectors.setdefault(keyword.lower(), set()).add(sector.lower())
+        self.symbol_sectors = {}
+        for sector, symbols in self.sectors.items():
+            for symbol in symbols:
+                self.symbol_sectors.setdefault(symbol, set()).add(sector)
+        self.all_symbols = frozenset(self.symbol_sectors)
+        # Preserve declaration order of sectors in results
+        self.order = {sector: i for i, sector in enumerate(
+            list(self.sectors) + [s.lower() for s in sector_keywords if s.lower() not in self.sectors]
+        )}
+        self.matcher = KeywordMatcher(self.keyword_sectors)
+
+    def affected_sectors(self, text):
+        return sorted(self.matcher.match(text), key=self.order.__getitem__)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(
+            {name: entry.get('symbols', []) for name, entry in data.items()},
+            {name: entry.get('keywords', []) for name, entry in data.items()}
+        )
+
+_sector_index = None
+_sector_index_lock = threading.Lock()
+_geopolitical_matcher = KeywordMatcher({k: ('geopolitical',) for k in Config.GEOPOLITICAL_KEYWORDS})
+
+def load_sector_index(path=None):
+    """(Re)build the sector index from ``path``, SECTOR_DATA_FILE, or the Config defaults"""
+    global _sector_index
+    path = path or Config.SECTOR_DATA_FILE
+    index = SectorIndex.from_file(path) if path else SectorIndex(Config.SECTORS, Config.SECTOR_KEYWORDS)
+    with _sector_index_lock:
+        _sector_index = index
+    return index
+
+def get_sector_index():
+    """Get the process-wide sector index, building it on first use"""
+    return _sector_index or load_sector_index()
+
 def get_sector_stocks(sector_name):
     """Get list of stocks for a given sector"""
-    return Config.SECTORS.get(sector_name.lower(), [])
+    return get_sector_index().sectors.get(sector_name.lower(), [])
+
+def get_symbol_sectors(symbol):
+    """Get the sectors a stock symbol belongs to"""
+    return get_sector_index().symbol_sectors.get(symbol, set())
 
 def get_all_stocks():
     """Get all stocks across all sectors"""
-    all_stocks = []
-    for stocks in Config.SECTORS.values():
-        all_stocks.extend(stocks)
-    return list(set(all_stocks))  # Remove duplicates
+    return get_sector_index().all_symbols
 
 def is_geopolitical_event(text):
     """Check if text contains geopolitical keywords"""
-    text_lower = text.lower()
-    return any(keyword in text_lower for keyword in Config.GEOPOLITICAL_KEYWORDS)
+    return _geopolitical_matcher.matches_any(text)
 
 def get_affected_sectors(event_text):
     """Determine which sectors might be affected by a geopolitical event"""
-    text_lower = event_text.lower()
-    affected_sectors = []
-    
-    # Simple keyword-based sector mapping
-    sector_keywords = {
-        'energy': ['oil', 'gas', 'energy', 'petroleum', 'renewable', 'solar', 'wind'],
-        'defense': ['military', 'defense', 'weapons', 'nato', 'army', 'navy', 'air force'],
-        'airlines': ['airline', 'aviation', 'flight', 'airport', 'travel'],
-        'shipping': ['shipping', 'cargo', 'freight', 'logistics', 'supply chain'],
-        'tech': ['technology', 'cyber', 'digital', 'internet', 'software'],
-        'finance': ['bank', 'financial', 'currency', 'market', 'trading'],
-        'healthcare': ['health', 'medical', 'pharmaceutical', 'hospital'],
-        'consumer': ['retail', 'consumer', 'shopping', 'goods'],
-        'materials': ['steel', 'aluminum', 'copper', 'mining', 'chemicals']
-    }
-    
-    for sector, keywords in sector_keywords.items():
-        if any(keyword in text_lower for keyword in keywords):
-            affected_sectors.append(sector)
-    
-    return affected_sectors
+    return get_sector_index().affected_sectors(event_text)
 
 # Validate configuration on import
 if __name__ == '__main__':
@@ -1,21 +1,74 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from models import Base, NewsArticle
+import json
+import logging
+import threading
+from sqlalchemy import create_engine, func, select, text, and_
+from sqlalchemy.orm import aliased, sessionmaker
+from models import Base, NewsArticle, NewsEvent, IngestionWatermark, NewsStat, ArticleCountry
 from config import get_config
-from datetime import datetime
+from news_stream import broadcaster
+from hot_store import hot_articles
+from metrics import instrument_engine
+from datetime import datetime, timezone
 
-config = get_config()
-DATABASE_URL = config.DATABASE_URL
+logger = logging.getLogger(__name__)
 
-engine = create_engine(DATABASE_URL, echo=False)
-SessionLocal = sessionmaker(bind=engine)
+# Created on first use so importing this module never touches the database
+engine = None
+SessionLocal = None
+_engine_lock = threading.Lock()
+
+def _active_config():
+    """Settings of the running Flask app, or FLASK_CONFIG outside an app context"""
+    from flask import current_app, has_app_context
+    if has_app_context():
+        return current_app.config
+    config = get_config()
+    return {k: getattr(config, k) for k in dir(config) if k.isupper()}
+
+def get_engine():
+    global engine, SessionLocal
+    if engine is None:
+        with _engine_lock:
+            if engine is None:
+                config = _active_config()
+                new_engine = create_engine(config['DATABASE_URL'], echo=False)
+                if config['METRICS_ENABLED']:
+                    instrument_engine(new_engine, config['SLOW_QUERY_THRESHOLD'])
+                SessionLocal = sessionmaker(bind=new_engine)
+                engine = new_engine
+    return engine
+
+def get_session():
+    get_engine()
+    return SessionLocal()
+
+def dispose_engine():
+    """Forget the engine so the next use connects afresh; call in each worker after fork"""
+    global engine, SessionLocal
+    with _engine_lock:
+        if engine is not None:
+            # close=False leaves the parent's pooled connections alone
+            engine.dispose(close=False)
+        engine = None
+        SessionLocal = None
+
+def db_health_check():
+    """Return True when a trivial query succeeds on the configured database"""
+    try:
+        with get_engine().connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return True
+    except Exception as e:  # a missing driver or bad URL means not ready, too
+        logger.error(f"Database health check failed: {e}")
+        return False
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
 
 def store_news_articles(articles):
-    session = SessionLocal()
+    session = get_session()
+    stored, links = [], []
     for a in articles:
         if not session.query(NewsArticle).filter_by(id=a["id"]).first():
             news = NewsArticle(
@@ -32,20 +85,288 @@ def store_news_articles(articles):
                 affected_sectors=",".join(a.get("affected_sectors", [])) if a.get("affected_sectors") else ""
             )
             session.add(news)
+            stored.append(serialize_news(news))
+            links.extend({"article_id": news.id, "country": country, "publish_date": news.publish_date}
+                         for country in set(a["countries"] or ()) if country)
+    if links:
+        session.connection().execute(ArticleCountry.__table__.insert(), links)
+    if stored:
+        publish_news_events(session.connection(), stored)
+        # Same transaction as the articles, so the aggregates never drift from the table
+        apply_stats(session.connection(), collect_stats(
+            (a["publish_date"], a["region"], a["event_type"], a["market_sentiment"], a["relevance_score"])
+            for a in stored
+        ))
     session.commit()
     session.close()
+    broadcaster.publish(stored)
+    hot_articles.add(stored)
+    return len(stored)
+
+NEWS_EVENTS_KEPT = 10_000  # rows of news_events kept for streams resuming on any worker
+
+def publish_news_events(conn, articles):
+    """Append serialized articles to news_events inside the storing transaction"""
+    if conn.dialect.name == 'postgresql':
+        # Serialize writers so sequence numbers become visible in order and no poller skips one
+        conn.execute(text("LOCK TABLE news_events IN SHARE ROW EXCLUSIVE MODE"))
+    conn.execute(NewsEvent.__table__.insert(), [{"payload": json.dumps(a)} for a in articles])
+    newest = conn.execute(select(func.max(NewsEvent.seq))).scalar()
+    conn.execute(NewsEvent.__table__.delete().where(NewsEvent.seq <= newest - NEWS_EVENTS_KEPT))
+
+def get_news_events(after=None, limit=1000):
+    """(seq, payload JSON) of news_events after ``after`` in order, or the newest ``limit`` when after is None"""
+    query = select(NewsEvent.seq, NewsEvent.payload)
+    with get_engine().connect() as conn:
+        if after is None:
+            rows = conn.execute(query.order_by(NewsEvent.seq.desc()).limit(limit)).all()
+            rows.reverse()
+        else:
+            rows = conn.execute(query.where(NewsEvent.seq > after).order_by(NewsEvent.seq).limit(limit)).all()
+    return [tuple(row) for row in rows]
+
+WATERMARK_FIELDS = ('last_publish_date', 'last_article_ids', 'next_page', 'pending_publish_date', 'pending_article_ids')
+
+def get_watermark(source):
+    """Ingestion watermark for an upstream source as a dict, or None before its first refresh"""
+    session = get_session()
+    row = session.get(IngestionWatermark, source)
+    session.close()
+    if row is None:
+        return None
+    watermark = {field: getattr(row, field) for field in WATERMARK_FIELDS}
+    for field in ('last_article_ids', 'pending_article_ids'):
+        watermark[field] = watermark[field].split(",") if watermark[field] else []
+    return watermark
 
-def get_latest_news(limit=20):
-    session = SessionLocal()
-    news = session.query(NewsArticle).order_by(NewsArticle.publish_date.desc()).limit(limit).all()
+def save_watermark(source, watermark):
+    session = get_session()
+    row = session.get(IngestionWatermark, source) or IngestionWatermark(source=source)
+    for field in WATERMARK_FIELDS:
+        value = watermark.get(field)
+        setattr(row, field, ",".join(value) if isinstance(value, list) else value)
+    row.updated_at = datetime.utcnow()
+    session.add(row)
+    session.commit()
     session.close()
-    return [serialize_news(n) for n in news]
 
-def get_news_by_region(region, limit=20):
-    session = SessionLocal()
-    news = session.query(NewsArticle).filter_by(region=region).order_by(NewsArticle.publish_date.desc()).limit(limit).all()
+STAT_GRANULARITIES = ('hour', 'day')
+STAT_KEY_COLUMNS = ('granularity', 'bucket_start', 'region', 'event_type', 'market_sentiment')
+
+def to_naive_utc(moment):
+    """Aware datetimes converted to naive UTC, as stats buckets are stored"""
+    if moment.tzinfo is not None:
+        return moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+def stat_bucket(moment, granularity):
+    """Start of the UTC hour or day containing ``moment``"""
+    moment = to_naive_utc(moment)
+    if granularity == 'hour':
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def collect_stats(rows):
+    """Fold (publish_date, region, event_type, sentiment, relevance) rows into {stat key: [count, relevance_sum]}"""
+    deltas = {}
+    for publish_date, region, event_type, sentiment, relevance in rows:
+        if isinstance(publish_date, str):
+            publish_date = parse_datetime(publish_date)
+        if publish_date is None:
+            continue  # cannot be bucketed
+        for granularity in STAT_GRANULARITIES:
+            key = (granularity, stat_bucket(publish_date, granularity), region or '', event_type or '', sentiment or '')
+            delta = deltas.setdefault(key, [0, 0.0])
+            delta[0] += 1
+            delta[1] += relevance or 0.0
+    return deltas
+
+def apply_stats(conn, deltas):
+    """Add collected deltas to news_stats on ``conn``, creating missing buckets"""
+    if not deltas:
+        return
+    table = NewsStat.__table__
+    params = [dict(zip(STAT_KEY_COLUMNS, key), article_count=count, relevance_sum=relevance)
+              for key, (count, relevance) in deltas.items()]
+    if conn.dialect.name in ('sqlite', 'postgresql'):
+        if conn.dialect.name == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(index_elements=list(STAT_KEY_COLUMNS), set_={
+            'article_count': table.c.article_count + stmt.excluded.article_count,
+            'relevance_sum': table.c.relevance_sum + stmt.excluded.relevance_sum,
+        })
+        conn.execute(stmt, params)
+        return
+    for p in params:
+        match = and_(*(table.c[c] == p[c] for c in STAT_KEY_COLUMNS))
+        result = conn.execute(table.update().where(match).values(
+            article_count=table.c.article_count + p['article_count'],
+            relevance_sum=table.c.relevance_sum + p['relevance_sum'],
+        ))
+        if result.rowcount == 0:
+            conn.execute(table.insert(), p)
+
+def rebuild_stats():
+    """Recompute news_stats from news_articles, e.g. after a bulk load that bypassed store_news_articles"""
+    query = select(NewsArticle.publish_date, NewsArticle.region, NewsArticle.event_type,
+                   NewsArticle.market_sentiment, NewsArticle.relevance_score)
+    with get_engine().begin() as conn:
+        deltas = collect_stats(conn.execution_options(yield_per=10_000).execute(query))
+        conn.execute(NewsStat.__table__.delete())
+        apply_stats(conn, deltas)
+    return len(deltas)
+
+def get_stats(granularity, since, until, region=None, event_type=None):
+    """Chart-ready aggregates for buckets starting in [since, until)"""
+    session = get_session()
+    query = session.query(NewsStat.bucket_start, NewsStat.region, NewsStat.event_type, NewsStat.market_sentiment,
+                          NewsStat.article_count, NewsStat.relevance_sum).filter(
+        NewsStat.granularity == granularity, NewsStat.bucket_start >= since, NewsStat.bucket_start < until)
+    if region:
+        query = query.filter(NewsStat.region == region)
+    if event_type:
+        query = query.filter(NewsStat.event_type == event_type)
+    rows = query.all()
     session.close()
-    return [serialize_news(n) for n in news]
+
+    regions, event_types, sentiments, timeline = {}, {}, {}, {}
+    total, relevance_total = 0, 0.0
+    for bucket, row_region, row_event, sentiment, count, relevance in rows:
+        total += count
+        relevance_total += relevance
+        if row_region:
+            regions[row_region] = regions.get(row_region, 0) + count
+        if row_event:
+            event_types[row_event] = event_types.get(row_event, 0) + count
+        # Unlabelled articles count as neutral, as the dashboard always has
+        sentiment = sentiment if sentiment in ('positive', 'negative') else 'neutral'
+        sentiments[sentiment] = sentiments.get(sentiment, 0) + count
+        point = timeline.setdefault(bucket, {'positive': 0, 'negative': 0, 'neutral': 0, 'count': 0, 'relevance': 0.0})
+        point[sentiment] += count
+        point['count'] += count
+        point['relevance'] += relevance
+    buckets = sorted(timeline)
+    return {
+        "granularity": granularity,
+        "since": since.isoformat(),
+        "until": until.isoformat(),
+        "total": total,
+        "avg_relevance": round(relevance_total / total, 4) if total else None,
+        "regions": regions,
+        "event_types": event_types,
+        "sentiments": sentiments,
+        "timeline": {
+            "buckets": [b.isoformat() for b in buckets],
+            "positive": [timeline[b]['positive'] for b in buckets],
+            "negative": [timeline[b]['negative'] for b in buckets],
+            "neutral": [timeline[b]['neutral'] for b in buckets],
+            "avg_relevance": [round(timeline[b]['relevance'] / timeline[b]['count'], 4) for b in buckets],
+        },
+    }
+
+# Listings carry the start of each article's content, not the whole body
+LISTING_CONTENT_CHARS = 280
+
+# Columns returned by the listing endpoints, selected as plain row tuples
+# rather than full ORM objects
+NEWS_LIST_COLUMNS = (
+    NewsArticle.id,
+    NewsArticle.title,
+    func.substr(NewsArticle.content, 1, LISTING_CONTENT_CHARS).label('content'),
+    NewsArticle.source,
+    NewsArticle.publish_date,
+    NewsArticle.relevance_score,
+    NewsArticle.region,
+    NewsArticle.countries,
+    NewsArticle.event_type,
+    NewsArticle.market_sentiment,
+    NewsArticle.affected_sectors,
+)
+_hot_reload_lock = threading.Lock()
+
+def _query_news(limit, region=None, event_type=None):
+    session = get_session()
+    query = session.query(*NEWS_LIST_COLUMNS)
+    if region:
+        query = query.filter(NewsArticle.region == region)
+    if event_type:
+        query = query.filter(NewsArticle.event_type == event_type)
+    rows = query.order_by(NewsArticle.publish_date.desc()).limit(limit).all()
+    session.close()
+    return [serialize_news_row(r) for r in rows]
+
+def _hot_set():
+    """The in-memory set of recent articles, reloaded when stale; None when HOT_SET_SIZE is 0"""
+    config = _active_config()
+    capacity = config['HOT_SET_SIZE']
+    if not capacity:
+        return None
+    if hot_articles.needs_reload(capacity, config['HOT_SET_REFRESH_SECONDS']):
+        with _hot_reload_lock:
+            if hot_articles.needs_reload(capacity, config['HOT_SET_REFRESH_SECONDS']):
+                hot_articles.load(capacity, LISTING_CONTENT_CHARS, _query_news(capacity))
+    return hot_articles
+
+def get_latest_news(limit=20, event_type=None):
+    hot = _hot_set()
+    news = hot.latest(limit, None, event_type, _active_config()['HOT_SET_COMPLETE_SECONDS']) if hot is not None else None
+    return news if news is not None else _query_news(limit, event_type=event_type)
+
+def get_news_by_region(region, limit=20, event_type=None):
+    hot = _hot_set()
+    news = hot.latest(limit, region, event_type, _active_config()['HOT_SET_COMPLETE_SECONDS']) if hot is not None else None
+    return news if news is not None else _query_news(limit, region, event_type)
+
+def get_news_by_countries(countries, limit=20, since=None, until=None):
+    """Newest articles mentioning every one of ``countries``, optionally published in [since, until).
+
+    The first country drives the query down the (country, publish_date)
+    index, newest first; each further country is one primary-key probe per
+    candidate article, so the scan stops as soon as ``limit`` articles match.
+    """
+    countries = list(dict.fromkeys(countries))
+    links = [aliased(ArticleCountry) for _ in countries]
+    driver = links[0]
+    session = get_session()
+    query = session.query(*NEWS_LIST_COLUMNS).select_from(driver).join(NewsArticle, NewsArticle.id == driver.article_id)
+    for link, country in zip(links[1:], countries[1:]):
+        query = query.join(link, and_(link.article_id == driver.article_id, link.country == country))
+    query = query.filter(driver.country == countries[0])
+    if since:
+        query = query.filter(driver.publish_date >= since)
+    if until:
+        query = query.filter(driver.publish_date < until)
+    rows = query.order_by(driver.publish_date.desc()).limit(limit).all()
+    session.close()
+    return [serialize_news_row(r) for r in rows]
+
+def rebuild_article_countries(batch_size=10_000):
+    """Refill article_country from news_articles.countries, e.g. after a bulk load that bypassed store_news_articles.
+
+    Stored names are indexed under their canonical spelling, so rows saved
+    before aliases were folded ("USA", "US") are found as "United States".
+    """
+    from analyzers.news_processor import canonical_country
+    query = select(NewsArticle.id, NewsArticle.countries, NewsArticle.publish_date)
+    table = ArticleCountry.__table__
+    written = 0
+    with get_engine().begin() as conn:
+        conn.execute(table.delete())
+        links = []
+        for article_id, countries, publish_date in conn.execution_options(yield_per=batch_size).execute(query):
+            links.extend({"article_id": article_id, "country": country, "publish_date": publish_date}
+                         for country in {canonical_country(c) for c in (countries or "").split(",") if c})
+            if len(links) >= batch_size:
+                conn.execute(table.insert(), links)
+                written += len(links)
+                links = []
+        if links:
+            conn.execute(table.insert(), links)
+            written += len(links)
+    return written
 
 def parse_datetime(dt_str):
     if not dt_str:
@@ -74,3 +395,21 @@ def serialize_news(news):
         "market_sentiment": news.market_sentiment,
         "affected_sectors": news.affected_sectors.split(",") if news.affected_sectors else []
     }
+
+def serialize_news_row(row):
+    """Serialize a NEWS_LIST_COLUMNS tuple; the positional unpack avoids per-field attribute lookups."""
+    (id_, title, content, source, publish_date, relevance, region,
+     countries, event_type, sentiment, sectors) = row
+    return {
+        "id": id_,
+        "title": title,
+        "content": content,
+        "source": source,
+        "publish_date": publish_date.isoformat() if publish_date else None,
+        "relevance_score": relevance,
+        "region": region,
+        "countries": countries.split(",") if countries else [],
+        "event_type": event_type,
+        "market_sentiment": sentiment,
+        "affected_sectors": sectors.split(",") if sectors else []
+    }
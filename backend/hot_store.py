@@ -0,0 +1,207 @@
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+EPOCH = datetime(1970, 1, 1)
+NO_DATE = float('-inf')  # articles without a publish date sort oldest, as they do in SQL
+
+class CodeTable:
+    """Interns repeated strings (regions, event types, sentiments) as small integer codes"""
+    __slots__ = ('codes', 'values')
+
+    def __init__(self):
+        self.codes = {None: 0}
+        self.values = [None]
+
+    def code(self, value: Optional[str]) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(sys.intern(value))
+        return code
+
+    def lookup(self, value: Optional[str]) -> Optional[int]:
+        """Code of a known value, without adding unknown query strings to the table"""
+        return self.codes.get(value)
+
+REGIONS, EVENT_TYPES, SENTIMENTS = CodeTable(), CodeTable(), CodeTable()
+
+class HotArticle:
+    """One listed article without its body; the repeated strings are interned codes"""
+    __slots__ = ('id', 'title', 'preview', 'source', 'publish_date', 'ts', 'relevance_score',
+                 'region', 'event_type', 'sentiment', 'countries', 'sectors')
+
+    def __init__(self, article: Dict[str, Any], preview_chars: int):
+        self.id = article['id']
+        self.title = article['title']
+        self.preview = article['content'][:preview_chars] if article['content'] else article['content']
+        self.source = sys.intern(article['source']) if article['source'] else article['source']
+        publish_date = article['publish_date']
+        if publish_date:
+            moment = datetime.fromisoformat(publish_date)
+            if moment.tzinfo is not None:  # stored, and so listed, as naive UTC
+                moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+            self.publish_date = moment.isoformat()
+            self.ts = (moment - EPOCH).total_seconds()
+        else:
+            self.publish_date, self.ts = None, NO_DATE
+        self.relevance_score = article['relevance_score']
+        self.region = REGIONS.code(article['region'])
+        self.event_type = EVENT_TYPES.code(article['event_type'])
+        self.sentiment = SENTIMENTS.code(article['market_sentiment'])
+        self.countries = tuple(sys.intern(c) for c in article['countries'])
+        self.sectors = tuple(sys.intern(s) for s in article['affected_sectors'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same shape as database.serialize_news_row"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "content": self.preview,
+            "source": self.source,
+            "publish_date": self.publish_date,
+            "relevance_score": self.relevance_score,
+            "region": REGIONS.values[self.region],
+            "countries": list(self.countries),
+            "event_type": EVENT_TYPES.values[self.event_type],
+            "market_sentiment": SENTIMENTS.values[self.sentiment],
+            "affected_sectors": list(self.sectors)
+        }
+
+class SortedIndex:
+    """Articles in publish-date order, with the sort keys in a flat array for bisection"""
+    __slots__ = ('keys', 'items')
+
+    def __init__(self):
+        self.keys = array('d')
+        self.items: List[HotArticle] = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def insert(self, article: HotArticle):
+        position = bisect_right(self.keys, article.ts)
+        self.keys.insert(position, article.ts)
+        self.items.insert(position, article)
+
+    def remove(self, article: HotArticle):
+        position = bisect_left(self.keys, article.ts)
+        while self.items[position] is not article:
+            position += 1
+        del self.keys[position], self.items[position]
+
+    def newest(self, limit: int, event_type: Optional[int] = None) -> List[HotArticle]:
+        if event_type is None:
+            return self.items[:-limit - 1:-1]
+        found = []
+        for i in range(len(self.items) - 1, -1, -1):
+            if self.items[i].event_type == event_type:
+                found.append(self.items[i])
+                if len(found) == limit:
+                    break
+        return found
+
+class HotArticleStore:
+    """Bounded in-process copy of the most recent articles, for answering listings without the database.
+
+    Holds the newest ``capacity`` articles in publish-date order, with
+    per-region and per-event-type indexes. Listings are answered only when
+    enough matching articles are held, or when the store held every article
+    there was at its last load, less than ``complete_seconds`` ago. Otherwise
+    ``latest`` returns None and the caller queries the database. Articles
+    stored by other processes only arrive with the periodic reload from
+    ``database.py``, so until then a listing can miss them.
+    """
+
+    def __init__(self):
+        self.capacity = 0
+        self.preview_chars = 0
+        self.loaded_at = None
+        self._all = SortedIndex()
+        self._by_region: Dict[int, SortedIndex] = {}
+        self._by_event_type: Dict[int, SortedIndex] = {}
+        self._ids: Dict[str, HotArticle] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._all)
+
+    def needs_reload(self, capacity: int, refresh_seconds: float) -> bool:
+        if self.loaded_at is None or capacity != self.capacity:
+            return True
+        return refresh_seconds > 0 and time.monotonic() - self.loaded_at >= refresh_seconds
+
+    def load(self, capacity: int, preview_chars: int, articles: Iterable[Dict[str, Any]]):
+        """Replace the contents with ``articles``, the newest ``capacity`` in the database"""
+        with self._lock:
+            self._clear()
+            self.capacity, self.preview_chars = capacity, preview_chars
+            for article in articles:
+                self._insert(HotArticle(article, preview_chars))
+            self.loaded_at = time.monotonic()
+
+    def invalidate(self):
+        """Drop the contents, e.g. after rows were written around store_news_articles"""
+        with self._lock:
+            self._clear()
+            self.loaded_at = None
+
+    def add(self, articles: Iterable[Dict[str, Any]]):
+        """Take in newly stored articles, evicting the oldest beyond capacity"""
+        with self._lock:
+            if self.loaded_at is None:
+                return  # the next listing loads from the database anyway
+            for article in articles:
+                if article['id'] not in self._ids:
+                    self._insert(HotArticle(article, self.preview_chars))
+            while len(self._all) > self.capacity:
+                self._remove(self._all.items[0])
+
+    def latest(self, limit: int, region: Optional[str] = None, event_type: Optional[str] = None,
+               complete_seconds: float = float('inf')) -> Optional[List[Dict[str, Any]]]:
+        """Newest matching articles as listing dicts, or None when the database must answer"""
+        with self._lock:
+            if self.loaded_at is None:
+                return None
+            # Holding every article there is; other workers may have stored more since the load
+            complete = (len(self._all) < self.capacity
+                        and time.monotonic() - self.loaded_at < complete_seconds)
+            region_code = REGIONS.lookup(region) if region else None
+            event_code = EVENT_TYPES.lookup(event_type) if event_type else None
+            if (region and region_code is None) or (event_type and event_code is None):
+                return [] if complete else None  # a value never seen by this process
+            if region:
+                found = self._by_region.get(region_code, SortedIndex()).newest(limit, event_code)
+            elif event_type:
+                found = self._by_event_type.get(event_code, SortedIndex()).newest(limit)
+            else:
+                found = self._all.newest(limit)
+            if len(found) < limit and not complete:
+                return None
+            return [a.to_dict() for a in found]
+
+    def _insert(self, article: HotArticle):
+        self._ids[article.id] = article
+        self._all.insert(article)
+        self._by_region.setdefault(article.region, SortedIndex()).insert(article)
+        self._by_event_type.setdefault(article.event_type, SortedIndex()).insert(article)
+
+    def _remove(self, article: HotArticle):
+        del self._ids[article.id]
+        self._all.remove(article)
+        for indexes, code in ((self._by_region, article.region), (self._by_event_type, article.event_type)):
+            indexes[code].remove(article)
+            if not indexes[code]:
+                del indexes[code]
+
+    def _clear(self):
+        self._all = SortedIndex()
+        self._by_region.clear()
+        self._by_event_type.clear()
+        self._ids.clear()
+
+hot_articles = HotArticleStore()
@@ -2,79 +2,157 @@
 """
 Geopolitical News Analysis Flask Application
 A professional Flask server for analyzing geopolitical news and their market impact.
+
+Create the app with ``create_app(config_name)``. Heavy subsystems (the
+SQLAlchemy ORM, the price store's numpy/pandas, the HTTP client) are
+imported on first use, and the database schema is created explicitly with
+``flask --app mainApp init-db`` rather than on import.
 """
 
 import os
+import math
 import logging
 import time
 from datetime import datetime, timedelta
 from functools import wraps
 from typing import Dict, List, Optional, Any
 
-from flask import Flask, jsonify, request, abort, make_response, send_from_directory
-from flask_cors import CORS
+import click
+from flask import Blueprint, Flask, Response, current_app, jsonify, request, abort, make_response, send_from_directory, stream_with_context
 from werkzeug.exceptions import HTTPException
-import requests
 
 # Import our configuration
-from config import get_config, validate_required_keys, is_geopolitical_event, get_affected_sectors, get_sector_stocks
-from scrapers.news_api_client import fetch_news_from_newsdata, filter_geopolitical_news
+from config import config as config_by_name, get_config, validate_required_keys, is_geopolitical_event, get_affected_sectors, get_sector_stocks, load_sector_index
+from scrapers.news_api_client import fetch_latest_news, fetch_news_since, filter_geopolitical_news
 from analyzers.news_processor import process_article
-from database import init_db, store_news_articles, get_latest_news, get_news_by_region
-
-# Initialize Flask app
-app = Flask(__name__)
-
-# Load configuration
-config = get_config()
-app.config.from_object(config)
-init_db()  # Ensure DB tables are created before serving requests
-
-# Enable CORS for all origins (for local dev)
-CORS(app, resources={r"/api/*": {"origins": "*"}}, supports_credentials=True)
-
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, config.LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(config.LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+from news_stream import broadcaster
+from responses import json_response
+import metrics
+import profiling
+from metrics import pipeline_stage, PIPELINE_ITEMS_TOTAL
+
 logger = logging.getLogger(__name__)
 
+api = Blueprint('api', __name__)
+
+FRONTEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../frontend'))
+NEWS_SOURCE = 'newsdata'  # ingestion watermark key for the NewsData.io feed
+
+def configure_logging(config):
+    """Configure root logging once per process"""
+    root = logging.getLogger()
+    if getattr(root, '_geopoli_configured', False):
+        return
+    logging.basicConfig(
+        level=getattr(logging, config.LOG_LEVEL),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(config.LOG_FILE, delay=True),
+            logging.StreamHandler()
+        ]
+    )
+    root._geopoli_configured = True
+
+def create_app(config_name: Optional[str] = None) -> Flask:
+    """Application factory; ``config_name`` defaults to FLASK_CONFIG"""
+    config = config_by_name[config_name] if config_name else get_config()
+    app = Flask(__name__)
+    app.config.from_object(config)
+    config.init_app(app)
+    configure_logging(config)
+    
+    load_sector_index()  # Build sector/keyword lookups once per process
+    
+    if config.METRICS_ENABLED:
+        metrics.init_app(app)
+    profiling.init_app(app, config)
+    
+    # Enable CORS for all origins (for local dev)
+    if config.CORS_ENABLED:
+        from flask_cors import CORS
+        CORS(app, resources={r"/api/*": {"origins": "*"}}, supports_credentials=True)
+    
+    app.register_blueprint(api)
+    
+    if config.STATIC_ASSET_CACHE:
+        from static_assets import StaticManifest
+        app.extensions['static_manifest'] = StaticManifest(FRONTEND_DIR)
+    
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create database tables."""
+        from database import init_db
+        init_db()
+        print("Database tables created")
+    
+    @app.cli.command('rebuild-stats')
+    def rebuild_stats_command():
+        """Recompute the dashboard aggregates from stored articles."""
+        from database import rebuild_stats
+        print(f"Rebuilt {rebuild_stats()} stat buckets")
+    
+    @app.cli.command('rebuild-article-countries')
+    def rebuild_article_countries_command():
+        """Refill the article_country index from stored articles."""
+        from database import rebuild_article_countries
+        print(f"Indexed {rebuild_article_countries()} article countries")
+    
+    @app.cli.command('build-static')
+    @click.argument('out_dir', default=os.path.join(FRONTEND_DIR, '..', 'build', 'frontend'))
+    def build_static_command(out_dir):
+        """Write fingerprinted, precompressed frontend files for a reverse proxy to serve."""
+        from static_assets import StaticManifest
+        written = StaticManifest(FRONTEND_DIR).write_build(out_dir)
+        print(f"Wrote {written} files to {os.path.abspath(out_dir)}")
+    
+    return app
+
 # Rate limiting storage (in production, use Redis)
 request_counts = {}
+last_rate_limit_sweep = 0.0
+
+def check_rate_limit(config, client_ip: Optional[str]) -> Optional[Dict[str, str]]:
+    """Count a request from ``client_ip``; return the 429 body when it is over the limit.
+
+    Shared by the ``rate_limit`` decorator and the async views in asgi.py.
+    """
+    if not config['RATE_LIMIT_ENABLED']:
+        return None
+    
+    global last_rate_limit_sweep
+    current_time = time.time()
+    window = config['RATE_LIMIT_WINDOW']
+    
+    # Drop entries whose window has ended, at most once per window
+    if current_time - last_rate_limit_sweep >= window:
+        for ip, (count, timestamp) in list(request_counts.items()):
+            if current_time - timestamp >= window:
+                request_counts.pop(ip, None)
+        last_rate_limit_sweep = current_time
+    
+    # Check rate limit
+    if client_ip in request_counts:
+        count, timestamp = request_counts[client_ip]
+        if current_time - timestamp < config['RATE_LIMIT_WINDOW']:
+            if count >= config['RATE_LIMIT_REQUESTS']:
+                return {
+                    'error': 'Rate limit exceeded',
+                    'message': f"Maximum {config['RATE_LIMIT_REQUESTS']} requests per {config['RATE_LIMIT_WINDOW']} seconds"
+                }
+            request_counts[client_ip] = (count + 1, timestamp)
+        else:
+            request_counts[client_ip] = (1, current_time)
+    else:
+        request_counts[client_ip] = (1, current_time)
+    return None
 
 def rate_limit(f):
     """Rate limiting decorator"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not config.RATE_LIMIT_ENABLED:
-            return f(*args, **kwargs)
-        
-        client_ip = request.remote_addr
-        current_time = time.time()
-        
-        # Clean old entries
-        request_counts.clear()
-        
-        # Check rate limit
-        if client_ip in request_counts:
-            count, timestamp = request_counts[client_ip]
-            if current_time - timestamp < config.RATE_LIMIT_WINDOW:
-                if count >= config.RATE_LIMIT_REQUESTS:
-                    return jsonify({
-                        'error': 'Rate limit exceeded',
-                        'message': f'Maximum {config.RATE_LIMIT_REQUESTS} requests per {config.RATE_LIMIT_WINDOW} seconds'
-                    }), 429
-                request_counts[client_ip] = (count + 1, timestamp)
-            else:
-                request_counts[client_ip] = (1, current_time)
-        else:
-            request_counts[client_ip] = (1, current_time)
-        
+        exceeded = check_rate_limit(current_app.config, request.remote_addr)
+        if exceeded:
+            return jsonify(exceeded), 429
         return f(*args, **kwargs)
     return decorated_function
 
@@ -128,48 +206,144 @@ def analyze_geopolitical_impact(news_text: str) -> Dict[str, Any]:
             'error': str(e)
         }
 
+def get_stored_stock_data(symbols: List[str]) -> Dict[str, Any]:
+    """Get latest price data from the local price store"""
+    from price_store import get_price_store
+    store = get_price_store(current_app.config['PRICE_STORE_DIR'])
+    stock_data = {}
+    for symbol in symbols:
+        bars = store.latest(symbol, 2)
+        if not len(bars):
+            continue
+        last = bars[-1]
+        previous_close = float(bars[0]['close']) if len(bars) > 1 else float(last['close'])
+        change = float(last['close']) - previous_close
+        stock_data[symbol] = {
+            'price': float(last['close']),
+            'change': change,
+            'change_percent': (change / previous_close * 100) if previous_close else 0.0,
+            'volume': None if math.isnan(last['volume']) else float(last['volume']),
+            'date': str(last['date']),
+            'source': 'price_store'
+        }
+    return stock_data
+
 def get_stock_data(symbols: List[str]) -> Dict[str, Any]:
-    """Get stock data from Alpha Vantage (placeholder)"""
-    if not validate_api_key(config.ALPHA_VANTAGE_STOCK_API_KEY, "Alpha Vantage"):
-        return {}
+    """Get stock data from the local price store, then Alpha Vantage quotes"""
+    stock_data = get_stored_stock_data(symbols)
+    symbols = [s for s in symbols if s not in stock_data]
+    if not symbols:
+        return stock_data
     
-    try:
-        # This is a placeholder - implement actual Alpha Vantage API calls
-        stock_data = {}
-        for symbol in symbols[:5]:  # Limit to 5 symbols for demo
-            stock_data[symbol] = {
-                'price': 100.0,  # Placeholder
-                'change': 1.5,
-                'change_percent': 1.5,
-                'volume': 1000000,
-                'market_cap': 1000000000
-            }
-        
+    if not validate_api_key(current_app.config['ALPHA_VANTAGE_STOCK_API_KEY'], "Alpha Vantage"):
         return stock_data
-        
-    except Exception as e:
-        logger.error(f"Error fetching stock data: {e}")
-        return {}
+    
+    from scrapers.quote_client import fetch_quote
+    for symbol in symbols[:current_app.config['MAX_QUOTE_SYMBOLS']]:
+        quote = fetch_quote(symbol)
+        if quote:
+            stock_data[symbol] = quote
+    return stock_data
 
-@app.errorhandler(HTTPException)
-def handle_exception(e):
-    """Handle HTTP exceptions"""
+async def get_stock_data_async(symbols: List[str]) -> Dict[str, Any]:
+    """get_stock_data with the upstream quote lookups issued concurrently"""
+    stock_data = get_stored_stock_data(symbols)
+    symbols = [s for s in symbols if s not in stock_data]
+    if not symbols:
+        return stock_data
+    
+    if not validate_api_key(current_app.config['ALPHA_VANTAGE_STOCK_API_KEY'], "Alpha Vantage"):
+        return stock_data
+    
+    from scrapers.quote_client import fetch_quotes_async
+    stock_data.update(await fetch_quotes_async(symbols[:current_app.config['MAX_QUOTE_SYMBOLS']]))
+    return stock_data
+
+def get_affected_stocks(affected_sectors: List[str]) -> Dict[str, List[str]]:
+    """Map each affected sector to its tracked symbols"""
+    affected_stocks = {}
+    for sector in affected_sectors:
+        stocks = get_sector_stocks(sector)
+        if stocks:
+            affected_stocks[sector] = stocks
+    return affected_stocks
+
+def get_historical_context(news_text: str) -> Dict[str, Any]:
+    """Historical context for an event (placeholder for a historical lookup)"""
+    event_type = 'general'
+    if any(keyword in news_text.lower() for keyword in ['sanctions', 'embargo']):
+        event_type = 'sanctions'
+    elif any(keyword in news_text.lower() for keyword in ['war', 'conflict']):
+        event_type = 'conflict'
+    
+    return {
+        'event_type': event_type,
+        'similar_events': [
+            {
+                'date': '2023-01-15',
+                'event': 'Similar event',
+                'market_impact': -2.5,
+                'recovery_time_days': 7
+            }
+        ]
+    }
+
+def news_payload(articles: List[Dict[str, Any]], limit: int, stale: bool = False) -> Dict[str, Any]:
+    """Response body for /api/news; ``stale`` marks cached articles served while the upstream refreshes"""
+    if articles:
+        # Filter for geopolitical relevance
+        articles = filter_geopolitical_news(articles)[:limit]
+    # No per-request timestamp, so an unchanged list keeps its ETag and revalidates with a 304
+    return {
+        'status': 'success',
+        'count': len(articles),
+        'articles': articles,
+        'stale': stale
+    }
+
+def full_analysis_payload(news_text: str, impact_analysis: Dict[str, Any], affected_stocks: Dict[str, List[str]],
+                          stock_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Response body for /api/analysis/full"""
+    return {
+        'status': 'success',
+        'analysis': {
+            'impact': impact_analysis,
+            'affected_sectors': impact_analysis.get('affected_sectors', []),
+            'affected_stocks': affected_stocks,
+            'stock_data': stock_data,
+            'historical_context': get_historical_context(news_text)
+        },
+        'stale': any(quote.get('stale', False) for quote in stock_data.values()),
+        'timestamp': datetime.utcnow().isoformat()
+    }
+
+def http_error_payload(e: HTTPException) -> Dict[str, Any]:
+    """Body for an HTTP exception, as the Flask errorhandler and asgi.py send it"""
     logger.error(f"HTTP Exception: {e.code} - {e.description}")
-    return jsonify({
+    return {
         'error': e.description,
         'code': e.code
-    }), e.code
+    }
 
-@app.errorhandler(Exception)
-def handle_generic_exception(e):
-    """Handle generic exceptions"""
+def internal_error_payload(e: Exception) -> Dict[str, Any]:
+    """Body for an unhandled exception, as the Flask errorhandler and asgi.py send it"""
     logger.error(f"Unexpected error: {e}")
-    return jsonify({
+    return {
         'error': 'Internal server error',
         'message': 'An unexpected error occurred'
-    }), 500
+    }
+
+@api.app_errorhandler(HTTPException)
+def handle_exception(e):
+    """Handle HTTP exceptions"""
+    return jsonify(http_error_payload(e)), e.code
 
-@app.route('/api/health')
+@api.app_errorhandler(Exception)
+def handle_generic_exception(e):
+    """Handle generic exceptions"""
+    return jsonify(internal_error_payload(e)), 500
+
+@api.route('/api/health')
 @rate_limit
 def health_check():
     """Health check endpoint"""
@@ -178,37 +352,46 @@ def health_check():
         'timestamp': datetime.utcnow().isoformat(),
         'version': '1.0.0',
         'services': {
-            'news_api': bool(config.NEWSDATA_API_KEY),
-            'stock_api': bool(config.ALPHA_VANTAGE_STOCK_API_KEY),
-            'llm_api': bool(config.OPENAI_API_KEY)
+            'news_api': bool(current_app.config['NEWSDATA_API_KEY']),
+            'stock_api': bool(current_app.config['ALPHA_VANTAGE_STOCK_API_KEY']),
+            'llm_api': bool(current_app.config['OPENAI_API_KEY'])
         }
     })
 
-@app.route('/api/news')
+@api.route('/api/health/live')
+def liveness_check():
+    """Liveness probe: the worker is up and serving requests"""
+    return jsonify({'status': 'alive', 'pid': os.getpid()})
+
+@api.route('/api/health/ready')
+def readiness_check():
+    """Readiness probe: the worker can reach the database"""
+    from database import db_health_check
+    ready = db_health_check()
+    return jsonify({
+        'status': 'ready' if ready else 'unavailable',
+        'database': ready,
+        'pid': os.getpid()
+    }), 200 if ready else 503
+
+@api.route('/api/metrics')
+def metrics_endpoint():
+    """Expose request, pipeline, upstream and SQL metrics in Prometheus text format"""
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+
+@api.route('/api/news')
 @rate_limit
 def get_news():
     """Get real-time geopolitical news"""
     try:
         # Get query parameters
-        limit = request.args.get('limit', config.MAX_NEWS_ARTICLES, type=int)
+        limit = request.args.get('limit', current_app.config['MAX_NEWS_ARTICLES'], type=int)
         category = request.args.get('category', 'geopolitical')
         
-        # Fetch news
-        articles = fetch_news_from_newsdata(limit)
-        
-        # Filter and limit results
-        if articles:
-            # Filter for geopolitical relevance
-            geopolitical_articles = filter_geopolitical_news(articles)
-            
-            articles = geopolitical_articles[:limit]
+        # Fetch news (cached; stale while a refresh runs)
+        articles, stale = fetch_latest_news(limit)
         
-        return jsonify({
-            'status': 'success',
-            'count': len(articles),
-            'articles': articles,
-            'timestamp': datetime.utcnow().isoformat()
-        })
+        return json_response(news_payload(articles, limit, stale))
         
     except Exception as e:
         logger.error(f"Error in get_news: {e}")
@@ -217,7 +400,7 @@ def get_news():
             'message': str(e)
         }), 500
 
-@app.route('/api/impact', methods=['POST'])
+@api.route('/api/impact', methods=['POST'])
 @rate_limit
 def analyze_impact():
     """Analyze the impact of geopolitical events"""
@@ -256,7 +439,7 @@ def analyze_impact():
             'message': str(e)
         }), 500
 
-@app.route('/api/historical')
+@api.route('/api/historical')
 @rate_limit
 def get_historical():
     """Get historical data on similar events"""
@@ -302,7 +485,7 @@ def get_historical():
             'message': str(e)
         }), 500
 
-@app.route('/api/stocks/<sector>')
+@api.route('/api/stocks/<sector>')
 @rate_limit
 def get_sector_stocks_api(sector):
     """Get stocks for a specific sector"""
@@ -333,7 +516,53 @@ def get_sector_stocks_api(sector):
             'message': str(e)
         }), 500
 
-@app.route('/api/analysis/full', methods=['POST'])
+@api.route('/api/stocks/<sector>/history')
+@rate_limit
+def get_sector_history_api(sector):
+    """Get daily closing prices for a sector from the local price store"""
+    try:
+        stocks = get_sector_stocks(sector)
+        
+        if not stocks:
+            return jsonify({
+                'error': f'No stocks found for sector: {sector}'
+            }), 404
+        
+        start = request.args.get('start')
+        end = request.args.get('end')
+        from database import parse_datetime
+        for name, value in (('start', start), ('end', end)):
+            if value and parse_datetime(value) is None:
+                return json_response({'error': f'{name} must be an ISO 8601 date'}, 400)
+        from price_store import get_price_store
+        store = get_price_store(current_app.config['PRICE_STORE_DIR'])
+        
+        history = {}
+        for symbol in stocks:
+            bars = store.read(symbol, start, end)
+            if len(bars):
+                history[symbol] = {
+                    'dates': bars['date'].astype(str).tolist(),
+                    'close': [None if math.isnan(c) else c for c in bars['close'].tolist()]
+                }
+        
+        return json_response({
+            'status': 'success',
+            'sector': sector,
+            'start': start,
+            'end': end,
+            'history': history,
+            'missing': [s for s in stocks if s not in history]
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in get_sector_history_api: {e}")
+        return jsonify({
+            'error': 'Failed to fetch sector history',
+            'message': str(e)
+        }), 500
+
+@api.route('/api/analysis/full', methods=['POST'])
 @rate_limit
 def full_analysis():
     """Perform full analysis: news + impact + historical + stocks"""
@@ -351,48 +580,13 @@ def full_analysis():
         impact_analysis = analyze_geopolitical_impact(news_text)
         
         # Step 2: Get affected sectors and stocks
-        affected_sectors = impact_analysis.get('affected_sectors', [])
-        affected_stocks = {}
+        affected_stocks = get_affected_stocks(impact_analysis.get('affected_sectors', []))
         stock_data = {}
+        for stocks in affected_stocks.values():
+            stock_data.update(get_stock_data(stocks))
         
-        if affected_sectors:
-            for sector in affected_sectors:
-                stocks = get_sector_stocks(sector)
-                if stocks:
-                    affected_stocks[sector] = stocks
-                    sector_data = get_stock_data(stocks)
-                    stock_data.update(sector_data)
-        
-        # Step 3: Get historical context
-        event_type = 'general'
-        if any(keyword in news_text.lower() for keyword in ['sanctions', 'embargo']):
-            event_type = 'sanctions'
-        elif any(keyword in news_text.lower() for keyword in ['war', 'conflict']):
-            event_type = 'conflict'
-        
-        historical_data = {
-            'event_type': event_type,
-            'similar_events': [
-                {
-                    'date': '2023-01-15',
-                    'event': 'Similar event',
-                    'market_impact': -2.5,
-                    'recovery_time_days': 7
-                }
-            ]
-        }
-        
-        return jsonify({
-            'status': 'success',
-            'analysis': {
-                'impact': impact_analysis,
-                'affected_sectors': affected_sectors,
-                'affected_stocks': affected_stocks,
-                'stock_data': stock_data,
-                'historical_context': historical_data
-            },
-            'timestamp': datetime.utcnow().isoformat()
-        })
+        # Step 3: Historical context is added by the payload builder
+        return jsonify(full_analysis_payload(news_text, impact_analysis, affected_stocks, stock_data))
         
     except Exception as e:
         logger.error(f"Error in full_analysis: {e}")
@@ -401,7 +595,7 @@ def full_analysis():
             'message': str(e)
         }), 500
 
-@app.route('/api/config/validate')
+@api.route('/api/config/validate')
 @rate_limit
 def validate_config():
     """Validate API configuration"""
@@ -411,9 +605,9 @@ def validate_config():
         return jsonify({
             'status': 'success' if validation_result else 'warning',
             'validation': {
-                'news_api': bool(config.NEWSDATA_API_KEY),
-                'stock_api': bool(config.ALPHA_VANTAGE_STOCK_API_KEY),
-                'llm_api': bool(config.OPENAI_API_KEY),
+                'news_api': bool(current_app.config['NEWSDATA_API_KEY']),
+                'stock_api': bool(current_app.config['ALPHA_VANTAGE_STOCK_API_KEY']),
+                'llm_api': bool(current_app.config['OPENAI_API_KEY']),
                 'all_required': validation_result
             },
             'missing_keys': [] if validation_result else ['Some optional API keys missing'],
@@ -427,45 +621,134 @@ def validate_config():
             'message': str(e)
         }), 500
 
-@app.route('/api/news/refresh', methods=['POST'])
+@api.route('/api/news/refresh', methods=['POST'])
 def refresh_news():
-    """Trigger news collection and processing."""
-    raw_articles = fetch_news_from_newsdata(limit=20)
-    filtered = filter_geopolitical_news(raw_articles)
-    processed = [process_article(a) for a in filtered]
-    store_news_articles(processed)
-    return jsonify({"status": "success", "fetched": len(processed)})
-
-@app.route('/api/news/latest')
+    """Trigger news collection and processing of articles newer than the ingestion watermark."""
+    from database import store_news_articles, get_watermark, save_watermark
+    with pipeline_stage('fetch'):
+        raw_articles, watermark = fetch_news_since(get_watermark(NEWS_SOURCE), limit=20,
+                                                   max_pages=current_app.config['NEWS_REFRESH_MAX_PAGES'])
+    with pipeline_stage('filter'):
+        filtered = filter_geopolitical_news(raw_articles)
+    with pipeline_stage('process'):
+        processed = [process_article(a) for a in filtered]
+    with pipeline_stage('store'):
+        stored = store_news_articles(processed)
+    save_watermark(NEWS_SOURCE, watermark)
+    PIPELINE_ITEMS_TOTAL.inc(len(raw_articles), stage='fetch')
+    PIPELINE_ITEMS_TOTAL.inc(len(filtered), stage='filter')
+    PIPELINE_ITEMS_TOTAL.inc(len(processed), stage='process')
+    PIPELINE_ITEMS_TOTAL.inc(stored, stage='store')
+    return jsonify({"status": "success", "fetched": len(processed), "stored": stored})
+
+def page_limit(default=20):
+    """Read ?limit= for listing endpoints, capped at MAX_NEWS_PAGE_SIZE."""
+    limit = request.args.get('limit', default, type=int)
+    return max(1, min(limit, current_app.config['MAX_NEWS_PAGE_SIZE']))
+
+@api.route('/api/news/latest')
 def latest_news():
     """Get latest processed news."""
-    news = get_latest_news(limit=20)
-    return jsonify({"news": news})
+    from database import get_latest_news
+    news = get_latest_news(limit=page_limit(), event_type=request.args.get('event_type'))
+    return json_response({"news": news})
+
+@api.route('/api/news/stream')
+def news_stream():
+    """Stream newly stored articles as Server-Sent Events."""
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    events = broadcaster.stream(
+        last_event_id=last_event_id,
+        region=request.args.get('region'),
+        event_type=request.args.get('event_type')
+    )
+    return Response(stream_with_context(events), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
 
-@app.route('/api/news/by-region/<region>')
+@api.route('/api/news/by-region/<region>')
 def news_by_region(region):
     """Get news filtered by region."""
-    news = get_news_by_region(region, limit=20)
-    return jsonify({"news": news})
+    from database import get_news_by_region
+    news = get_news_by_region(region, limit=page_limit(), event_type=request.args.get('event_type'))
+    return json_response({"news": news})
+
+@api.route('/api/news/by-country/<country>')
+def news_by_country(country):
+    """Get news mentioning a country, or every one of several comma-separated countries."""
+    from analyzers.news_processor import canonical_country
+    from database import get_news_by_countries, parse_datetime, to_naive_utc
+    countries = [canonical_country(c) for c in country.split(',') if c.strip()]
+    if not countries:
+        return json_response({'error': 'country is required'}, 400)
+    bounds = {}
+    for name in ('since', 'until'):
+        value = request.args.get(name)
+        if value:
+            moment = parse_datetime(value)
+            if moment is None:
+                return json_response({'error': f'{name} must be an ISO 8601 date'}, 400)
+            bounds[name] = to_naive_utc(moment)
+    news = get_news_by_countries(countries, limit=page_limit(), **bounds)
+    return json_response({"news": news, "countries": countries})
+
+@api.route('/api/stats')
+def news_stats():
+    """Article counts and average relevance by region, event type and sentiment per hour or day bucket."""
+    from database import STAT_GRANULARITIES, get_stats, parse_datetime, stat_bucket, to_naive_utc
+    config = current_app.config
+    granularity = request.args.get('bucket', 'day')
+    if granularity not in STAT_GRANULARITIES:
+        return json_response({'error': f"bucket must be one of {', '.join(STAT_GRANULARITIES)}"}, 400)
+    step = timedelta(hours=1) if granularity == 'hour' else timedelta(days=1)
+    since_arg, until_arg = request.args.get('since'), request.args.get('until')
+    until = parse_datetime(until_arg) if until_arg else datetime.utcnow()
+    if until is None:
+        return json_response({'error': 'since and until must be ISO 8601 dates'}, 400)
+    if until_arg and len(until_arg) == 10:
+        until += timedelta(days=1)  # a plain date includes that whole day
+    since = parse_datetime(since_arg) if since_arg else until - timedelta(days=config['STATS_DEFAULT_DAYS'])
+    if since is None:
+        return json_response({'error': 'since and until must be ISO 8601 dates'}, 400)
+    # Whole buckets only: since rounds down, the exclusive until rounds up
+    since, until = stat_bucket(since, granularity), to_naive_utc(until)
+    until_bucket = stat_bucket(until, granularity)
+    until = until_bucket if until_bucket == until else until_bucket + step
+    if until <= since or (until - since) / step > config['STATS_MAX_BUCKETS']:
+        return json_response({'error': f"since..until must span 1 to {config['STATS_MAX_BUCKETS']} buckets"}, 400)
+    stats = get_stats(granularity, since, until, request.args.get('region'), request.args.get('event_type'))
+    return json_response(stats, max_age=config['STATS_CACHE_SECONDS'])
 
 # Serve static files from the frontend directory
-@app.route('/')
-@app.route('/<path:path>')
+@api.route('/')
+@api.route('/<path:path>')
 def serve_frontend(path='index.html'):
-    frontend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../frontend'))
-    if path != "" and os.path.exists(os.path.join(frontend_dir, path)):
-        return send_from_directory(frontend_dir, path)
+    manifest = current_app.extensions.get('static_manifest')
+    if manifest is not None:
+        status, headers, body = manifest.serve(path, request.headers.get('Accept-Encoding', ''),
+                                               request.headers.get('If-None-Match'))
+        return Response(body, status=status, headers=headers)
+    if path != "" and os.path.exists(os.path.join(FRONTEND_DIR, path)):
+        return send_from_directory(FRONTEND_DIR, path)
     else:
-        return send_from_directory(frontend_dir, 'index.html')
+        return send_from_directory(FRONTEND_DIR, 'index.html')
 
 if __name__ == '__main__':
+    app = create_app()
+    
     # Validate configuration on startup
     logger.info("Starting Geopolitical News Analysis Server...")
     validate_required_keys()
     
+    # The single-process dev server creates tables itself; production runs
+    # `flask --app mainApp init-db` once instead of on every worker start
+    from database import init_db
+    init_db()
+    
     # Run the application
     app.run(
         host='0.0.0.0',
         port=int(os.environ.get('PORT', 5001)),
-        debug=config.DEBUG
+        debug=app.config['DEBUG']
     )
\ No newline at end of file
@@ -0,0 +1,183 @@
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, shared by every histogram unless overridden
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+class Counter:
+    """Monotonic counter keyed by label values"""
+
+    type_name = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels.get(n, '')) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f'{self.name}{_format_labels(self.labelnames, key)} {value}'
+
+class Histogram:
+    """Cumulative-bucket latency histogram keyed by label values"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(n, '')) for n in self.labelnames)
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][slot] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1])) for k, v in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                bucket_label = f'le="{le}"'
+                yield f'{self.name}_bucket{_format_labels(self.labelnames, key, bucket_label)} {cumulative}'
+            yield f'{self.name}_sum{_format_labels(self.labelnames, key)} {total}'
+            yield f'{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}'
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format (0.0.4)"""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type_name}')
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+registry = Registry()
+
+HTTP_REQUEST_SECONDS = registry.register(Histogram(
+    'geopoli_http_request_duration_seconds', 'Flask request latency by route', ('method', 'route', 'status')))
+HTTP_REQUESTS_TOTAL = registry.register(Counter(
+    'geopoli_http_requests_total', 'Flask requests by route and status', ('method', 'route', 'status')))
+PIPELINE_STAGE_SECONDS = registry.register(Histogram(
+    'geopoli_pipeline_stage_duration_seconds', 'Ingestion pipeline stage latency', ('stage',)))
+PIPELINE_ITEMS_TOTAL = registry.register(Counter(
+    'geopoli_pipeline_items_total', 'Articles leaving each ingestion pipeline stage', ('stage',)))
+UPSTREAM_REQUEST_SECONDS = registry.register(Histogram(
+    'geopoli_upstream_request_duration_seconds', 'Upstream API call latency', ('service', 'outcome')))
+UPSTREAM_SHORT_CIRCUITS_TOTAL = registry.register(Counter(
+    'geopoli_upstream_short_circuits_total', 'Upstream calls refused by an open circuit breaker', ('service',)))
+UPSTREAM_STALE_TOTAL = registry.register(Counter(
+    'geopoli_upstream_stale_total', 'Cached upstream data served stale while a refresh runs', ('service',)))
+DB_QUERY_SECONDS = registry.register(Histogram(
+    'geopoli_db_query_duration_seconds', 'SQL statement latency by statement type', ('operation',)))
+DB_SLOW_QUERIES_TOTAL = registry.register(Counter(
+    'geopoli_db_slow_queries_total', 'SQL statements slower than the slow-query threshold', ('operation',)))
+
+@contextmanager
+def pipeline_stage(stage: str):
+    """Time one ingestion pipeline stage (fetch, filter, process, store)"""
+    with PIPELINE_STAGE_SECONDS.time(stage=stage):
+        yield
+
+def instrument_engine(engine, slow_query_threshold: Optional[float] = 1.0):
+    """Record per-statement latency for a SQLAlchemy engine and log slow statements"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('_query_start')
+        if not starts:
+            return
+        duration = time.perf_counter() - starts.pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'UNKNOWN'
+        DB_QUERY_SECONDS.observe(duration, operation=operation)
+        if slow_query_threshold is not None and duration > slow_query_threshold:
+            DB_SLOW_QUERIES_TOTAL.inc(operation=operation)
+            logger.warning(f"Slow query ({duration:.2f}s): {statement[:500]}")
+
+    @event.listens_for(engine, 'handle_error')
+    def _error(context):
+        # after_cursor_execute is skipped for a failed statement; drop its start time
+        # so the connection's next statement is not timed against it
+        conn = context.connection
+        starts = conn.info.get('_query_start') if conn is not None else None
+        if starts:
+            starts.pop()
+
+def init_app(app):
+    """Record latency and counts for every Flask request"""
+    from flask import g, request
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = getattr(g, '_metrics_start', None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            labels = {'method': request.method, 'route': route, 'status': response.status_code}
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, **labels)
+            HTTP_REQUESTS_TOTAL.inc(**labels)
+        return response
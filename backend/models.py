@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime, Text
+from sqlalchemy import Column, String, Float, DateTime, Text, Integer, Index
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -12,11 +12,17 @@ class NewsArticle(Base):
     publish_date = Column(DateTime)
     relevance_score = Column(Float)
     region = Column(String)
-    countries = Column(String)  # comma-separated
+    countries = Column(String)  # comma-separated; queried through ArticleCountry
     event_type = Column(String)
     market_sentiment = Column(String)
     affected_sectors = Column(String)  # comma-separated
 
+class NewsEvent(Base):
+    """Newly stored articles in commit order, read by every worker's SSE stream (news_stream.py)"""
+    __tablename__ = 'news_events'
+    seq = Column(Integer, primary_key=True, autoincrement=True)  # the SSE event id
+    payload = Column(Text, nullable=False)  # serialize_news() as JSON
+
 class GeopoliticalEvent(Base):
     __tablename__ = 'geopolitical_events'
     id = Column(String, primary_key=True)
@@ -25,3 +31,32 @@ class GeopoliticalEvent(Base):
     date = Column(DateTime)
     region = Column(String)
     countries = Column(String)
+
+class IngestionWatermark(Base):
+    __tablename__ = 'ingestion_watermarks'
+    source = Column(String, primary_key=True)  # upstream feed, e.g. 'newsdata'
+    last_publish_date = Column(DateTime)
+    last_article_ids = Column(String)  # comma-separated ids published at last_publish_date
+    next_page = Column(String)  # cursor of an unfinished catch-up
+    pending_publish_date = Column(DateTime)  # newest article seen during that catch-up
+    pending_article_ids = Column(String)  # comma-separated
+    updated_at = Column(DateTime)
+
+class NewsStat(Base):
+    """Article counts per time bucket and region/event type/sentiment, kept current by store_news_articles"""
+    __tablename__ = 'news_stats'
+    granularity = Column(String, primary_key=True)  # 'hour' or 'day'
+    bucket_start = Column(DateTime, primary_key=True)  # UTC
+    region = Column(String, primary_key=True)  # '' when unknown
+    event_type = Column(String, primary_key=True)
+    market_sentiment = Column(String, primary_key=True)
+    article_count = Column(Integer, nullable=False, default=0)
+    relevance_sum = Column(Float, nullable=False, default=0.0)  # average = relevance_sum / article_count
+
+class ArticleCountry(Base):
+    """One row per country an article mentions, written with the article by store_news_articles"""
+    __tablename__ = 'article_country'
+    article_id = Column(String, primary_key=True)
+    country = Column(String, primary_key=True)
+    publish_date = Column(DateTime)  # copied from the article, so country listings never touch news_articles to sort
+    __table_args__ = (Index('ix_article_country_country_date', 'country', 'publish_date'),)
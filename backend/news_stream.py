@@ -0,0 +1,203 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL = 15  # seconds between keep-alive comments
+BUFFER_SIZE = 1000  # most recent articles kept for Last-Event-ID resumption
+POLL_INTERVAL = 1.0  # seconds between reads of news_events while anyone is subscribed
+
+class NewsBroadcaster:
+    """Fan-out of newly stored articles to Server-Sent Events subscribers, across workers.
+
+    ``store_news_articles`` writes every article to the ``news_events`` table
+    in the same transaction, so events get a database-wide sequence number.
+    While a process has subscribers, one poller thread reads new rows every
+    POLL_INTERVAL seconds (at once after a local store) into a buffer of the
+    newest BUFFER_SIZE, and each subscriber streams from that buffer. Event
+    ids are those sequence numbers, so a client resuming with a
+    ``Last-Event-ID`` on any worker, or after a restart, receives exactly the
+    articles it missed; an id older than the buffer gets a ``reset`` event so
+    the client reloads the full list instead.
+
+    ``stream`` blocks a thread per subscriber (the Flask route); ``astream``
+    waits on the event loop (the ASGI route in asgi.py).
+    """
+
+    def __init__(self, buffer_size: int = BUFFER_SIZE, poll_interval: float = POLL_INTERVAL):
+        self.buffer_size = buffer_size
+        self.poll_interval = poll_interval
+        self._seq = 0  # newest sequence in the buffer
+        self._floor = 0  # every event after this one is in the buffer
+        self._events = deque()  # (seq, article, json)
+        self._condition = threading.Condition()
+        self._poll_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._subscribers = 0
+        self._poller_pid = None
+        self._async_waiters = set()  # (event loop, asyncio.Event) per astream subscriber
+
+    def publish(self, articles: List[Dict[str, Any]]):
+        """Wake the poller after ``articles`` have been committed to news_events"""
+        if articles:
+            self._wake.set()
+
+    def poll(self):
+        """Read events committed since the newest buffered one"""
+        from database import get_news_events
+        with self._poll_lock:
+            while True:
+                try:
+                    rows = get_news_events(self._seq if self._seq or self._events else None, self.buffer_size)
+                except Exception as e:
+                    logger.error(f"Error reading news events: {e}")
+                    return
+                if not rows:
+                    return
+                self._append(rows)
+                if len(rows) < self.buffer_size:
+                    return
+
+    def _append(self, rows: List[Tuple[int, str]]):
+        with self._condition:
+            if not self._events and not self._seq:
+                # First read: the buffer starts at the oldest event loaded
+                self._floor = rows[0][0] - 1
+            for seq, data in rows:
+                self._events.append((seq, json.loads(data), data))
+            while len(self._events) > self.buffer_size:
+                self._floor = self._events.popleft()[0]
+            self._seq = rows[-1][0]
+            self._condition.notify_all()
+            for loop, wake in self._async_waiters:
+                try:
+                    loop.call_soon_threadsafe(wake.set)
+                except RuntimeError:  # loop already closed
+                    pass
+
+    def _run_poller(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if self._subscribers:
+                self.poll()
+
+    def _subscribe(self) -> bool:
+        """Count a subscriber and start this process's poller; True if it was idle and must catch up"""
+        with self._condition:
+            idle = not self._subscribers
+            self._subscribers += 1
+            if self._poller_pid != os.getpid():  # first use, or a fork of a process that used it
+                self._poller_pid = os.getpid()
+                threading.Thread(target=self._run_poller, name='news-events-poller', daemon=True).start()
+        return idle
+
+    def _unsubscribe(self):
+        with self._condition:
+            self._subscribers -= 1
+
+    def _parse_last_id(self, last_event_id: Optional[str]) -> Optional[int]:
+        """Return the sequence to resume after, or None when the client must reset"""
+        if not last_event_id:
+            return self._seq
+        if not last_event_id.isdigit():
+            return None  # e.g. an id from before events were numbered by the database
+        seq = int(last_event_id)
+        # An id past the buffer was published by another worker since the last poll
+        return seq if seq >= self._floor else None
+
+    def _pending(self, after: int) -> List:
+        pending = []
+        for event in reversed(self._events):
+            if event[0] <= after:
+                break
+            pending.append(event)
+        pending.reverse()
+        return pending
+
+    def _start(self, last_event_id: Optional[str]) -> Tuple[int, Optional[str]]:
+        """(sequence to stream after, reset message or None)"""
+        with self._condition:
+            after = self._parse_last_id(last_event_id)
+            if after is not None:
+                return after, None
+            return self._seq, f"id: {self._seq}\nevent: reset\ndata: {{}}\n\n"
+
+    @staticmethod
+    def _message(event, region: Optional[str], event_type: Optional[str]) -> Optional[str]:
+        seq, article, data = event
+        if region and article.get('region') != region:
+            return None
+        if event_type and article.get('event_type') != event_type:
+            return None
+        return f"id: {seq}\nevent: article\ndata: {data}\n\n"
+
+    def stream(self, last_event_id: Optional[str] = None, region: Optional[str] = None,
+               event_type: Optional[str] = None, heartbeat: float = HEARTBEAT_INTERVAL) -> Iterator[str]:
+        """Yield SSE-formatted messages for articles matching the filters, forever"""
+        idle = self._subscribe()
+        try:
+            if idle:
+                self.poll()
+            after, reset = self._start(last_event_id)
+            if reset:
+                yield reset
+            yield "retry: 5000\n\n"
+            while True:
+                with self._condition:
+                    pending = self._pending(after)
+                    if not pending:
+                        self._condition.wait(heartbeat)
+                        pending = self._pending(after)
+                if not pending:
+                    yield ": keep-alive\n\n"
+                    continue
+                for event in pending:
+                    after = event[0]
+                    message = self._message(event, region, event_type)
+                    if message:
+                        yield message
+        finally:
+            self._unsubscribe()
+
+    async def astream(self, last_event_id: Optional[str] = None, region: Optional[str] = None,
+                      event_type: Optional[str] = None, heartbeat: float = HEARTBEAT_INTERVAL) -> AsyncIterator[str]:
+        """``stream`` for an event loop: waiting for articles holds no thread"""
+        wake = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), wake)
+        idle = self._subscribe()
+        with self._condition:
+            self._async_waiters.add(waiter)
+        try:
+            if idle:
+                await asyncio.to_thread(self.poll)
+            after, reset = self._start(last_event_id)
+            if reset:
+                yield reset
+            yield "retry: 5000\n\n"
+            while True:
+                wake.clear()
+                with self._condition:
+                    pending = self._pending(after)
+                if not pending:
+                    try:
+                        await asyncio.wait_for(wake.wait(), heartbeat)
+                    except asyncio.TimeoutError:
+                        yield ": keep-alive\n\n"
+                    continue
+                for event in pending:
+                    after = event[0]
+                    message = self._message(event, region, event_type)
+                    if message:
+                        yield message
+        finally:
+            with self._condition:
+                self._async_waiters.discard(waiter)
+            self._unsubscribe()
+
+broadcaster = NewsBroadcaster()
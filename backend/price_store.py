@@ -0,0 +1,220 @@
+import os
+import json
+import threading
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+BAR_DTYPE = np.dtype([
+    ("date", "<M8[D]"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+INDEX_FILE = "index.json"
+BAR_FILE_SUFFIX = ".bars"
+
+DateLike = Union[str, date, datetime, np.datetime64, None]
+
+def _to_day(value: DateLike) -> Optional[np.datetime64]:
+    if value is None:
+        return None
+    return np.datetime64(pd.Timestamp(value).tz_localize(None).date(), "D")
+
+class PriceStore:
+    """Local daily bar store with one append-only binary file per ticker.
+
+    Each ``<SYMBOL>.bars`` file holds fixed-width ``BAR_DTYPE`` records sorted
+    by date. ``index.json`` maps every ticker to its file, byte offset, row
+    count and date bounds, so reads memory-map exactly the bytes they need
+    and date-range slices are zero-copy views of the mapped file.
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self._lock = threading.Lock()
+        self._maps: Dict[str, np.memmap] = {}
+        self._index_mtime: Optional[int] = None
+        self.index = self._load_index()
+
+    def _index_path(self) -> str:
+        return os.path.join(self.root_dir, INDEX_FILE)
+
+    def _mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self._index_path()).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load_index(self) -> Dict[str, Dict]:
+        self._index_mtime = self._mtime()
+        if self._index_mtime is None:
+            return {}
+        with open(self._index_path()) as f:
+            return json.load(f)
+
+    def refresh(self) -> bool:
+        """Reloads ``index.json`` if another process (e.g. an import) replaced it; returns True if it did."""
+        if self._mtime() == self._index_mtime:
+            return False
+        with self._lock:
+            if self._mtime() == self._index_mtime:
+                return False
+            self.index = self._load_index()
+            self._maps = {}
+        return True
+
+    def _save_index(self):
+        os.makedirs(self.root_dir, exist_ok=True)
+        tmp_path = self._index_path() + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self._index_path())
+        self._index_mtime = self._mtime()
+
+    def symbols(self) -> List[str]:
+        return sorted(self.index)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.index
+
+    def bars(self, symbol: str) -> np.ndarray:
+        """Returns all bars for a ticker as a read-only memory map (empty if unknown)."""
+        entry = self.index.get(symbol)
+        if not entry or not entry["rows"]:
+            return np.empty(0, dtype=BAR_DTYPE)
+        mapped = self._maps.get(symbol)
+        if mapped is None or len(mapped) != entry["rows"]:
+            mapped = np.memmap(
+                os.path.join(self.root_dir, entry["file"]),
+                dtype=BAR_DTYPE, mode="r", offset=entry["offset"], shape=(entry["rows"],),
+            )
+            self._maps[symbol] = mapped
+        return mapped
+
+    def read(self, symbol: str, start: DateLike = None, end: DateLike = None) -> np.ndarray:
+        """Returns a zero-copy view of bars with ``start <= date <= end``."""
+        bars = self.bars(symbol)
+        dates = bars["date"]
+        lo = 0 if start is None else int(np.searchsorted(dates, _to_day(start), side="left"))
+        hi = len(bars) if end is None else int(np.searchsorted(dates, _to_day(end), side="right"))
+        return bars[lo:hi]
+
+    def read_frame(self, symbol: str, start: DateLike = None, end: DateLike = None) -> pd.DataFrame:
+        bars = self.read(symbol, start, end)
+        frame = pd.DataFrame({name: bars[name] for name in BAR_DTYPE.names if name != "date"})
+        frame.index = pd.DatetimeIndex(bars["date"].astype("datetime64[ns]"), name="date")
+        return frame
+
+    def closes(self, symbols: Optional[Sequence[str]] = None, start: DateLike = None, end: DateLike = None) -> pd.DataFrame:
+        """Returns a date x symbol frame of closes, the layout ``event_study`` expects."""
+        symbols = self.symbols() if symbols is None else [s for s in symbols if s in self.index]
+        series = {}
+        for symbol in symbols:
+            bars = self.read(symbol, start, end)
+            series[symbol] = pd.Series(bars["close"], index=bars["date"].astype("datetime64[ns]"))
+        if not series:
+            return pd.DataFrame(dtype=float)
+        return pd.DataFrame(series).sort_index()
+
+    def latest(self, symbol: str, count: int = 2) -> np.ndarray:
+        bars = self.bars(symbol)
+        return bars[max(0, len(bars) - count):]
+
+    def append(self, symbol: str, bars: Union[pd.DataFrame, np.ndarray]) -> int:
+        """Appends bars newer than the last stored date and returns how many were written.
+
+        Accepts a structured ``BAR_DTYPE`` array or a frame with a ``date``
+        column or DatetimeIndex; missing OHLCV columns are stored as NaN.
+        """
+        records = bars if isinstance(bars, np.ndarray) else self._frame_to_records(bars)
+        if not len(records):
+            return 0
+        records = np.sort(records, order="date")
+        # Keep the last bar for any duplicated date
+        keep = np.append(records["date"][1:] != records["date"][:-1], True)
+        records = records[keep]
+        self.refresh()
+        with self._lock:
+            entry = self.index.get(symbol)
+            if entry and entry["last_date"]:
+                records = records[records["date"] > np.datetime64(entry["last_date"], "D")]
+            if not len(records):
+                return 0
+            os.makedirs(self.root_dir, exist_ok=True)
+            if entry is None:
+                entry = {"file": symbol + BAR_FILE_SUFFIX, "offset": 0, "rows": 0,
+                         "first_date": None, "last_date": None}
+                self.index[symbol] = entry
+            path = os.path.join(self.root_dir, entry["file"])
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                # Truncate any bytes past the indexed rows, e.g. from an interrupted append
+                f.truncate(entry["offset"] + entry["rows"] * BAR_DTYPE.itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(records.astype(BAR_DTYPE, copy=False).tobytes())
+            entry["rows"] += len(records)
+            entry["first_date"] = entry["first_date"] or str(records["date"][0])
+            entry["last_date"] = str(records["date"][-1])
+            self._maps.pop(symbol, None)
+            self._save_index()
+        return len(records)
+
+    @staticmethod
+    def _frame_to_records(frame: pd.DataFrame) -> np.ndarray:
+        frame = frame.copy()
+        frame.columns = [str(c).strip().lower() for c in frame.columns]
+        if "date" not in frame.columns:
+            frame = frame.rename_axis("date").reset_index()
+        if "adj_close" in frame.columns:
+            frame["close"] = frame["adj_close"]
+        records = np.empty(len(frame), dtype=BAR_DTYPE)
+        records["date"] = pd.to_datetime(frame["date"]).dt.tz_localize(None).to_numpy().astype("datetime64[D]")
+        for name in BAR_DTYPE.names[1:]:
+            records[name] = frame[name].to_numpy(dtype=float) if name in frame.columns else np.nan
+        return records
+
+    def import_directory(self, price_dir: str, symbols: Optional[Sequence[str]] = None) -> Dict[str, int]:
+        """Appends CSV/Parquet price files from ``price_dir``.
+
+        Files are either per ticker (``XOM.csv``) or long format with a
+        ``symbol`` column, matching what ``event_study.load_price_history`` reads.
+        """
+        written = {}
+        for name in sorted(os.listdir(price_dir)):
+            stem, ext = os.path.splitext(name)
+            if ext not in (".csv", ".parquet"):
+                continue
+            path = os.path.join(price_dir, name)
+            frame = pd.read_parquet(path) if ext == ".parquet" else pd.read_csv(path)
+            frame.columns = [str(c).strip().lower() for c in frame.columns]
+            groups = frame.groupby("symbol") if "symbol" in frame.columns else [(stem, frame)]
+            for symbol, bars in groups:
+                if symbols is None or symbol in symbols:
+                    written[symbol] = written.get(symbol, 0) + self.append(symbol, bars)
+        return written
+
+_stores: Dict[str, PriceStore] = {}
+
+def get_price_store(root_dir: str) -> PriceStore:
+    """Returns the process-wide store for ``root_dir``, reloading its index if it changed on disk."""
+    store = _stores.get(root_dir)
+    if store is None:
+        store = _stores[root_dir] = PriceStore(root_dir)
+    else:
+        store.refresh()
+    return store
+
+if __name__ == "__main__":
+    import argparse
+    from config import get_config
+
+    parser = argparse.ArgumentParser(description="Import daily bars into the local price store")
+    parser.add_argument("price_dir", help="Directory of <SYMBOL>.csv / <SYMBOL>.parquet files")
+    parser.add_argument("--store", default=get_config().PRICE_STORE_DIR)
+    args = parser.parse_args()
+    counts = PriceStore(args.store).import_directory(args.price_dir)
+    print(f"Appended {sum(counts.values())} bars across {len(counts)} tickers into {args.store}")
@@ -0,0 +1,192 @@
+"""
+Opt-in sampling profiler for live requests.
+
+When PROFILING_ENABLED is set, a PROFILE_SAMPLE_RATE fraction of requests,
+plus any request carrying a valid signed X-Profile-Request header, is
+profiled by a statistical stack sampler. Each profile is saved as one JSON
+file in PROFILE_DIR with route and timing metadata. When profiling is
+disabled no hooks are registered, so requests pay nothing.
+
+CLI (run from backend/):
+    python profiling.py sign --ttl 600              # header value for one-off profiling
+    python profiling.py collapse profiles/ -o out.folded [--route /api/analysis/full]
+
+The collapsed output ("frame;frame;frame count" per line) feeds flamegraph.pl,
+speedscope or inferno directly.
+"""
+
+import os
+import sys
+import hmac
+import json
+import time
+import uuid
+import random
+import hashlib
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from config import DEFAULT_SECRET_KEY
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile-Request'
+
+class StackSampler(threading.Thread):
+    """Samples the call stack of one thread at a fixed interval"""
+
+    def __init__(self, target_ident: int, interval: float):
+        super().__init__(daemon=True, name='request-profiler')
+        self.target_ident = target_ident
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        own_file = __file__.rstrip('c')
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_ident)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if code.co_filename.rstrip('c') != own_file:
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+                self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+def sign_token(secret_key: str, expires: int) -> str:
+    digest = hmac.new(secret_key.encode(), str(expires).encode(), hashlib.sha256).hexdigest()
+    return f"{expires}.{digest}"
+
+def verify_token(secret_key: str, token: Optional[str]) -> bool:
+    """Accept ``<expires>.<hmac>`` tokens signed with SECRET_KEY that have not expired"""
+    if not token or '.' not in token:
+        return False
+    expires, _, _ = token.partition('.')
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(sign_token(secret_key, int(expires)), token)
+
+def init_app(app, config):
+    """Register request hooks when profiling is enabled; otherwise do nothing"""
+    if not config.PROFILING_ENABLED:
+        return
+    from flask import g, request
+
+    profile_dir = config.PROFILE_DIR
+    sample_rate = config.PROFILE_SAMPLE_RATE
+    interval = config.PROFILE_INTERVAL
+    secret_key = config.SECRET_KEY
+    if secret_key == DEFAULT_SECRET_KEY:
+        # Anyone can sign tokens with the published default key
+        logger.warning(f"SECRET_KEY is the default; ignoring {PROFILE_HEADER} headers")
+        secret_key = None
+    os.makedirs(profile_dir, exist_ok=True)
+    logger.warning(f"Request profiling enabled: sample rate {sample_rate}, writing to {profile_dir}")
+
+    @app.before_request
+    def _start_profile():
+        forced = secret_key is not None and verify_token(secret_key, request.headers.get(PROFILE_HEADER))
+        if not forced and random.random() >= sample_rate:
+            return
+        sampler = StackSampler(threading.get_ident(), interval)
+        g._profile = (sampler, time.perf_counter(), 'header' if forced else 'sampled')
+        sampler.start()
+
+    @app.after_request
+    def _record_status(response):
+        if getattr(g, '_profile', None):
+            g._profile_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _save_profile(exc):
+        profile = g.pop('_profile', None)
+        if not profile:
+            return
+        sampler, start, trigger = profile
+        duration = time.perf_counter() - start
+        sampler.stop()
+        record = {
+            'timestamp': datetime.utcnow().isoformat(),
+            'method': request.method,
+            'route': request.url_rule.rule if request.url_rule is not None else None,
+            'path': request.path,
+            'status': g.pop('_profile_status', 500 if exc else None),
+            'duration_s': duration,
+            'trigger': trigger,
+            'interval_s': interval,
+            'samples': sampler.samples,
+            'pid': os.getpid(),
+            'stacks': dict(sampler.stacks),
+        }
+        path = os.path.join(profile_dir, f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.json")
+        try:
+            with open(path, 'w') as f:
+                json.dump(record, f)
+        except OSError as e:
+            logger.error(f"Failed to save profile: {e}")
+
+def collapse_profiles(profile_dir: str, route: Optional[str] = None,
+                      min_duration: float = 0.0) -> Tuple[Dict[str, int], int]:
+    """Sum the sampled stacks of all saved profiles, optionally filtered by route and duration"""
+    totals: Counter = Counter()
+    used = 0
+    for name in sorted(os.listdir(profile_dir)):
+        if not name.endswith('.json'):
+            continue
+        with open(os.path.join(profile_dir, name)) as f:
+            record = json.load(f)
+        if route and record.get('route') != route:
+            continue
+        if record.get('duration_s', 0) < min_duration:
+            continue
+        totals.update(record.get('stacks', {}))
+        used += 1
+    return dict(totals), used
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Request profiling tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+    collapse = commands.add_parser('collapse', help='Aggregate saved profiles into a collapsed-stack file')
+    collapse.add_argument('profile_dir')
+    collapse.add_argument('-o', '--output', help='Output file (default: stdout)')
+    collapse.add_argument('--route', help='Only include profiles for this route rule, e.g. /api/analysis/full')
+    collapse.add_argument('--min-duration', type=float, default=0.0, help='Only include requests at least this slow (seconds)')
+    sign = commands.add_parser('sign', help=f'Print a signed {PROFILE_HEADER} header value')
+    sign.add_argument('--ttl', type=int, default=600, help='Seconds until the token expires')
+    args = parser.parse_args(argv)
+
+    if args.command == 'sign':
+        from config import get_config
+        secret_key = get_config().SECRET_KEY
+        if secret_key == DEFAULT_SECRET_KEY:
+            print("Set SECRET_KEY first; the app ignores tokens signed with the default key", file=sys.stderr)
+            return 1
+        print(sign_token(secret_key, int(time.time()) + args.ttl))
+        return 0
+
+    stacks, used = collapse_profiles(args.profile_dir, args.route, args.min_duration)
+    lines = [f"{stack} {count}" for stack, count in sorted(stacks.items())]
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+    else:
+        print('\n'.join(lines))
+    print(f"Collapsed {sum(stacks.values())} samples from {used} profiles", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import gzip
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from flask import Response, request
+from werkzeug.http import parse_accept_header, parse_etags, quote_etag
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+MIN_COMPRESS_SIZE = 1024  # bytes; smaller bodies are not worth compressing
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+def dumps(payload: Any) -> bytes:
+    """Encode a payload as compact UTF-8 JSON, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+@lru_cache(maxsize=64)
+def _encoding_qualities(accept_encoding: str) -> Dict[str, float]:
+    accept = parse_accept_header(accept_encoding)
+    return {encoding: accept.quality(encoding) for encoding in ('br', 'gzip')}
+
+def choose_encoding(accept_encoding: str, available: Sequence[str] = ('br', 'gzip')) -> str:
+    """The ``available`` encoding the client rates highest, ties going to the first; 'identity' if none has q > 0"""
+    if not accept_encoding:
+        return 'identity'
+    qualities = _encoding_qualities(accept_encoding)
+    best = max(available, key=qualities.get, default=None)
+    return best if best is not None and qualities[best] > 0 else 'identity'
+
+def encode_json(payload: Any, status: int = 200, max_age: int = 0, accept_encoding: str = '',
+                if_none_match: Optional[str] = None) -> Tuple[int, Dict[str, str], bytes]:
+    """Encode a JSON response as (status, headers, body) with an ETag, 304 revalidation and compression.
+
+    Framework-agnostic so the Flask views and the ASGI layer (asgi.py) send identical responses.
+    """
+    body = dumps(payload)
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    headers = {'Vary': 'Accept-Encoding', 'Cache-Control': f'private, max-age={max_age}'}
+    if status == 200:
+        # Weak, since the same payload may be sent with different encodings
+        headers['ETag'] = quote_etag(etag, weak=True)
+        if if_none_match and parse_etags(if_none_match).contains_weak(etag):
+            return 304, headers, b''
+
+    headers['Content-Type'] = 'application/json'
+    if len(body) >= MIN_COMPRESS_SIZE:
+        encoding = choose_encoding(accept_encoding, ('br', 'gzip') if brotli is not None else ('gzip',))
+        if encoding == 'br':
+            body = brotli.compress(body, quality=BROTLI_QUALITY)
+            headers['Content-Encoding'] = 'br'
+        elif encoding == 'gzip':
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            headers['Content-Encoding'] = 'gzip'
+    return status, headers, body
+
+def json_response(payload: Any, status: int = 200, max_age: int = 0) -> Response:
+    """Build a JSON response with an ETag, 304 revalidation and gzip/brotli compression"""
+    status, headers, body = encode_json(payload, status, max_age, request.headers.get('Accept-Encoding', ''),
+                                        request.headers.get('If-None-Match'))
+    return Response(body, status=status, headers=headers)
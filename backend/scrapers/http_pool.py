@@ -0,0 +1,31 @@
+import asyncio
+import weakref
+
+from config import get_config
+
+# One client (and so one connection pool) per event loop; ASGI workers run a
+# single loop, so every request in a worker shares the same pool
+_clients = weakref.WeakKeyDictionary()
+
+def get_async_client():
+    """Shared httpx.AsyncClient for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        import httpx  # deferred: only the async routes need it
+        config = get_config()
+        client = httpx.AsyncClient(
+            timeout=config.UPSTREAM_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=config.UPSTREAM_MAX_CONNECTIONS,
+                max_keepalive_connections=config.UPSTREAM_MAX_KEEPALIVE,
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+async def close_async_client():
+    """Close the running loop's client, e.g. on ASGI lifespan shutdown"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
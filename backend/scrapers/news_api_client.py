@@ -1,11 +1,15 @@
 import logging
-import requests
-from typing import List, Dict, Any
+import time
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple
 from config import get_config
+from metrics import UPSTREAM_REQUEST_SECONDS
+from scrapers.resilience import UpstreamResponseError, call_with_retries, call_with_retries_async, get_cache
 
-config = get_config()
 logger = logging.getLogger(__name__)
 
+SERVICE = "newsdata"  # circuit breaker and cache name
+
 GEO_KEYWORDS = [
     "sanctions", "conflict", "trade war", "military", "diplomacy", "energy crisis",
     "embargo", "protest", "election", "coup", "nuclear", "missile", "cyberattack"
@@ -19,36 +23,183 @@ REGIONS = {
     "Europe": ["Europe", "EU", "Germany", "France", "UK", "Britain", "Italy", "Spain"]
 }
 
-def fetch_news_from_newsdata(limit=20) -> List[Dict[str, Any]]:
-    """Fetches news from NewsData.io API and returns a list of articles."""
-    url = config.NEWSDATA_BASE_URL
+NEWSDATA_PAGE_SIZE = 20  # most results NewsData.io returns per request
+
+def _newsdata_params(config, limit, page=None):
     params = {
         "apikey": config.NEWSDATA_API_KEY,
         "q": " OR ".join(GEO_KEYWORDS),
         "language": "en",
-        "size": min(limit, 20)
+        "size": min(limit, NEWSDATA_PAGE_SIZE)
     }
+    if page:
+        params["page"] = page
+    return params
+
+def _parse_newsdata(data) -> List[Dict[str, Any]]:
+    if data.get("status") != "success":
+        logger.error(f"NewsData.io API error: {data.get('message')}")
+        return []
+    articles = data.get("results", [])
+    return [
+        {
+            "title": a.get("title"),
+            "content": a.get("content") or a.get("description"),
+            "source": a.get("source_id"),
+            "publish_date": a.get("pubDate"),
+            "raw": a
+        }
+        for a in articles
+    ]
+
+def _request_news_page(limit=20, page=None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    import requests  # deferred: only needed when actually fetching
+    config = get_config()
+    start = time.perf_counter()
+    outcome = "error"
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        resp = requests.get(config.NEWSDATA_BASE_URL, params=_newsdata_params(config, limit, page),
+                            timeout=config.UPSTREAM_TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
+        outcome = "success"
         if data.get("status") != "success":
-            logger.error(f"NewsData.io API error: {data.get('message')}")
-            return []
-        articles = data.get("results", [])
-        return [
-            {
-                "title": a.get("title"),
-                "content": a.get("content") or a.get("description"),
-                "source": a.get("source_id"),
-                "publish_date": a.get("pubDate"),
-                "raw": a
-            }
-            for a in articles
-        ]
+            raise UpstreamResponseError(f"NewsData.io API error: {data.get('message')}")
+        return _parse_newsdata(data), data.get("nextPage")
+    finally:
+        UPSTREAM_REQUEST_SECONDS.observe(time.perf_counter() - start, service=SERVICE, outcome=outcome)
+
+def _guarded_news_page(limit=20, page=None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """_request_news_page behind the circuit breaker, with jittered retries"""
+    return call_with_retries(SERVICE, _request_news_page, limit, page)
+
+def _news_cache():
+    config = get_config()
+    return get_cache(SERVICE, config.NEWS_CACHE_TTL, config.NEWS_CACHE_MAX_STALE)
+
+def fetch_news_page(limit=20, page=None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Fetches one page of NewsData.io results (newest first) and its nextPage cursor."""
+    try:
+        return _guarded_news_page(limit, page)
     except Exception as e:
         logger.error(f"Failed to fetch news: {e}")
-        return []
+        return [], None
+
+def fetch_latest_news(limit=20) -> Tuple[List[Dict[str, Any]], bool]:
+    """Newest NewsData.io articles and whether they are stale, served from cache while a refresh runs."""
+    # Keyed on the page size actually requested, so every limit past it shares one entry
+    size = min(limit, NEWSDATA_PAGE_SIZE)
+    try:
+        articles, stale = _news_cache().get(size, lambda: _guarded_news_page(size)[0])
+        return articles[:limit], stale
+    except Exception as e:
+        logger.error(f"Failed to fetch news: {e}")
+        return [], False
+
+def fetch_news_from_newsdata(limit=20) -> List[Dict[str, Any]]:
+    """Fetches news from NewsData.io API and returns a list of articles."""
+    return fetch_latest_news(limit)[0]
+
+def _published_at(article) -> Optional[datetime]:
+    value = article.get("publish_date")
+    if not value:
+        return None
+    try:
+        published = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if published.tzinfo is not None:
+        published = published.astimezone(timezone.utc).replace(tzinfo=None)
+    return published
+
+def _upstream_id(article) -> str:
+    raw = article.get("raw") or {}
+    return raw.get("article_id") or raw.get("link") or article.get("title") or ""
+
+def _is_after(article, published, ids) -> bool:
+    """True if the article is newer than the (published, ids) mark"""
+    when = _published_at(article)
+    if published is None or when is None or when > published:
+        return True
+    return when == published and _upstream_id(article) not in ids
+
+def _newest(mark, articles):
+    """Advance a (published, ids) mark to the newest of ``articles``"""
+    published, ids = mark
+    for article in articles:
+        when = _published_at(article)
+        if when is None:
+            continue
+        if published is None or when > published:
+            published, ids = when, [_upstream_id(article)]
+        elif when == published and _upstream_id(article) not in ids:
+            ids = ids + [_upstream_id(article)]
+    return published, ids
+
+def fetch_news_since(watermark: Optional[Dict[str, Any]], limit=20, max_pages=5) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Fetches only articles newer than ``watermark`` and returns them with the advanced watermark.
+
+    Pages are walked newest first until one reaches an article at or before the
+    watermark. If ``max_pages`` runs out first, the cursor and the newest article
+    seen so far are kept in the watermark and the next call resumes the catch-up
+    from that cursor before the watermark moves. Without a watermark only the
+    newest page is taken.
+    """
+    watermark = watermark or {}
+    published = watermark.get("last_publish_date")
+    ids = watermark.get("last_article_ids") or []
+    newest = (watermark.get("pending_publish_date"), watermark.get("pending_article_ids") or [])
+    page = watermark.get("next_page")
+    fresh = []
+    for _ in range(max_pages if published is not None else 1):
+        try:
+            articles, next_page = _guarded_news_page(limit, page)
+        except Exception as e:
+            # Keep the cursor so a failed page does not skip part of a catch-up
+            logger.error(f"Failed to fetch news: {e}")
+            break
+        new = [a for a in articles if _is_after(a, published, ids)]
+        fresh.extend(new)
+        newest = _newest(newest, new)
+        if published is None or len(new) < len(articles) or not next_page:
+            # Caught up with the watermark (or the feed): move it to the newest article seen
+            last_published, last_ids = newest if newest[0] is not None else (published, ids)
+            return fresh, {"last_publish_date": last_published, "last_article_ids": last_ids,
+                           "next_page": None, "pending_publish_date": None, "pending_article_ids": []}
+        page = next_page
+    return fresh, {"last_publish_date": published, "last_article_ids": ids, "next_page": page,
+                   "pending_publish_date": newest[0], "pending_article_ids": newest[1]}
+
+async def _request_news_async(limit=20) -> List[Dict[str, Any]]:
+    from scrapers.http_pool import get_async_client
+    config = get_config()
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        resp = await get_async_client().get(config.NEWSDATA_BASE_URL, params=_newsdata_params(config, limit))
+        resp.raise_for_status()
+        data = resp.json()
+        outcome = "success"
+        if data.get("status") != "success":
+            raise UpstreamResponseError(f"NewsData.io API error: {data.get('message')}")
+        return _parse_newsdata(data)
+    finally:
+        UPSTREAM_REQUEST_SECONDS.observe(time.perf_counter() - start, service=SERVICE, outcome=outcome)
+
+async def fetch_latest_news_async(limit=20) -> Tuple[List[Dict[str, Any]], bool]:
+    """Async fetch_latest_news on the shared connection pool."""
+    size = min(limit, NEWSDATA_PAGE_SIZE)
+    try:
+        articles, stale = await _news_cache().get_async(
+            size, lambda: call_with_retries_async(SERVICE, _request_news_async, size))
+        return articles[:limit], stale
+    except Exception as e:
+        logger.error(f"Failed to fetch news: {e}")
+        return [], False
+
+async def fetch_news_from_newsdata_async(limit=20) -> List[Dict[str, Any]]:
+    """Async fetch_news_from_newsdata on the shared connection pool."""
+    return (await fetch_latest_news_async(limit))[0]
 
 def filter_geopolitical_news(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Filters articles for geopolitical relevance based on keywords."""
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from config import get_config
+from metrics import UPSTREAM_REQUEST_SECONDS
+from scrapers.resilience import UpstreamResponseError, call_with_retries, call_with_retries_async, get_cache
+
+logger = logging.getLogger(__name__)
+
+SERVICE = "alpha_vantage"  # circuit breaker and cache name
+
+def _quote_params(config, symbol):
+    return {
+        "function": "GLOBAL_QUOTE",
+        "symbol": symbol,
+        "apikey": config.ALPHA_VANTAGE_STOCK_API_KEY
+    }
+
+def _parse_global_quote(symbol, data) -> Optional[Dict[str, Any]]:
+    quote = data.get("Global Quote") or {}
+    if not quote.get("05. price"):
+        logger.error(f"Alpha Vantage returned no quote for {symbol}: {data.get('Note') or data.get('Error Message') or data}")
+        return None
+    return {
+        "price": float(quote["05. price"]),
+        "change": float(quote.get("09. change") or 0.0),
+        "change_percent": float((quote.get("10. change percent") or "0").rstrip("%")),
+        "volume": float(quote["06. volume"]) if quote.get("06. volume") else None,
+        "date": quote.get("07. latest trading day"),
+        "source": "alpha_vantage"
+    }
+
+def _request_quote(symbol) -> Dict[str, Any]:
+    import requests  # deferred: only needed when actually fetching
+    config = get_config()
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        resp = requests.get(config.ALPHA_VANTAGE_BASE_URL, params=_quote_params(config, symbol),
+                            timeout=config.UPSTREAM_TIMEOUT)
+        resp.raise_for_status()
+        data = resp.json()
+        outcome = "success"
+        return _require_quote(symbol, data)
+    finally:
+        UPSTREAM_REQUEST_SECONDS.observe(time.perf_counter() - start, service=SERVICE, outcome=outcome)
+
+async def _request_quote_async(symbol) -> Dict[str, Any]:
+    from scrapers.http_pool import get_async_client
+    config = get_config()
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        resp = await get_async_client().get(config.ALPHA_VANTAGE_BASE_URL, params=_quote_params(config, symbol))
+        resp.raise_for_status()
+        data = resp.json()
+        outcome = "success"
+        return _require_quote(symbol, data)
+    finally:
+        UPSTREAM_REQUEST_SECONDS.observe(time.perf_counter() - start, service=SERVICE, outcome=outcome)
+
+def _require_quote(symbol, data) -> Dict[str, Any]:
+    quote = _parse_global_quote(symbol, data)
+    if quote is None:  # rate-limit notes and unknown symbols must not be cached
+        raise UpstreamResponseError(f"no quote for {symbol}")
+    return quote
+
+def _quote_cache():
+    config = get_config()
+    return get_cache(SERVICE, config.QUOTE_CACHE_TTL, config.QUOTE_CACHE_MAX_STALE)
+
+def _marked(quote, stale) -> Dict[str, Any]:
+    return dict(quote, stale=True) if stale else quote
+
+def fetch_quote(symbol) -> Optional[Dict[str, Any]]:
+    """Fetches the latest quote for one symbol from Alpha Vantage; a cached quote past its TTL is marked stale."""
+    try:
+        return _marked(*_quote_cache().get(symbol, lambda: call_with_retries(SERVICE, _request_quote, symbol)))
+    except Exception as e:
+        logger.error(f"Failed to fetch quote for {symbol}: {e}")
+        return None
+
+async def fetch_quote_async(symbol) -> Optional[Dict[str, Any]]:
+    """Async fetch_quote on the shared connection pool."""
+    try:
+        return _marked(*await _quote_cache().get_async(
+            symbol, lambda: call_with_retries_async(SERVICE, _request_quote_async, symbol)))
+    except Exception as e:
+        logger.error(f"Failed to fetch quote for {symbol}: {e}")
+        return None
+
+async def fetch_quotes_async(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch quotes for several symbols concurrently, dropping failed lookups."""
+    quotes = await asyncio.gather(*(fetch_quote_async(s) for s in symbols))
+    return {symbol: quote for symbol, quote in zip(symbols, quotes) if quote}
@@ -0,0 +1,266 @@
+"""
+Resilience for the upstream news and quote APIs: a circuit breaker per
+service, bounded retries with jittered exponential backoff, and a
+stale-while-revalidate cache.
+
+Once a cached value passes its TTL, callers get it back at once, marked
+stale, while a single background refresh runs. Cold callers (nothing cached)
+wait for the upstream. When a service keeps failing, its breaker opens and
+those callers fail fast instead of waiting for a timeout.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from config import get_config
+from metrics import UPSTREAM_SHORT_CIRCUITS_TOTAL, UPSTREAM_STALE_TOTAL
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose breaker is open"""
+
+class UpstreamResponseError(Exception):
+    """The upstream answered, but without usable data (an API error status, a rate-limit note); not retried"""
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures, then lets one probe through every ``reset_timeout`` seconds"""
+
+    def __init__(self, service: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.service = service
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        return 'half_open' if time.monotonic() - self.opened_at >= self.reset_timeout else 'open'
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self._probing = True  # half-open: exactly one trial call
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info(f"{self.service} circuit closed")
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or (self.opened_at is None and self.failures >= self.failure_threshold):
+                if self.opened_at is None:
+                    logger.warning(f"{self.service} circuit opened after {self.failures} consecutive failures")
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+    def record_abandoned(self):
+        """The call ended without an outcome (cancelled or interrupted); free the half-open probe"""
+        with self._lock:
+            self._probing = False
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(service: str) -> CircuitBreaker:
+    breaker = _breakers.get(service)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(service)
+            if breaker is None:
+                config = get_config()
+                breaker = _breakers[service] = CircuitBreaker(
+                    service, config.UPSTREAM_BREAKER_FAILURES, config.UPSTREAM_BREAKER_RESET)
+    return breaker
+
+def is_retryable(error: Exception) -> bool:
+    """Timeouts, connection errors, 429 and 5xx are worth retrying; other HTTP errors are not"""
+    if isinstance(error, (CircuitOpenError, UpstreamResponseError)):
+        return False
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    return status is None or status == 429 or status >= 500
+
+def backoff_delays(retries: int, base: float, cap: float):
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))"""
+    for attempt in range(retries):
+        yield random.uniform(0, min(cap, base * 2 ** attempt))
+
+def call_with_retries(service: str, func: Callable, *args, **kwargs):
+    """Call ``func`` through the service's breaker, retrying transient failures"""
+    config = get_config()
+    breaker = get_breaker(service)
+    delays = backoff_delays(config.UPSTREAM_RETRIES, config.UPSTREAM_RETRY_BACKOFF, config.UPSTREAM_RETRY_MAX_BACKOFF)
+    # One admission per call: its retries count as a single failure once exhausted
+    if not breaker.allow():
+        UPSTREAM_SHORT_CIRCUITS_TOTAL.inc(service=service)
+        raise CircuitOpenError(f"{service} circuit open")
+    while True:
+        try:
+            result = func(*args, **kwargs)
+        except UpstreamResponseError:
+            breaker.record_success()  # the service answered; its answer is the caller's problem
+            raise
+        except Exception as e:
+            delay = next(delays, None) if is_retryable(e) else None
+            if delay is None:
+                breaker.record_failure()
+                raise
+            logger.warning(f"{service} call failed ({e}); retrying in {delay:.2f}s")
+        except BaseException:
+            breaker.record_abandoned()
+            raise
+        else:
+            breaker.record_success()
+            return result
+        try:
+            time.sleep(delay)
+        except BaseException:
+            breaker.record_abandoned()
+            raise
+
+async def call_with_retries_async(service: str, func: Callable[..., Awaitable], *args, **kwargs):
+    """Async call_with_retries"""
+    config = get_config()
+    breaker = get_breaker(service)
+    delays = backoff_delays(config.UPSTREAM_RETRIES, config.UPSTREAM_RETRY_BACKOFF, config.UPSTREAM_RETRY_MAX_BACKOFF)
+    # One admission per call: its retries count as a single failure once exhausted
+    if not breaker.allow():
+        UPSTREAM_SHORT_CIRCUITS_TOTAL.inc(service=service)
+        raise CircuitOpenError(f"{service} circuit open")
+    while True:
+        try:
+            result = await func(*args, **kwargs)
+        except UpstreamResponseError:
+            breaker.record_success()
+            raise
+        except Exception as e:
+            delay = next(delays, None) if is_retryable(e) else None
+            if delay is None:
+                breaker.record_failure()
+                raise
+            logger.warning(f"{service} call failed ({e}); retrying in {delay:.2f}s")
+        except BaseException:  # e.g. CancelledError when the client goes away
+            breaker.record_abandoned()
+            raise
+        else:
+            breaker.record_success()
+            return result
+        try:
+            await asyncio.sleep(delay)
+        except BaseException:
+            breaker.record_abandoned()
+            raise
+
+class StaleCache:
+    """Last good upstream value per key, servable for ``max_stale`` seconds past its ``ttl``"""
+
+    def __init__(self, service: str, ttl: float, max_stale: float):
+        self.service = service
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._entries: Dict[Any, Tuple[Any, float]] = {}  # key -> (value, fetched at)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def lookup(self, key) -> Tuple[Any, Optional[str]]:
+        """(value, 'fresh' | 'stale'), or (None, None) when nothing usable is cached"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, None
+        value, fetched_at = entry
+        age = time.monotonic() - fetched_at
+        if age < self.ttl:
+            return value, 'fresh'
+        if age < self.ttl + self.max_stale:
+            return value, 'stale'
+        return None, None
+
+    def store(self, key, value):
+        self._entries[key] = (value, time.monotonic())
+
+    def begin_refresh(self, key) -> bool:
+        """Claim the background refresh for ``key``; False if one is already running"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def _refresh(self, key, loader):
+        try:
+            self.store(key, loader())
+        except Exception as e:
+            logger.warning(f"Background refresh of {self.service} {key!r} failed: {e}")
+        finally:
+            self.end_refresh(key)
+
+    def get(self, key, loader: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return (value, stale); only a cold miss waits for ``loader``, whose errors propagate"""
+        value, state = self.lookup(key)
+        if state == 'fresh':
+            return value, False
+        if state == 'stale':
+            if self.begin_refresh(key):
+                threading.Thread(target=self._refresh, args=(key, loader), daemon=True,
+                                 name=f'refresh-{self.service}').start()
+            UPSTREAM_STALE_TOTAL.inc(service=self.service)
+            return value, True
+        value = loader()
+        self.store(key, value)
+        return value, False
+
+    async def _refresh_async(self, key, loader):
+        try:
+            self.store(key, await loader())
+        except Exception as e:
+            logger.warning(f"Background refresh of {self.service} {key!r} failed: {e}")
+        finally:
+            self.end_refresh(key)
+
+    async def get_async(self, key, loader: Callable[[], Awaitable]) -> Tuple[Any, bool]:
+        """Async get; the background refresh runs as a task on the current loop"""
+        value, state = self.lookup(key)
+        if state == 'fresh':
+            return value, False
+        if state == 'stale':
+            if self.begin_refresh(key):
+                task = asyncio.get_running_loop().create_task(self._refresh_async(key, loader))
+                _background_tasks.add(task)  # keep a reference until it finishes
+                task.add_done_callback(_background_tasks.discard)
+            UPSTREAM_STALE_TOTAL.inc(service=self.service)
+            return value, True
+        value = await loader()
+        self.store(key, value)
+        return value, False
+
+_background_tasks = set()
+_caches: Dict[str, StaleCache] = {}
+
+def get_cache(service: str, ttl: float, max_stale: float) -> StaleCache:
+    cache = _caches.get(service)
+    if cache is None:
+        with _breakers_lock:
+            cache = _caches.setdefault(service, StaleCache(service, ttl, max_stale))
+    return cache
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Production server for the Flask app: gunicorn with multi-process,
+multi-threaded workers built from ``create_app()``.
+
+Usage (from backend/):
+    flask --app mainApp init-db                     # once, before the first start
+    python serve.py                                 # SERVER_* settings from config
+    python serve.py --workers 4 --threads 8 --bind 0.0.0.0:8000 --pid /tmp/geopoli.pid
+    python serve.py --asgi                          # async upstream routes (see asgi.py)
+
+Signals to the master process:
+    HUP         graceful reload: start new workers with fresh code and config,
+                then retire the old ones once their in-flight requests finish
+    TERM        graceful shutdown (waits up to SERVER_GRACEFUL_TIMEOUT)
+    TTIN/TTOU   add/remove one worker
+
+Workers are recycled after SERVER_MAX_REQUESTS requests (plus jitter, so they
+do not all restart at once). Each worker builds its own database engine after
+fork, so connections are never shared between processes. Orchestrators should
+probe /api/health/live for liveness and /api/health/ready for readiness.
+"""
+
+import os
+import sys
+import argparse
+
+from gunicorn.app.base import BaseApplication
+
+from config import config as config_by_name, get_config, validate_required_keys
+
+def post_fork(server, worker):
+    """Drop any engine inherited from the master so this worker opens its own connections"""
+    import database
+    database.dispose_engine()
+
+class ProductionServer(BaseApplication):
+    """Gunicorn application that serves ``mainApp.create_app(config_name)``, or the ASGI wrapper"""
+
+    def __init__(self, options, config_name=None, asgi=False):
+        self.options = options
+        self.config_name = config_name
+        self.asgi = asgi
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        if self.asgi:
+            from asgi import create_asgi_app
+            return create_asgi_app(self.config_name, wsgi_threads=self.options['threads'])
+        from mainApp import create_app
+        return create_app(self.config_name)
+
+def build_options(config, args):
+    """Gunicorn settings from config, overridden by command-line arguments"""
+    threads = args.threads if args.threads is not None else config.SERVER_THREADS
+    max_requests = args.max_requests if args.max_requests is not None else config.SERVER_MAX_REQUESTS
+    return {
+        'bind': args.bind or config.SERVER_BIND,
+        'workers': args.workers if args.workers is not None else config.SERVER_WORKERS,
+        'threads': threads,
+        # Uvicorn workers run one event loop each; --threads then sizes the pool for the Flask routes
+        'worker_class': 'uvicorn.workers.UvicornWorker' if args.asgi else 'gthread' if threads > 1 else 'sync',
+        'max_requests': max_requests,
+        'max_requests_jitter': min(config.SERVER_MAX_REQUESTS_JITTER, max_requests // 10),
+        'timeout': config.SERVER_TIMEOUT,
+        'graceful_timeout': config.SERVER_GRACEFUL_TIMEOUT,
+        'keepalive': 5,
+        # Without preload every worker imports the app itself, which is what
+        # lets HUP pick up new code; with it, post_fork still resets the engine
+        'preload_app': args.preload,
+        'post_fork': post_fork,
+        'pidfile': args.pid,
+        'accesslog': args.access_log,
+        'errorlog': '-',
+        'loglevel': config.LOG_LEVEL.lower(),
+        'proc_name': 'geopoli-news',
+        # Heartbeat files on tmpfs so a slow disk cannot stall workers
+        'worker_tmp_dir': '/dev/shm' if os.path.isdir('/dev/shm') else None,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the production server')
+    parser.add_argument('--config', choices=sorted(config_by_name), help='Configuration name (default: FLASK_CONFIG)')
+    parser.add_argument('--bind', help='Address to listen on (default: SERVER_BIND)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: SERVER_WORKERS)')
+    parser.add_argument('--threads', type=int, help='Threads per worker (default: SERVER_THREADS)')
+    parser.add_argument('--max-requests', type=int, help='Recycle a worker after this many requests, 0 disables (default: SERVER_MAX_REQUESTS)')
+    parser.add_argument('--asgi', action='store_true', help='Serve asgi.py with uvicorn workers (async upstream routes)')
+    parser.add_argument('--preload', action='store_true', help='Load the app once in the master before forking')
+    parser.add_argument('--pid', help='Write the master pid to this file, e.g. for `kill -HUP`')
+    parser.add_argument('--access-log', help="Access log file, or '-' for stderr")
+    args = parser.parse_args(argv)
+
+    config = config_by_name[args.config] if args.config else get_config()
+    validate_required_keys()
+    options = build_options(config, args)
+    print(f"Starting {options['workers']} workers x {options['threads']} threads on {options['bind']}", file=sys.stderr)
+    ProductionServer(options, args.config, args.asgi).run()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Frontend assets, fingerprinted and precompressed once per process.
+
+StaticManifest reads every file under ``frontend/`` at startup. Each asset
+gets a content hash and a fingerprinted URL (``js/charts.3f9a1c2e.js``), plus
+gzip and, when ``brotli`` is installed, brotli variants. ``index.html`` is
+rewritten to reference the fingerprinted URLs. Fingerprinted files never
+change, so they are served with a year-long ``immutable`` Cache-Control.
+``index.html`` and the plain URLs are revalidated by ETag. After the first
+visit a page load is a single 304 for ``index.html``.
+
+``write_build`` writes the same files, variants and a ``manifest.json`` to a
+directory, for a reverse proxy to serve with no Python involved (e.g. nginx
+``gzip_static``/``brotli_static``).
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+from typing import Dict, Optional, Tuple
+
+from werkzeug.http import parse_etags, quote_etag
+
+from responses import MIN_COMPRESS_SIZE, brotli, choose_encoding
+
+HASH_LENGTH = 8
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'no-cache'
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+# href="..." and src="..." attributes in index.html that may name a local asset
+ASSET_REFERENCE = re.compile(r'(\b(?:href|src)=")([^"#?]+)(")')
+
+class StaticAsset:
+    """One frontend file: its bytes in every encoding and its validator"""
+    __slots__ = ('path', 'url', 'content_type', 'etag', 'bodies')
+
+    def __init__(self, path: str, body: bytes, url: Optional[str] = None):
+        self.path = path
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if self.content_type.startswith('text/') or self.content_type == 'application/javascript':
+            self.content_type += '; charset=utf-8'
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.etag = digest
+        if url is None:
+            stem, ext = posixpath.splitext(path)
+            url = f'{stem}.{digest[:HASH_LENGTH]}{ext}'
+        self.url = url
+        self.bodies = {'identity': body}
+        if len(body) >= MIN_COMPRESS_SIZE and self.content_type.startswith(COMPRESSIBLE_TYPES):
+            # Built once, so the slowest (smallest) settings are affordable
+            self.bodies['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.bodies['br'] = brotli.compress(body, quality=11)
+
+    def encoding_for(self, accept_encoding: str) -> str:
+        return choose_encoding(accept_encoding, [e for e in ('br', 'gzip') if e in self.bodies])
+
+    def respond(self, accept_encoding: str = '', if_none_match: Optional[str] = None,
+                immutable: bool = False) -> Tuple[int, Dict[str, str], bytes]:
+        """(status, headers, body) for a GET, with 304 revalidation; framework-agnostic like encode_json"""
+        headers = {
+            'Content-Type': self.content_type,
+            'Cache-Control': IMMUTABLE_CACHE if immutable else REVALIDATE_CACHE,
+            # Weak, since the same content is sent with different encodings
+            'ETag': quote_etag(self.etag, weak=True),
+        }
+        if len(self.bodies) > 1:
+            headers['Vary'] = 'Accept-Encoding'
+        if if_none_match and parse_etags(if_none_match).contains_weak(self.etag):
+            return 304, headers, b''
+        encoding = self.encoding_for(accept_encoding)
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return 200, headers, self.bodies[encoding]
+
+class StaticManifest:
+    """Every frontend asset by URL, fingerprinted and plain, plus the rewritten index.html"""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.assets: Dict[str, StaticAsset] = {}  # logical path -> asset
+        self._by_url: Dict[str, Tuple[StaticAsset, bool]] = {}  # url -> (asset, fingerprinted)
+        self.index: Optional[StaticAsset] = None
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for filename in filenames:
+                full_path = os.path.join(dirpath, filename)
+                path = os.path.relpath(full_path, self.root).replace(os.sep, '/')
+                if filename.startswith('.') or path == 'index.html':
+                    continue
+                with open(full_path, 'rb') as f:
+                    self._add(StaticAsset(path, f.read()))
+        index_path = os.path.join(self.root, 'index.html')
+        if os.path.exists(index_path):
+            with open(index_path, encoding='utf-8') as f:
+                html = ASSET_REFERENCE.sub(self._fingerprint_reference, f.read())
+            self.index = StaticAsset('index.html', html.encode('utf-8'), url='index.html')
+            self._add(self.index)
+
+    def _add(self, asset: StaticAsset):
+        self.assets[asset.path] = asset
+        self._by_url[asset.path] = (asset, False)
+        self._by_url[asset.url] = (asset, asset.url != asset.path)
+
+    def _fingerprint_reference(self, match) -> str:
+        asset = self.assets.get(posixpath.normpath(match.group(2).lstrip('/')))
+        if asset is None:
+            return match.group(0)  # external (CDN) or unknown
+        prefix = '/' if match.group(2).startswith('/') else ''
+        return f'{match.group(1)}{prefix}{asset.url}{match.group(3)}'
+
+    def lookup(self, url: str) -> Tuple[Optional[StaticAsset], bool]:
+        """(asset, fingerprinted) for a request path relative to the frontend root"""
+        return self._by_url.get(url.lstrip('/'), (None, False))
+
+    def serve(self, path: str, accept_encoding: str = '',
+              if_none_match: Optional[str] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """Respond to GET ``path``; unknown paths without a file extension get index.html (client-side routes)"""
+        asset, fingerprinted = self.lookup(path)
+        if asset is None and not posixpath.splitext(path)[1]:
+            asset = self.index
+        if asset is None:
+            return 404, {'Content-Type': 'text/plain; charset=utf-8', 'Cache-Control': REVALIDATE_CACHE}, b'Not Found'
+        return asset.respond(accept_encoding, if_none_match, immutable=fingerprinted)
+
+    def manifest(self) -> Dict[str, str]:
+        """Logical path -> fingerprinted URL"""
+        return {path: asset.url for path, asset in sorted(self.assets.items()) if asset is not self.index}
+
+    def write_build(self, out_dir: str) -> int:
+        """Write fingerprinted files with .gz/.br variants, index.html and manifest.json; return files written"""
+        written = 0
+        for asset in self.assets.values():
+            target = os.path.join(out_dir, *asset.url.split('/'))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            suffixes = {'identity': '', 'gzip': '.gz', 'br': '.br'}
+            for encoding, body in asset.bodies.items():
+                with open(target + suffixes[encoding], 'wb') as f:
+                    f.write(body)
+                written += 1
+        with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.manifest(), f, indent=2)
+        return written + 1
@@ -0,0 +1,204 @@
+"""
+Load test for the production server: throughput and latency by worker count.
+
+Usage (from the repository root):
+    python benchmarks/load_test.py --workers 1,2,4 --threads 4 --clients 32 --duration 10
+    python benchmarks/load_test.py --path '/api/news/latest?limit=100' --output load.json
+    python benchmarks/load_test.py --workers 1 --clients 64 --path /api/news --stub-upstream 0.2 [--asgi]
+
+For each worker count, backend/serve.py is started against a scratch SQLite
+database prefilled with the synthetic corpus. Once /api/health/ready answers,
+client processes with keep-alive connections hit --path for --duration
+seconds. Requests per second and latency percentiles are reported per run.
+
+With --stub-upstream DELAY the news and quote APIs are replaced by
+stub_upstream.py answering after DELAY seconds, which shows how many
+upstream-bound requests one worker can hold in flight; compare a run with
+--asgi (async routes, see backend/asgi.py) against one without.
+--stub-options passes failure injection through to the stub, e.g. an
+outage in the middle of the run to check that latency stays flat while the
+circuit breaker and stale cache (scrapers/resilience.py) cover for it:
+    python benchmarks/load_test.py --workers 2 --path /api/news --stub-upstream 0.05 \
+        --stub-options '--outage-after 8 --outage-for 10 --outage-mode hang' --duration 20
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shlex
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+if BENCH_DIR not in sys.path:
+    sys.path.insert(0, BENCH_DIR)
+
+from run_benchmarks import BACKEND_DIR, configure_environment, _prefill
+
+def prepare_database(rows):
+    import database
+
+    database.init_db()
+    _prefill(database.get_engine(), database.NewsArticle, rows, 0)
+    database.dispose_engine()
+
+def start_stub(args):
+    """Start stub_upstream.py and point the server's upstream URLs at it"""
+    base = f'http://127.0.0.1:{args.stub_port}'
+    os.environ['NEWSDATA_BASE_URL'] = f'{base}/api/1/news'
+    os.environ['ALPHA_VANTAGE_BASE_URL'] = f'{base}/query'
+    os.environ.setdefault('NEWS_API_KEY', 'stub')
+    os.environ.setdefault('ALPHA_VANTAGE_API_KEY', 'stub')
+    stub = subprocess.Popen([sys.executable, os.path.join(BENCH_DIR, 'stub_upstream.py'), '--port', str(args.stub_port),
+                             '--delay', str(args.stub_upstream)] + shlex.split(args.stub_options), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            http.client.HTTPConnection('127.0.0.1', args.stub_port, timeout=2).connect()
+            return stub
+        except OSError:
+            time.sleep(0.1)
+    stub.terminate()
+    raise RuntimeError('stub upstream did not start')
+
+def wait_until_ready(host, port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request('GET', '/api/health/ready')
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return False
+
+def run_client(host, port, path, duration, method='GET', body=None):
+    """Issue requests on one keep-alive connection until ``duration`` elapses"""
+    latencies, errors = [], 0
+    headers = {'Accept-Encoding': 'gzip'}
+    if body is not None:
+        headers['Content-Type'] = 'application/json'
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    deadline = time.perf_counter() + duration
+    while True:
+        start = time.perf_counter()
+        if start >= deadline:
+            break
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+    conn.close()
+    return latencies, errors
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def load_run(args, workers):
+    host, port = '127.0.0.1', args.port
+    command = [sys.executable, 'serve.py', '--workers', str(workers), '--threads', str(args.threads),
+               '--bind', f'{host}:{port}', '--max-requests', '0']
+    if args.asgi:
+        command.append('--asgi')
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=dict(os.environ),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_until_ready(host, port):
+            raise RuntimeError(f'server with {workers} workers did not become ready')
+        run_client(host, port, args.path, args.warmup, args.method, args.body)
+        with ProcessPoolExecutor(max_workers=args.clients) as pool:
+            futures = [pool.submit(run_client, host, port, args.path, args.duration, args.method, args.body)
+                       for _ in range(args.clients)]
+            outcomes = [f.result() for f in futures]
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    latencies = sorted(l for lat, _ in outcomes for l in lat)
+    errors = sum(e for _, e in outcomes)
+    return {
+        'workers': workers,
+        'threads': args.threads,
+        'asgi': args.asgi,
+        'clients': args.clients,
+        'requests': len(latencies),
+        'errors': errors,
+        'requests_per_s': len(latencies) / args.duration,
+        'mean_ms': statistics.fmean(latencies) * 1e3 if latencies else None,
+        'p50_ms': percentile(latencies, 0.50) * 1e3 if latencies else None,
+        'p95_ms': percentile(latencies, 0.95) * 1e3 if latencies else None,
+        'p99_ms': percentile(latencies, 0.99) * 1e3 if latencies else None,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the production server across worker counts')
+    parser.add_argument('--workers', type=lambda v: [int(x) for x in v.split(',')], default=[1, 2, 4])
+    parser.add_argument('--threads', type=int, default=4, help='Threads per worker')
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent client connections')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds of load per worker count')
+    parser.add_argument('--warmup', type=float, default=1.0, help='Seconds of single-client warm-up per run')
+    parser.add_argument('--path', default='/api/news/latest', help='Request path to load')
+    parser.add_argument('--method', default='GET')
+    parser.add_argument('--body', help='JSON request body, e.g. \'{"text": "sanctions on oil exports"}\'')
+    parser.add_argument('--asgi', action='store_true', help='Serve with uvicorn workers and the async routes')
+    parser.add_argument('--stub-upstream', type=float, metavar='DELAY',
+                        help='Answer upstream news/quote calls from a local stub after DELAY seconds')
+    parser.add_argument('--stub-options', default='', help="Extra stub_upstream.py flags, e.g. '--fail-rate 0.3'")
+    parser.add_argument('--stub-port', type=int, default=8899)
+    parser.add_argument('--rows', type=int, default=5000, help='Articles to prefill the scratch database with')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--output', help='Write results JSON to this path')
+    parser.add_argument('--workdir', help='Scratch directory for the database (default: temp dir)')
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='geopoli-load-')
+    configure_environment(workdir)
+    prepare_database(args.rows)
+    stub = start_stub(args) if args.stub_upstream is not None else None
+
+    runs = []
+    print(f"{'workers':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}", file=sys.stderr)
+    try:
+        for workers in args.workers:
+            result = load_run(args, workers)
+            runs.append(result)
+            print(f"{workers:>7} {result['requests_per_s']:>9.1f} {result['p50_ms'] or 0:>8.2f} "
+                  f"{result['p95_ms'] or 0:>8.2f} {result['p99_ms'] or 0:>8.2f} {result['errors']:>6}", file=sys.stderr)
+    finally:
+        if stub is not None:
+            stub.terminate()
+            try:
+                stub.wait(timeout=10)
+            except subprocess.TimeoutExpired:  # still holding hung connections
+                stub.kill()
+                stub.wait()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'meta': {'timestamp': datetime.utcnow().isoformat(), 'path': args.path, 'rows': args.rows,
+                                'stub_upstream_delay': args.stub_upstream, 'cpu_count': os.cpu_count()},
+                       'runs': runs}, f, indent=2)
+            f.write('\n')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
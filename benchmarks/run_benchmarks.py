@@ -0,0 +1,317 @@
+"""
+Benchmark harness for ingest, classification, storage and API hot paths.
+
+Usage (from the repository root):
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --suite classify --suite api --compare baseline.json
+
+Results are written as JSON. With --compare, every benchmark whose median is
+more than --threshold slower than in the baseline file is reported and the
+process exits non-zero, so runs can gate CI.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT_DIR, 'backend')
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+for path in (BACKEND_DIR, BENCH_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from corpus import generate_articles
+
+SUITES = ('startup', 'classify', 'db', 'api')
+DEFAULT_DB_SIZES = (10_000, 100_000, 1_000_000)
+SENTIMENT_BUDGET_US = 100  # per-article ceiling for the sentiment scorer; the run fails above it
+
+def measure(func, repeat=5, number=1):
+    """Time ``func`` ``repeat`` times (``number`` calls each) and summarize per-call seconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    median = statistics.median(samples)
+    return {
+        'median_s': median,
+        'min_s': min(samples),
+        'mean_s': statistics.fmean(samples),
+        'ops_per_s': (1.0 / median) if median else None,
+        'repeat': repeat,
+        'number': number,
+    }
+
+def configure_environment(workdir):
+    """Point the backend at a scratch database and log file before it is imported"""
+    os.makedirs(workdir, exist_ok=True)
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    os.environ['LOG_FILE'] = os.path.join(workdir, 'bench.log')
+    os.environ['PRICE_STORE_DIR'] = os.path.join(workdir, 'prices')
+    os.environ['RATE_LIMIT_ENABLED'] = 'False'
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+STARTUP_SNIPPETS = {
+    'import_mainApp': 'import mainApp',
+    'create_app': 'import mainApp; mainApp.create_app()',
+    'first_db_request': (
+        'import mainApp; app = mainApp.create_app(); '
+        'app.test_client().get("/api/news/latest")'
+    ),
+}
+
+def bench_startup(args):
+    """Cold-start cost in fresh interpreters, as seen by each worker boot or test run"""
+    results = {}
+    env = dict(os.environ)
+    for name, snippet in STARTUP_SNIPPETS.items():
+        code = f'import time; t = time.perf_counter(); {snippet}; print(time.perf_counter() - t)'
+        samples = []
+        for _ in range(args.repeat):
+            out = subprocess.check_output([sys.executable, '-c', code], cwd=BACKEND_DIR, env=env, text=True,
+                                          stderr=subprocess.DEVNULL)
+            samples.append(float(out.strip().splitlines()[-1]))
+        median = statistics.median(samples)
+        results[f'startup.{name}'] = {
+            'median_s': median, 'min_s': min(samples), 'mean_s': statistics.fmean(samples),
+            'repeat': args.repeat,
+        }
+    return results
+
+def bench_classify(args):
+    from analyzers import news_processor, sentiment
+    from scrapers.news_api_client import filter_geopolitical_news
+    import config
+
+    articles = generate_articles(args.corpus_size, seed=args.seed, keyword_density=args.keyword_density,
+                                 region_density=args.region_density)
+    texts = [(a['title'] + ' ' + a['content']) for a in articles]
+    results = {}
+
+    def per_text(func):
+        return lambda: [func(t) for t in texts]
+
+    cases = {
+        'news_processor.relevance_score': per_text(news_processor.relevance_score),
+        'news_processor.extract_countries_regions': per_text(news_processor.extract_countries_regions),
+        'news_processor.categorize_event': per_text(news_processor.categorize_event),
+        'news_processor.sentiment_analysis': per_text(news_processor.sentiment_analysis),
+        'sentiment.score_sentiment': per_text(sentiment.score_sentiment),
+        'sentiment.score_batch': lambda: sentiment.score_batch(texts),
+        'news_processor.process_article': lambda: [news_processor.process_article(a) for a in articles],
+        'news_api_client.filter_geopolitical_news': lambda: filter_geopolitical_news(articles),
+        'config.is_geopolitical_event': per_text(config.is_geopolitical_event),
+        'config.get_affected_sectors': per_text(config.get_affected_sectors),
+        'config.get_sector_stocks': lambda: [config.get_sector_stocks(s) for s in config.Config.SECTORS for _ in range(100)],
+        'config.get_all_stocks': lambda: [config.get_all_stocks() for _ in range(1000)],
+    }
+    for name, func in cases.items():
+        result = measure(func, repeat=args.repeat)
+        result['items'] = len(texts)
+        result['per_item_us'] = result['median_s'] / len(texts) * 1e6
+        if name.startswith('sentiment.'):
+            result['budget_us'] = SENTIMENT_BUDGET_US
+        results[f'classify.{name}'] = result
+    return results
+
+def _prefill(engine, NewsArticle, rows, start):
+    """Insert ``rows`` processed articles with Core executemany, bypassing the per-row existence check"""
+    from analyzers.news_processor import process_article
+    from database import parse_datetime
+    from models import ArticleCountry
+
+    batch_size = 10_000
+    inserted = start
+    while inserted < start + rows:
+        count = min(batch_size, start + rows - inserted)
+        raw = generate_articles(count, seed=inserted, start=datetime(2020, 1, 1))
+        values, links = [], []
+        for offset, article in enumerate(raw):
+            article['raw']['link'] = f'https://prefill.example.com/{inserted + offset:09d}'
+            a = process_article(article)
+            values.append({
+                'id': a['id'], 'title': a['title'], 'content': a['content'], 'source': a['source'],
+                'publish_date': parse_datetime(a['publish_date']), 'relevance_score': a['relevance_score'],
+                'region': a['region'], 'countries': ','.join(a['countries']), 'event_type': a['event_type'],
+                'market_sentiment': a['market_sentiment'], 'affected_sectors': ','.join(a['affected_sectors']),
+            })
+            links.extend({'article_id': a['id'], 'country': country, 'publish_date': values[-1]['publish_date']}
+                         for country in a['countries'])
+        with engine.begin() as conn:
+            conn.execute(NewsArticle.__table__.insert(), values)
+            if links:
+                conn.execute(ArticleCountry.__table__.insert(), links)
+        inserted += count
+
+def bench_db(args):
+    import database
+    from analyzers.news_processor import process_article
+
+    database.init_db()
+    results = {}
+    current = 0
+    batch = [process_article(a) for a in generate_articles(
+        args.insert_batch, seed=args.seed + 1, duplicate_rate=args.duplicate_rate,
+        start=datetime(2030, 1, 1))]
+    for size in sorted(args.db_sizes):
+        start = time.perf_counter()
+        _prefill(database.get_engine(), database.NewsArticle, size - current, current)
+        database.hot_articles.invalidate()  # the prefill bypasses store_news_articles
+        results[f'db.prefill_to_{size}'] = {'seconds': time.perf_counter() - start, 'rows': size - current}
+        current = size
+
+        def insert_batch():
+            # Unique ids per run so every repeat stores the same number of new rows
+            insert_batch.run += 1
+            rows = [dict(a, id=f"{a['id'][:50]}#{size}-{insert_batch.run}") for a in batch]
+            database.store_news_articles(rows)
+        insert_batch.run = 0
+
+        results[f'db.store_news_articles.{args.insert_batch}@{size}'] = measure(insert_batch, repeat=args.repeat)
+        results[f'db.get_latest_news.20@{size}'] = measure(lambda: database.get_latest_news(20), repeat=args.repeat, number=10)
+        results[f'db.get_latest_news.500@{size}'] = measure(lambda: database.get_latest_news(500), repeat=args.repeat)
+        results[f'db.get_news_by_region.20@{size}'] = measure(lambda: database.get_news_by_region('Iran', 20), repeat=args.repeat, number=10)
+        results[f'db.get_news_by_countries.20@{size}'] = measure(lambda: database.get_news_by_countries(['Iran'], 20), repeat=args.repeat, number=10)
+        results[f'db.get_news_by_countries.2x20@{size}'] = measure(
+            lambda: database.get_news_by_countries(['Iran', 'Israel'], 20), repeat=args.repeat, number=10)
+        current += args.insert_batch * args.repeat
+    return results
+
+def bench_api(args):
+    import database
+    import mainApp
+
+    database.init_db()
+    raw = generate_articles(20, seed=args.seed, keyword_density=0.8)
+    # Keep upstream HTTP out of the measurement
+    from scrapers import news_api_client
+    news_api_client._request_news_page = lambda limit=20, page=None: ([dict(a) for a in raw[:limit]], None)
+    if database.get_latest_news(1) == []:
+        from analyzers.news_processor import process_article
+        database.store_news_articles([process_article(a) for a in generate_articles(500, seed=args.seed)])
+
+    client = mainApp.create_app().test_client()
+    text = {'text': 'Sanctions and military conflict threaten oil supply and shipping routes in the Middle East'}
+    endpoints = {
+        'GET /api/health': lambda: client.get('/api/health'),
+        'GET /api/news': lambda: client.get('/api/news?limit=20'),
+        'POST /api/impact': lambda: client.post('/api/impact', json=text),
+        'GET /api/historical': lambda: client.get('/api/historical'),
+        'GET /api/stocks/<sector>': lambda: client.get('/api/stocks/energy'),
+        'GET /api/stocks/<sector>/history': lambda: client.get('/api/stocks/energy/history'),
+        'POST /api/analysis/full': lambda: client.post('/api/analysis/full', json=text),
+        'GET /api/config/validate': lambda: client.get('/api/config/validate'),
+        'POST /api/news/refresh': lambda: client.post('/api/news/refresh'),
+        'GET /api/news/latest': lambda: client.get('/api/news/latest'),
+        'GET /api/news/latest?limit=500': lambda: client.get('/api/news/latest?limit=500'),
+        'GET /api/news/by-region/<region>': lambda: client.get('/api/news/by-region/Iran'),
+        'GET /api/news/by-country/<country>': lambda: client.get('/api/news/by-country/Iran'),
+        'GET /': lambda: client.get('/', headers={'Accept-Encoding': 'gzip'}),
+        'GET /api/stats': lambda: client.get('/api/stats?since=2024-01-01&until=2024-03-31'),
+    }
+    results = {}
+    # Missing API keys log a warning per request; keep that I/O out of the timings
+    logging.disable(logging.WARNING)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, call in endpoints.items():
+            status = call().status_code
+            result = measure(call, repeat=args.repeat, number=args.requests)
+            result['status'] = status
+            results[f'api.{name}'] = result
+    logging.disable(logging.NOTSET)
+    return results
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, text=True).strip()
+    except Exception:
+        return None
+
+def over_budget(results):
+    """Return benchmarks whose per-item time exceeds their ``budget_us``"""
+    return [(name, r['per_item_us'], r['budget_us']) for name, r in results.items()
+            if 'budget_us' in r and r['per_item_us'] > r['budget_us']]
+
+def compare(results, baseline, threshold):
+    """Return benchmarks whose median slowed down by more than ``threshold`` (a fraction)"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name, {}).get('median_s')
+        after = result.get('median_s')
+        if before and after and after > before * (1 + threshold):
+            regressions.append((name, before, after))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run GeoPoli News benchmarks')
+    parser.add_argument('--suite', action='append', choices=SUITES, help='Suites to run (default: all)')
+    parser.add_argument('--output', help='Write results JSON to this path (default: stdout)')
+    parser.add_argument('--compare', help='Baseline results JSON to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.15, help='Allowed slowdown before flagging (default 0.15 = 15%%)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--corpus-size', type=int, default=1000)
+    parser.add_argument('--keyword-density', type=float, default=0.3)
+    parser.add_argument('--region-density', type=float, default=0.5)
+    parser.add_argument('--duplicate-rate', type=float, default=0.2)
+    parser.add_argument('--db-sizes', type=lambda v: [int(x) for x in v.split(',')], default=list(DEFAULT_DB_SIZES))
+    parser.add_argument('--insert-batch', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=50, help='Requests per API timing sample')
+    parser.add_argument('--workdir', help='Scratch directory for the benchmark database (default: temp dir)')
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='geopoli-bench-')
+    configure_environment(workdir)
+    runners = {'startup': bench_startup, 'classify': bench_classify, 'db': bench_db, 'api': bench_api}
+    results = {}
+    for suite in args.suite or SUITES:
+        print(f'Running {suite} benchmarks...', file=sys.stderr)
+        results.update(runners[suite](args))
+
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'args': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+        },
+        'results': results,
+    }
+    payload = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(payload + '\n')
+    else:
+        print(payload)
+
+    exceeded = over_budget(results)
+    for name, per_item, budget in exceeded:
+        print(f'OVER BUDGET {name}: {per_item:.1f} us per item (budget {budget} us)', file=sys.stderr)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f'REGRESSION {name}: {before * 1e3:.3f} ms -> {after * 1e3:.3f} ms '
+                  f'({(after / before - 1) * 100:+.1f}%)', file=sys.stderr)
+        if regressions:
+            return 1
+        print(f'No regressions over {args.threshold:.0%} against {args.compare}', file=sys.stderr)
+    return 1 if exceeded else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
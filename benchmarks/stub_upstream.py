@@ -0,0 +1,119 @@
+"""
+Local stand-in for NewsData.io and Alpha Vantage with a fixed response delay
+and, optionally, injected failures.
+
+Usage (from the repository root):
+    python benchmarks/stub_upstream.py --port 8899 --delay 0.2
+    python benchmarks/stub_upstream.py --fail-rate 0.3 --hang-rate 0.1 --hang-delay 15
+    python benchmarks/stub_upstream.py --outage-after 5 --outage-for 20 --outage-mode hang
+
+Point the backend at it with
+    NEWSDATA_BASE_URL=http://127.0.0.1:8899/api/1/news
+    ALPHA_VANTAGE_BASE_URL=http://127.0.0.1:8899/query
+and any non-empty NEWS_API_KEY / ALPHA_VANTAGE_API_KEY. Requests with
+``function=GLOBAL_QUOTE`` get a quote for ``symbol``; everything else gets a
+page of synthetic geopolitical news.
+
+``--fail-rate`` answers that share of requests with a 503 and
+``--hang-rate`` holds that share for ``--hang-delay`` seconds (longer than
+the client timeout) before answering. ``--outage-after``/``--outage-for``
+fail or hang every request during a window measured from startup.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import sys
+import zlib
+from urllib.parse import parse_qs
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+if BENCH_DIR not in sys.path:
+    sys.path.insert(0, BENCH_DIR)
+
+from corpus import generate_articles
+
+def news_body(count=20, seed=7):
+    results = []
+    for a in generate_articles(count, seed=seed, keyword_density=0.8):
+        results.append(dict(a['raw'], title=a['title'], content=a['content'], description=a['content'][:200],
+                            source_id=a['source']))
+    return json.dumps({'status': 'success', 'totalResults': len(results), 'results': results}).encode()
+
+def quote_body(symbol):
+    # Deterministic per-symbol prices so repeated runs compare equal
+    base = 20 + zlib.crc32(symbol.encode()) % 400
+    return json.dumps({'Global Quote': {
+        '01. symbol': symbol,
+        '05. price': f'{base:.4f}',
+        '06. volume': '1250000',
+        '07. latest trading day': '2024-01-05',
+        '09. change': '1.2500',
+        '10. change percent': f'{125 / base:.4f}%',
+    }}).encode()
+
+def create_stub(delay, fail_rate=0.0, hang_rate=0.0, hang_delay=30.0, outage_after=None, outage_for=0.0,
+                outage_mode='error', seed=None):
+    news = news_body()
+    rng = random.Random(seed)
+    started = time.monotonic()
+
+    def fault():
+        """'error', 'hang' or None for the next request"""
+        if outage_after is not None and outage_after <= time.monotonic() - started < outage_after + outage_for:
+            return outage_mode
+        roll = rng.random()
+        if roll < fail_rate:
+            return 'error'
+        if roll < fail_rate + hang_rate:
+            return 'hang'
+        return None
+
+    async def app(scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        query = parse_qs(scope.get('query_string', b'').decode())
+        if query.get('function') == ['GLOBAL_QUOTE']:
+            body = quote_body(query.get('symbol', ['UNKNOWN'])[0])
+        else:
+            body = news
+        status = 200
+        injected = fault()
+        if injected == 'hang':
+            await asyncio.sleep(hang_delay)
+        elif injected == 'error':
+            status, body = 503, b'{"status": "error", "message": "injected failure"}'
+        await asyncio.sleep(delay)
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'application/json'),
+                                (b'content-length', str(len(body)).encode())]})
+        await send({'type': 'http.response.body', 'body': body})
+
+    return app
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Stub upstream news and quote APIs')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8899)
+    parser.add_argument('--delay', type=float, default=0.2, help='Seconds to wait before every response')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Share of requests answered with a 503')
+    parser.add_argument('--hang-rate', type=float, default=0.0, help='Share of requests held for --hang-delay')
+    parser.add_argument('--hang-delay', type=float, default=30.0)
+    parser.add_argument('--outage-after', type=float, help='Seconds after startup when an outage begins')
+    parser.add_argument('--outage-for', type=float, default=30.0, help='Outage length in seconds')
+    parser.add_argument('--outage-mode', choices=['error', 'hang'], default='error')
+    parser.add_argument('--seed', type=int, help='Seed for the failure injection')
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    stub = create_stub(args.delay, args.fail_rate, args.hang_rate, args.hang_delay, args.outage_after,
+                       args.outage_for, args.outage_mode, args.seed)
+    uvicorn.run(stub, host=args.host, port=args.port, log_level='warning',
+                backlog=4096, limit_concurrency=None)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
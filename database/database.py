@@ -1,6 +1,6 @@
 import os
 import time
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.pool import QueuePool
@@ -10,15 +10,12 @@ from .models import Base
 DB_URL = os.environ.get("DATABASE_URL", "sqlite:///geopoli_news.db")
 IS_SQLITE = DB_URL.startswith("sqlite")
 
-# Connection pooling for PostgreSQL, simple for SQLite
-engine = create_engine(
-    DB_URL,
-    poolclass=QueuePool if not IS_SQLITE else None,
-    pool_size=10 if not IS_SQLITE else None,
-    max_overflow=20 if not IS_SQLITE else None,
-    connect_args={"check_same_thread": False} if IS_SQLITE else {},
-    echo=False
-)
+# Connection pooling for PostgreSQL, simple for SQLite; SQLite's pool takes no sizing arguments
+if IS_SQLITE:
+    engine_options = {"connect_args": {"check_same_thread": False}}
+else:
+    engine_options = {"poolclass": QueuePool, "pool_size": 10, "max_overflow": 20}
+engine = create_engine(DB_URL, echo=False, **engine_options)
 SessionLocal = scoped_session(sessionmaker(bind=engine))
 
 def init_db():
@@ -34,7 +31,7 @@ def get_db():
 def db_health_check():
     try:
         with engine.connect() as conn:
-            conn.execute("SELECT 1")
+            conn.execute(text("SELECT 1"))
         return True
     except OperationalError:
         return False
@@ -44,7 +41,7 @@ def wait_for_db(max_retries=5, delay=2):
     for i in range(max_retries):
         try:
             with engine.connect() as conn:
-                conn.execute("SELECT 1")
+                conn.execute(text("SELECT 1"))
             return True
         except OperationalError:
             time.sleep(delay)
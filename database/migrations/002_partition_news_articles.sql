@@ -0,0 +1,81 @@
+-- database/migrations/002_partition_news_articles.sql
+--
+-- Monthly range partitions for news_articles (PostgreSQL 12+).
+--
+-- Date-bounded queries only touch the months they cover (partition pruning)
+-- and retention drops whole months (see database/partitions.py). The
+-- partition key has to be part of every unique constraint, so the primary
+-- key becomes (id, publish_date) and url is unique per publish_date; importers
+-- already skip urls that are stored. publish_date becomes NOT NULL, and
+-- existing rows without one take their created_at. The foreign key from
+-- event_article_link is dropped, as it can no longer target id alone.
+--
+-- Partitions for the months that have data, and the next three, are created
+-- here; `python -m utils.partitions maintain` keeps creating them ahead.
+-- Rows outside every monthly partition land in news_articles_default.
+
+BEGIN;
+
+ALTER TABLE event_article_link DROP CONSTRAINT IF EXISTS event_article_link_article_id_fkey;
+ALTER TABLE news_articles RENAME TO news_articles_unpartitioned;
+-- Keep the id sequence when the old table is dropped below
+ALTER SEQUENCE news_articles_id_seq OWNED BY NONE;
+
+CREATE TABLE news_articles (
+    id INTEGER NOT NULL DEFAULT nextval('news_articles_id_seq'),
+    title VARCHAR(500) NOT NULL,
+    content TEXT,
+    source VARCHAR(100),
+    url VARCHAR(1000),
+    publish_date TIMESTAMP NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    relevance_score FLOAT,
+    region VARCHAR(100),
+    countries JSON,
+    event_type VARCHAR(100),
+    processed BOOLEAN DEFAULT FALSE,
+    sentiment_score FLOAT,
+    PRIMARY KEY (id, publish_date),
+    UNIQUE (url, publish_date)
+) PARTITION BY RANGE (publish_date);
+
+ALTER SEQUENCE news_articles_id_seq OWNED BY news_articles.id;
+
+CREATE TABLE news_articles_default PARTITION OF news_articles DEFAULT;
+
+DO $$
+DECLARE
+    month DATE;
+BEGIN
+    FOR month IN
+        SELECT generate_series(first_month, date_trunc('month', now()) + INTERVAL '3 months', INTERVAL '1 month')::date
+        FROM (
+            SELECT date_trunc('month', COALESCE(MIN(COALESCE(publish_date, created_at)), now())) AS first_month
+            FROM news_articles_unpartitioned
+        ) bounds
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF news_articles FOR VALUES FROM (%L) TO (%L)',
+            'news_articles_y' || to_char(month, 'YYYY') || 'm' || to_char(month, 'MM'),
+            month, (month + INTERVAL '1 month')::date
+        );
+    END LOOP;
+END $$;
+
+INSERT INTO news_articles (id, title, content, source, url, publish_date, created_at, updated_at,
+                           relevance_score, region, countries, event_type, processed, sentiment_score)
+SELECT id, title, content, source, url, COALESCE(publish_date, created_at, now()), created_at, updated_at,
+       relevance_score, region, countries, event_type, processed, sentiment_score
+FROM news_articles_unpartitioned;
+
+DROP TABLE news_articles_unpartitioned;
+
+-- Created on the parent, so every current and future partition gets them
+CREATE INDEX ix_news_title ON news_articles(title);
+CREATE INDEX ix_news_publish_date ON news_articles(publish_date);
+CREATE INDEX ix_news_region ON news_articles(region);
+CREATE INDEX ix_news_event_type ON news_articles(event_type);
+CREATE INDEX ix_news_url ON news_articles(url);
+
+COMMIT;
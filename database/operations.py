@@ -1,5 +1,7 @@
 from .database import SessionLocal
+from .partitions import drop_partitions_before, news_by_date_range
 from .models import NewsArticle, GeopoliticalEvent, StockSector, EventStockImpact, UserPreferences, HistoricalAnalysis
+from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime, timedelta
@@ -37,18 +39,45 @@ def get_news_by_region(region, limit=20):
         session.close()
 
 def get_news_by_date_range(start, end, limit=100):
+    # Only the monthly partitions (or SQLite archive files) overlapping start..end are read
+    return news_by_date_range(start, end, limit)
+
+def delete_old_news(days=90):
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    # Whole months go by dropping their partition; only the month straddling the cutoff is deleted row by row
+    drop_partitions_before(cutoff)
     session = SessionLocal()
     try:
-        return session.query(NewsArticle).filter(NewsArticle.publish_date >= start, NewsArticle.publish_date <= end).order_by(NewsArticle.publish_date.desc()).limit(limit).all()
+        session.query(NewsArticle).filter(NewsArticle.publish_date < cutoff).delete()
+        session.commit()
     finally:
         session.close()
 
-def delete_old_news(days=90):
+def save_event_stock_impacts(event_id, sector_impacts, sectors, market_impact=None):
+    """Upserts one EventStockImpact per sector for an event and records its overall market impact."""
     session = SessionLocal()
     try:
-        cutoff = datetime.utcnow() - timedelta(days=days)
-        session.query(NewsArticle).filter(NewsArticle.publish_date < cutoff).delete()
+        for sector_name, fields in sector_impacts.items():
+            sector = session.query(StockSector).filter(func.lower(StockSector.sector_name) == sector_name.lower()).first()
+            if sector is None:
+                sector = StockSector(sector_name=sector_name, stock_symbols=list(sectors.get(sector_name, [])))
+                session.add(sector)
+                session.flush()
+            impact = session.query(EventStockImpact).filter_by(event_id=event_id, sector_id=sector.id).first()
+            if impact is None:
+                impact = EventStockImpact(event_id=event_id, sector_id=sector.id)
+                session.add(impact)
+            impact.impact_severity = fields["impact_severity"]
+            impact.confidence_score = fields["confidence_score"]
+            impact.historical_performance = fields["historical_performance"]
+        if market_impact is not None:
+            session.query(GeopoliticalEvent).filter_by(id=event_id).update({"market_impact": market_impact})
         session.commit()
+        return True
+    except SQLAlchemyError as e:
+        session.rollback()
+        print(f"DB Error: {e}")
+        return False
     finally:
         session.close()
 
@@ -0,0 +1,292 @@
+"""
+Monthly partitions of news_articles.
+
+On PostgreSQL the table is declaratively partitioned by publish_date (see
+migrations/002_partition_news_articles.sql). The planner then prunes
+date-bounded queries down to the months they cover. Retention detaches and
+drops whole months instead of deleting rows.
+
+On SQLite, months older than the hot window are moved out of the main
+database file into one archive file per month (``news_articles_y2024m01.db``
+in NEWS_ARCHIVE_DIR, by default ``<database>_archive/``). Date-range queries
+read the main table, then ATTACH only the archived months their range
+covers, newest first, and stop once the limit is filled. Queries over the
+recent window never open an archive, however many months are stored. The
+urls of archived articles stay in the main file (``archived_urls``), so
+importers can skip them without opening every archive.
+"""
+
+import os
+import re
+from datetime import datetime
+
+from sqlalchemy import MetaData, bindparam, select, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from .database import DB_URL, IS_SQLITE, SessionLocal, engine
+from .models import NewsArticle
+
+PARTITION_PATTERN = re.compile(r'^news_articles_y(\d{4})m(\d{2})$')
+SQLITE_TIMESTAMP = '%Y-%m-%d %H:%M:%S.%f'  # how SQLAlchemy stores DateTime in SQLite
+
+_partitioned = {}
+
+def month_start(moment):
+    return datetime(moment.year, moment.month, 1)
+
+def next_month(month):
+    return datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+def iter_months(start, end):
+    """Month starts from the month of ``start`` through the month of ``end``"""
+    month = month_start(start)
+    while month <= end:
+        yield month
+        month = next_month(month)
+
+def partition_name(month):
+    return f'news_articles_y{month.year:04d}m{month.month:02d}'
+
+def partition_month(name):
+    match = PARTITION_PATTERN.match(name)
+    return datetime(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+def is_partitioned():
+    """True when news_articles is a partitioned PostgreSQL table"""
+    if engine.dialect.name != 'postgresql':
+        return False
+    if 'pg' not in _partitioned:
+        with engine.connect() as conn:
+            relkind = conn.execute(text(
+                "SELECT relkind FROM pg_class WHERE relname = 'news_articles' AND pg_table_is_visible(oid)"
+            )).scalar()
+        _partitioned['pg'] = relkind == 'p'
+    return _partitioned['pg']
+
+# PostgreSQL
+
+def ensure_partitions(start, end):
+    """Create the monthly partitions covering start..end; a no-op unless the table is partitioned"""
+    if not is_partitioned():
+        return 0
+    created = 0
+    for month in iter_months(start, end):
+        name = partition_name(month)
+        try:
+            with engine.begin() as conn:
+                if conn.execute(text("SELECT to_regclass(:name)"), {'name': name}).scalar() is None:
+                    conn.execute(text(
+                        f"CREATE TABLE {name} PARTITION OF news_articles "
+                        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{next_month(month):%Y-%m-%d}')"
+                    ))
+                    created += 1
+        except SQLAlchemyError as e:
+            # e.g. rows for this month already sit in the default partition
+            print(f"DB Error: could not create partition {name}: {e}")
+    return created
+
+def list_partitions():
+    """Month starts of the stored partitions (PostgreSQL) or archive files (SQLite), oldest first"""
+    if IS_SQLITE:
+        return sorted(_archived_months())
+    if not is_partitioned():
+        return []
+    with engine.connect() as conn:
+        names = conn.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'news_articles'::regclass"
+        )).scalars().all()
+    return sorted(m for m in map(partition_month, names) if m is not None)
+
+def drop_partitions_before(cutoff):
+    """Drop every month that ends on or before ``cutoff``; return the months dropped"""
+    if IS_SQLITE:
+        return _drop_archives_before(cutoff)
+    dropped = []
+    for month in list_partitions():
+        if next_month(month) > cutoff:
+            continue
+        name = partition_name(month)
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE news_articles DETACH PARTITION {name}"))
+            conn.execute(text(f"DROP TABLE {name}"))
+        dropped.append(month)
+    return dropped
+
+# SQLite
+
+def archive_dir():
+    default = os.path.splitext(os.path.abspath(DB_URL.split(':///', 1)[-1]))[0] + '_archive'
+    return os.environ.get('NEWS_ARCHIVE_DIR', default)
+
+def archive_path(month):
+    return os.path.join(archive_dir(), partition_name(month) + '.db')
+
+def _archived_months():
+    if not os.path.isdir(archive_dir()):
+        return set()
+    months = (partition_month(os.path.splitext(f)[0]) for f in os.listdir(archive_dir()) if f.endswith('.db'))
+    return {m for m in months if m is not None}
+
+def _bound(moment):
+    return moment.strftime(SQLITE_TIMESTAMP)
+
+def _ensure_archived_urls(raw):
+    """Create main.archived_urls, filling it from archive files written before it existed"""
+    cursor = raw.cursor()
+    exists = cursor.execute("SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = 'archived_urls'").fetchone()
+    if exists:
+        return
+    # Filled under another name and renamed last, so an interrupted backfill is simply redone
+    cursor.execute("DROP TABLE IF EXISTS main.archived_urls_backfill")
+    cursor.execute("CREATE TABLE main.archived_urls_backfill (url TEXT PRIMARY KEY, month TEXT NOT NULL)")
+    for month in sorted(_archived_months()):
+        alias = partition_name(month)
+        cursor.execute("ATTACH DATABASE ? AS " + alias, (archive_path(month),))
+        try:
+            cursor.execute(f"INSERT OR IGNORE INTO main.archived_urls_backfill (url, month) "
+                           f"SELECT url, ? FROM {alias}.news_articles WHERE url IS NOT NULL", (alias,))
+            raw.commit()
+        finally:
+            cursor.execute("DETACH DATABASE " + alias)
+    cursor.execute("ALTER TABLE main.archived_urls_backfill RENAME TO archived_urls")
+    raw.commit()
+
+def archived_urls(conn, urls):
+    """The subset of ``urls`` stored in SQLite archive files"""
+    if not IS_SQLITE or not urls:
+        return set()
+    if not conn.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'archived_urls'")).first():
+        if not _archived_months():
+            return set()  # nothing has been archived yet
+        raw = engine.raw_connection()  # archives from before archived_urls existed
+        try:
+            _ensure_archived_urls(raw)
+        finally:
+            raw.close()
+    query = text("SELECT url FROM archived_urls WHERE url IN :urls").bindparams(bindparam('urls', expanding=True))
+    found = set()
+    urls = list(urls)
+    for i in range(0, len(urls), 900):  # within SQLite's bound-parameter limit
+        found.update(conn.execute(query, {'urls': urls[i:i + 900]}).scalars())
+    return found
+
+def archive_months_before(cutoff):
+    """Move whole months before the month of ``cutoff`` from the main SQLite file to archive files"""
+    if not IS_SQLITE:
+        raise RuntimeError("Archive files are only used with SQLite; PostgreSQL keeps monthly partitions")
+    boundary = month_start(cutoff)
+    with engine.connect() as conn:
+        oldest = conn.execute(
+            select(NewsArticle.publish_date).where(NewsArticle.publish_date < boundary)
+            .order_by(NewsArticle.publish_date).limit(1)
+        ).scalar()
+    if oldest is None:
+        return []
+    os.makedirs(archive_dir(), exist_ok=True)
+    archived = []
+    raw = engine.raw_connection()
+    try:
+        _ensure_archived_urls(raw)
+        cursor = raw.cursor()
+        for month in iter_months(oldest, boundary):
+            if month >= boundary:
+                break
+            alias = partition_name(month)
+            bounds = (_bound(month), _bound(next_month(month)))
+            if cursor.execute("SELECT 1 FROM main.news_articles WHERE publish_date >= ? AND publish_date < ? LIMIT 1",
+                              bounds).fetchone() is None:
+                continue
+            cursor.execute("ATTACH DATABASE ? AS " + alias, (archive_path(month),))
+            try:
+                cursor.execute(f"CREATE TABLE IF NOT EXISTS {alias}.news_articles AS "
+                               f"SELECT * FROM main.news_articles WHERE 0")
+                cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {alias}.ix_archive_url ON news_articles(url)")
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {alias}.ix_archive_publish_date "
+                               f"ON news_articles(publish_date)")
+                cursor.execute(f"INSERT OR IGNORE INTO {alias}.news_articles SELECT * FROM main.news_articles "
+                               f"WHERE publish_date >= ? AND publish_date < ?", bounds)
+                cursor.execute("INSERT OR IGNORE INTO main.archived_urls (url, month) SELECT url, ? FROM main.news_articles "
+                               "WHERE publish_date >= ? AND publish_date < ? AND url IS NOT NULL", (alias,) + bounds)
+                moved = cursor.execute("DELETE FROM main.news_articles WHERE publish_date >= ? AND publish_date < ?",
+                                       bounds).rowcount
+                raw.commit()
+            except Exception:
+                raw.rollback()
+                raise
+            finally:
+                cursor.execute("DETACH DATABASE " + alias)
+            if moved:
+                archived.append((month, moved))
+    finally:
+        raw.close()
+    return archived
+
+def _drop_archives_before(cutoff):
+    dropped = []
+    months = sorted(_archived_months())
+    if not months:
+        return dropped
+    raw = engine.raw_connection()
+    try:
+        _ensure_archived_urls(raw)
+        cursor = raw.cursor()
+        for month in months:
+            if next_month(month) <= cutoff:
+                cursor.execute("DELETE FROM main.archived_urls WHERE month = ?", (partition_name(month),))
+                raw.commit()
+                os.remove(archive_path(month))
+                dropped.append(month)
+            elif month < cutoff:
+                # The month straddling the cutoff keeps its file; only its older rows go
+                cursor.execute("ATTACH DATABASE ? AS partial", (archive_path(month),))
+                cursor.execute("DELETE FROM main.archived_urls WHERE url IN "
+                               "(SELECT url FROM partial.news_articles WHERE publish_date < ?)", (_bound(cutoff),))
+                cursor.execute("DELETE FROM partial.news_articles WHERE publish_date < ?", (_bound(cutoff),))
+                raw.commit()
+                cursor.execute("DETACH DATABASE partial")
+    finally:
+        raw.close()
+    return dropped
+
+def _query_archive(month, start, end, limit):
+    alias = partition_name(month)
+    table = NewsArticle.__table__.to_metadata(MetaData(), schema=alias)
+    with engine.connect() as conn:
+        conn.exec_driver_sql(f"ATTACH DATABASE ? AS {alias}", (archive_path(month),))
+        try:
+            rows = conn.execute(
+                select(table).where(table.c.publish_date >= start, table.c.publish_date <= end)
+                .order_by(table.c.publish_date.desc()).limit(limit)
+            ).mappings().all()
+        finally:
+            conn.rollback()
+            conn.exec_driver_sql(f"DETACH DATABASE {alias}")
+    return [NewsArticle(**row) for row in rows]
+
+# Query routing
+
+def news_by_date_range(start, end, limit=100):
+    """Newest articles published between start and end, reading only the partitions that cover them"""
+    session = SessionLocal()
+    try:
+        articles = session.query(NewsArticle).filter(
+            NewsArticle.publish_date >= start, NewsArticle.publish_date <= end
+        ).order_by(NewsArticle.publish_date.desc()).limit(limit).all()
+    finally:
+        session.close()
+    if not IS_SQLITE:
+        return articles  # PostgreSQL prunes partitions itself
+    months = sorted((m for m in _archived_months() if m <= end and next_month(m) > start), reverse=True)
+    seen = {a.url for a in articles if a.url}
+    for month in months:
+        if len(articles) >= limit and articles[limit - 1].publish_date >= next_month(month):
+            break  # every remaining archived month is older than the last article kept
+        for article in _query_archive(month, start, end, limit):
+            if article.url and article.url in seen:
+                continue  # imported again after its month was archived; list only the newest copy
+            seen.add(article.url)
+            articles.append(article)
+        articles.sort(key=lambda a: a.publish_date, reverse=True)
+        del articles[limit:]
+    return articles
@@ -82,43 +82,48 @@ function renderSentimentLineChart(data) {
   });
 }
 
-// Example: updateCharts(news)
-function updateCharts(news) {
-  // Bar: News volume by region
-  const regionCounts = {};
-  const eventCounts = {};
-  const sentimentTimeline = {};
-  news.forEach(n => {
-    // Region
-    if (n.region) regionCounts[n.region] = (regionCounts[n.region] || 0) + 1;
-    // Event type
-    if (n.event_type) eventCounts[n.event_type] = (eventCounts[n.event_type] || 0) + 1;
-    // Sentiment over time (by date)
-    const date = n.publish_date ? n.publish_date.slice(0, 10) : 'Unknown';
-    if (!sentimentTimeline[date]) sentimentTimeline[date] = { positive: 0, negative: 0, neutral: 0 };
-    if (n.market_sentiment === 'positive') sentimentTimeline[date].positive++;
-    else if (n.market_sentiment === 'negative') sentimentTimeline[date].negative++;
-    else sentimentTimeline[date].neutral++;
-  });
-  renderRegionBarChart({
-    labels: Object.keys(regionCounts),
-    values: Object.values(regionCounts)
-  });
-  renderEventPieChart({
-    labels: Object.keys(eventCounts),
-    values: Object.values(eventCounts)
-  });
-  // Line chart
-  const sortedDates = Object.keys(sentimentTimeline).sort();
-  renderSentimentLineChart({
-    labels: sortedDates,
-    positive: sortedDates.map(d => sentimentTimeline[d].positive),
-    negative: sortedDates.map(d => sentimentTimeline[d].negative),
-    neutral: sortedDates.map(d => sentimentTimeline[d].neutral)
-  });
+// Charts are drawn from server-side aggregates (/api/stats), not article lists
+async function updateCharts(filters = {}) {
+  const params = new URLSearchParams({ bucket: 'day' });
+  if (filters.region) params.set('region', filters.region);
+  if (filters.event_type) params.set('event_type', filters.event_type);
+  if (filters.date) {
+    // A single day, bucketed by hour
+    params.set('bucket', 'hour');
+    params.set('since', filters.date);
+    params.set('until', filters.date);
+  }
+  try {
+    const res = await fetch(`/api/stats?${params}`);
+    if (!res.ok) throw new Error('Failed to fetch stats');
+    const stats = await res.json();
+    renderRegionBarChart({
+      labels: Object.keys(stats.regions),
+      values: Object.values(stats.regions)
+    });
+    renderEventPieChart({
+      labels: Object.keys(stats.event_types),
+      values: Object.values(stats.event_types)
+    });
+    const timeline = stats.timeline;
+    renderSentimentLineChart({
+      labels: timeline.buckets.map(b => stats.granularity === 'hour' ? b.slice(11, 16) : b.slice(0, 10)),
+      positive: timeline.positive,
+      negative: timeline.negative,
+      neutral: timeline.neutral
+    });
+  } catch (err) {
+    console.error(err);
+  }
+}
+
+// Coalesce bursts of streamed articles into one stats request
+let chartsRefreshTimer = null;
+function scheduleChartsUpdate() {
+  clearTimeout(chartsRefreshTimer);
+  chartsRefreshTimer = setTimeout(() => updateCharts(window.currentFilters || {}), 2000);
 }
 
-// Listen for news updates from dashboard.js
-window.addEventListener('DOMContentLoaded', () => {
-  window.updateCharts = updateCharts;
-}); 
\ No newline at end of file
+window.updateCharts = updateCharts;
+window.scheduleChartsUpdate = scheduleChartsUpdate;
+window.addEventListener('DOMContentLoaded', () => updateCharts());
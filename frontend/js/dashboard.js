@@ -11,11 +11,13 @@ async function fetchLatestNews(filters = {}) {
   let url = `${API_BASE}/latest`;
   // Add region filter if present
   if (filters.region) url = `${API_BASE}/by-region/${encodeURIComponent(filters.region)}`;
+  if (filters.event_type) url += `?event_type=${encodeURIComponent(filters.event_type)}`;
   try {
     const res = await fetch(url);
     if (!res.ok) throw new Error('Failed to fetch news');
     const data = await res.json();
-    renderNews(data.news || []);
+    renderNews((data.news || []).filter(article => matchesSearch(article, filters)));
+    openNewsStream(filters);
   } catch (err) {
     showError('Could not load news. Please try again.');
     renderNews([]);
@@ -24,6 +26,41 @@ async function fetchLatestNews(filters = {}) {
   }
 }
 
+// Live updates: the server pushes newly stored articles over SSE
+let newsStream = null;
+function openNewsStream(filters = {}) {
+  if (!window.EventSource) return;
+  const params = new URLSearchParams();
+  if (filters.region) params.set('region', filters.region);
+  if (filters.event_type) params.set('event_type', filters.event_type);
+  const url = `${API_BASE}/stream?${params}`;
+  if (newsStream && newsStream.url.endsWith(url) && newsStream.readyState !== EventSource.CLOSED) return;
+  if (newsStream) newsStream.close();
+  newsStream = new EventSource(url);
+  newsStream.addEventListener('article', e => {
+    const article = JSON.parse(e.data);
+    if (matchesSearch(article, window.currentFilters || {})) prependArticle(article);
+    if (window.scheduleChartsUpdate) window.scheduleChartsUpdate();
+  });
+  // Sent when the server can no longer resume from our Last-Event-ID
+  newsStream.addEventListener('reset', () => {
+    newsStream.close();
+    newsStream = null;
+    fetchLatestNews(window.currentFilters || {});
+  });
+}
+
+// The search box filters the news list by title
+function matchesSearch(article, filters) {
+  if (!filters.search) return true;
+  return (article.title || '').toLowerCase().includes(filters.search.toLowerCase());
+}
+
+function prependArticle(article) {
+  newsEmpty.classList.add('d-none');
+  newsList.insertBefore(renderArticleCard(article), newsList.firstChild);
+}
+
 function renderNews(news) {
   newsList.innerHTML = '';
   if (!news || news.length === 0) {
@@ -31,23 +68,25 @@ function renderNews(news) {
     return;
   }
   newsEmpty.classList.add('d-none');
-  news.forEach(article => {
-    const card = document.createElement('div');
-    card.className = 'card p-3 col-12';
-    card.innerHTML = `
-      <div class="card-body">
-        <h5 class="card-title">${escapeHTML(article.title)}</h5>
-        <h6 class="card-subtitle mb-2 text-muted">${escapeHTML(article.source || '')} &middot; <span class="news-date">${formatDate(article.publish_date)}</span></h6>
-        <p class="card-text">${escapeHTML(article.content ? article.content.slice(0, 180) : '')}${article.content && article.content.length > 180 ? '...' : ''}</p>
-        <div class="d-flex flex-wrap gap-2 mt-2">
-          ${article.region ? `<span class="badge bg-info">${escapeHTML(article.region)}</span>` : ''}
-          ${article.event_type ? `<span class="badge bg-warning text-dark">${escapeHTML(article.event_type)}</span>` : ''}
-          ${article.market_sentiment ? `<span class="badge ${sentimentBadge(article.market_sentiment)}">${escapeHTML(article.market_sentiment)}</span>` : ''}
-        </div>
+  news.forEach(article => newsList.appendChild(renderArticleCard(article)));
+}
+
+function renderArticleCard(article) {
+  const card = document.createElement('div');
+  card.className = 'card p-3 col-12';
+  card.innerHTML = `
+    <div class="card-body">
+      <h5 class="card-title">${escapeHTML(article.title)}</h5>
+      <h6 class="card-subtitle mb-2 text-muted">${escapeHTML(article.source || '')} &middot; <span class="news-date">${formatDate(article.publish_date)}</span></h6>
+      <p class="card-text">${escapeHTML(article.content ? article.content.slice(0, 180) : '')}${article.content && article.content.length > 180 ? '...' : ''}</p>
+      <div class="d-flex flex-wrap gap-2 mt-2">
+        ${article.region ? `<span class="badge bg-info">${escapeHTML(article.region)}</span>` : ''}
+        ${article.event_type ? `<span class="badge bg-warning text-dark">${escapeHTML(article.event_type)}</span>` : ''}
+        ${article.market_sentiment ? `<span class="badge ${sentimentBadge(article.market_sentiment)}">${escapeHTML(article.market_sentiment)}</span>` : ''}
       </div>
-    `;
-    newsList.appendChild(card);
-  });
+    </div>
+  `;
+  return card;
 }
 
 function showLoading() {
@@ -91,7 +130,10 @@ if (refreshBtn) {
     showLoading();
     try {
       await fetch('/api/news/refresh', { method: 'POST' });
-      await fetchLatestNews(window.currentFilters || {});
+      // New articles arrive over the stream; only reload when it is unavailable
+      if (!newsStream || newsStream.readyState === EventSource.CLOSED) {
+        await fetchLatestNews(window.currentFilters || {});
+      }
       showToast('News refreshed!', 'success');
     } catch {
       showError('Failed to refresh news.');
@@ -44,7 +44,8 @@ eventTypeFilter.addEventListener('click', e => {
 // Search filter
 searchInput.addEventListener('input', () => {
   window.currentFilters.search = searchInput.value.trim();
-  fetchAndUpdate();
+  // Only the news list is searched, so the charts need no new stats
+  if (window.fetchLatestNews) window.fetchLatestNews(window.currentFilters);
 });
 // Date range filter
 dateRange.addEventListener('change', () => {
@@ -59,36 +60,10 @@ clearFiltersBtn.addEventListener('click', () => {
   fetchAndUpdate();
 });
 
-// Fetch and update dashboard
-async function fetchAndUpdate() {
-  // Fetch all news, then filter client-side for event_type, search, date
-  let url = '/api/news/latest';
-  if (window.currentFilters.region) {
-    url = `/api/news/by-region/${encodeURIComponent(window.currentFilters.region)}`;
-  }
-  try {
-    const res = await fetch(url);
-    const data = await res.json();
-    let news = data.news || [];
-    // Event type filter
-    if (window.currentFilters.event_type) {
-      news = news.filter(n => n.event_type === window.currentFilters.event_type);
-    }
-    // Search filter
-    if (window.currentFilters.search) {
-      const q = window.currentFilters.search.toLowerCase();
-      news = news.filter(n => n.title && n.title.toLowerCase().includes(q));
-    }
-    // Date filter
-    if (window.currentFilters.date) {
-      news = news.filter(n => n.publish_date && n.publish_date.slice(0,10) === window.currentFilters.date);
-    }
-    window.fetchLatestNews = window.fetchLatestNews || (()=>{});
-    window.updateCharts = window.updateCharts || (()=>{});
-    window.fetchLatestNews(window.currentFilters);
-    window.updateCharts(news);
-  } catch (err) {
-    // fallback: just update news
-    window.fetchLatestNews(window.currentFilters);
-  }
-} 
\ No newline at end of file
+// Fetch and update dashboard; the charts come from /api/stats, so no article list is downloaded for them
+function fetchAndUpdate() {
+  window.fetchLatestNews = window.fetchLatestNews || (()=>{});
+  window.updateCharts = window.updateCharts || (()=>{});
+  window.fetchLatestNews(window.currentFilters);
+  window.updateCharts(window.currentFilters);
+}
\ No newline at end of file
@@ -0,0 +1,248 @@
+"""
+Match processed articles against UserPreferences subscriptions and deliver
+batched alerts.
+
+Usage (from the repository root):
+    python -m utils.alerts --since-id 0 --output alerts.jsonl
+    python -m utils.alerts --follow --interval 30 --batch-size 20 --max-delay 300
+
+A subscription matches an article when the article's region is in its
+``region_filters`` and its event type in its ``event_filters`` (an empty or
+missing list matches anything), and its relevance score reaches
+``alert_threshold``. AlertIndex files every subscription under each
+(region, event_type) pair it asks for, with wildcards for empty filters,
+and keeps each cell sorted by threshold. Matching an article then looks up
+at most four cells and slices the thresholds it clears. The cost is a few
+bisections plus the matches, however many subscribers there are.
+
+Matches go to an AlertQueue. It drops repeats of the same event for the same
+user within ``dedup_window`` seconds and hands each user's alerts to the
+delivery callback in batches.
+"""
+
+import argparse
+import json
+import sys
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+
+from sqlalchemy import select
+
+from database.database import SessionLocal, engine
+from database.models import NewsArticle, UserPreferences
+
+ANY = object()  # wildcard cell key for an empty region or event filter; distinct from a None region
+
+class AlertIndex:
+    """Inverted index from (region, event_type) to subscriptions sorted by alert threshold"""
+
+    def __init__(self, subscriptions=()):
+        self._cells = {}  # (region | ANY, event_type | ANY) -> ([thresholds], [user ids]), both sorted by threshold
+        self._keys = {}  # user id -> (threshold, cell keys), so a subscription can be replaced or removed
+        for user_id, regions, event_types, threshold in subscriptions:
+            self.add(user_id, regions, event_types, threshold)
+
+    def __len__(self):
+        return len(self._keys)
+
+    @classmethod
+    def from_database(cls):
+        session = SessionLocal()
+        try:
+            rows = session.query(UserPreferences.id, UserPreferences.region_filters,
+                                 UserPreferences.event_filters, UserPreferences.alert_threshold).all()
+        finally:
+            session.close()
+        return cls(rows)
+
+    def add(self, user_id, regions, event_types, threshold):
+        """Index one subscription, replacing any earlier one for the same user"""
+        if user_id in self._keys:
+            self.remove(user_id)
+        threshold = float(threshold or 0.0)
+        keys = [(region, event_type)
+                for region in (set(regions) if regions else (ANY,))
+                for event_type in (set(event_types) if event_types else (ANY,))]
+        for key in keys:
+            thresholds, user_ids = self._cells.setdefault(key, ([], []))
+            position = bisect_right(thresholds, threshold)
+            thresholds.insert(position, threshold)
+            user_ids.insert(position, user_id)
+        self._keys[user_id] = (threshold, keys)
+
+    def remove(self, user_id):
+        threshold, keys = self._keys.pop(user_id, (None, ()))
+        for key in keys:
+            thresholds, user_ids = self._cells[key]
+            # Only the run of equal thresholds can hold this user
+            position = bisect_right(thresholds, threshold) - 1
+            while user_ids[position] != user_id:
+                position -= 1
+            del thresholds[position], user_ids[position]
+            if not thresholds:
+                del self._cells[key]
+
+    def match(self, region, event_type, score):
+        """User ids whose subscription accepts an article; each user appears at most once"""
+        score = score or 0.0
+        matched = []
+        for key in ((region, event_type), (region, ANY), (ANY, event_type), (ANY, ANY)):
+            cell = self._cells.get(key)
+            if cell is not None:
+                # A subscription lives in exactly one of these four cells, so
+                # the slices never overlap
+                matched.extend(cell[1][:bisect_right(cell[0], score)])
+        return matched
+
+def event_key(article):
+    """What counts as "the same event" for de-duplication: one region/event type per day"""
+    day = article['publish_date'].date().isoformat() if article.get('publish_date') else None
+    return (article.get('region'), article.get('event_type'), day)
+
+class AlertQueue:
+    """Per-user delivery queue that batches alerts and drops repeated events"""
+
+    def __init__(self, deliver, batch_size=20, max_delay=300.0, dedup_window=6 * 3600.0, clock=time.monotonic):
+        self.deliver = deliver  # deliver(user_id, [alert, ...]); an exception keeps the batch queued
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.dedup_window = dedup_window
+        self.clock = clock
+        self._pending = {}  # user id -> (first enqueue time, [alerts])
+        self._seen = OrderedDict()  # (user id, event key) -> enqueue time, oldest first
+        self.delivered = self.duplicates = 0
+
+    def put(self, user_id, key, alert):
+        """Queue an alert; return False when the user already had this event within the window"""
+        now = self.clock()
+        self._expire(now)
+        if (user_id, key) in self._seen:
+            self.duplicates += 1
+            return False
+        self._seen[(user_id, key)] = now
+        _, alerts = self._pending.setdefault(user_id, (now, []))
+        alerts.append(alert)
+        if len(alerts) >= self.batch_size:
+            self._deliver(user_id)
+        return True
+
+    def flush(self, force=False):
+        """Deliver every batch that is full or older than max_delay (all of them when ``force``)"""
+        now = self.clock()
+        due = [user_id for user_id, (since, alerts) in self._pending.items()
+               if force or len(alerts) >= self.batch_size or now - since >= self.max_delay]
+        for user_id in due:
+            self._deliver(user_id)
+        return len(due)
+
+    def pending(self):
+        return sum(len(alerts) for _, alerts in self._pending.values())
+
+    def _deliver(self, user_id):
+        since, alerts = self._pending.pop(user_id)
+        try:
+            self.deliver(user_id, alerts)
+            self.delivered += len(alerts)
+        except Exception as e:
+            print(f"Alert delivery to user {user_id} failed: {e}")
+            self._pending[user_id] = (since, alerts)
+
+    def _expire(self, now):
+        while self._seen:
+            key, seen_at = next(iter(self._seen.items()))
+            if now - seen_at < self.dedup_window:
+                break
+            del self._seen[key]
+
+def alert_for(article):
+    return {
+        'article_id': article['id'],
+        'title': article['title'],
+        'url': article.get('url'),
+        'region': article.get('region'),
+        'event_type': article.get('event_type'),
+        'relevance_score': article.get('relevance_score'),
+        'publish_date': article['publish_date'].isoformat() if article.get('publish_date') else None,
+    }
+
+def process_articles(index, queue, articles):
+    """Match article dicts against the index and queue the alerts; return the number queued"""
+    queued = 0
+    for article in articles:
+        user_ids = index.match(article.get('region'), article.get('event_type'), article.get('relevance_score'))
+        if not user_ids:
+            continue
+        key, alert = event_key(article), alert_for(article)
+        for user_id in user_ids:
+            queued += queue.put(user_id, key, alert)
+    return queued
+
+def iter_new_articles(after_id, batch_size=1000):
+    """Yield processed articles with id > after_id as dicts, in id order"""
+    columns = (NewsArticle.id, NewsArticle.title, NewsArticle.url, NewsArticle.region, NewsArticle.event_type,
+               NewsArticle.relevance_score, NewsArticle.publish_date)
+    while True:
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(*columns).where(NewsArticle.id > after_id, NewsArticle.processed.is_(True))
+                .order_by(NewsArticle.id).limit(batch_size)
+            ).mappings().all()
+        if not rows:
+            return
+        yield [dict(r) for r in rows]
+        after_id = rows[-1]['id']
+
+def jsonl_delivery(stream):
+    def deliver(user_id, alerts):
+        stream.write(json.dumps({'user_id': user_id, 'alerts': alerts}) + '\n')
+        stream.flush()
+    return deliver
+
+def run(since_id=0, output=None, follow=False, interval=30.0, batch_size=20, max_delay=300.0,
+        dedup_window=6 * 3600.0, reload_interval=300.0):
+    stream = open(output, 'a', encoding='utf-8') if output else sys.stdout
+    queue = AlertQueue(jsonl_delivery(stream), batch_size, max_delay, dedup_window)
+    index, loaded_at = AlertIndex.from_database(), time.monotonic()
+    print(f"Indexed {len(index)} subscriptions", file=sys.stderr)
+    last_id = since_id
+    try:
+        while True:
+            if time.monotonic() - loaded_at >= reload_interval:
+                index, loaded_at = AlertIndex.from_database(), time.monotonic()
+            for articles in iter_new_articles(last_id):
+                queued = process_articles(index, queue, articles)
+                last_id = articles[-1]['id']
+                queue.flush()
+                print(f"Matched up to article {last_id}: {queued} alerts queued", file=sys.stderr)
+            if not follow:
+                break
+            queue.flush()
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        queue.flush(force=True)
+        print(f"Delivered {queue.delivered} alerts ({queue.duplicates} duplicates dropped); "
+              f"resume with --since-id {last_id}", file=sys.stderr)
+        if output:
+            stream.close()
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Deliver alerts for articles matching user subscriptions')
+    parser.add_argument('--since-id', type=int, default=0, help='Only match articles after this id')
+    parser.add_argument('--output', help='Append alert batches as JSON lines here (default: stdout)')
+    parser.add_argument('--follow', action='store_true', help='Keep polling for new articles')
+    parser.add_argument('--interval', type=float, default=30.0, help='Seconds between polls with --follow')
+    parser.add_argument('--batch-size', type=int, default=20, help='Alerts per delivered batch')
+    parser.add_argument('--max-delay', type=float, default=300.0, help='Seconds an alert may wait for its batch to fill')
+    parser.add_argument('--dedup-window', type=float, default=6 * 3600.0,
+                        help='Seconds during which a repeated event is not alerted to the same user again')
+    parser.add_argument('--reload-interval', type=float, default=300.0, help='Seconds between subscription reloads')
+    args = parser.parse_args(argv)
+    return run(args.since_id, args.output, args.follow, args.interval, args.batch_size, args.max_delay,
+               args.dedup_window, args.reload_interval)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,18 @@
+"""
+Put the flat ``backend/`` package on sys.path for the utils CLIs that reuse
+its analyzers.
+"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+
+def add_backend_to_path():
+    """Make backend modules (``analyzers``, ``price_store``) importable.
+
+    Import the root-level ``database`` package first: it has no __init__.py,
+    so once backend/ is on sys.path backend/database.py would shadow it.
+    """
+    if BACKEND_DIR not in sys.path:
+        sys.path.append(BACKEND_DIR)
@@ -0,0 +1,274 @@
+"""
+Bulk-load historical news dumps (JSONL, CSV or Parquet) into news_articles.
+
+Usage (from the repository root):
+    python -m utils.bulk_import dumps/2023.jsonl dumps/2024.parquet [--workers 4] [--chunk-size 5000]
+    python -m utils.bulk_import archive.csv --rejects archive.rejects.jsonl --method copy
+
+Files are streamed in chunks. Each row is normalized (``link``/``pubDate``
+style NewsData.io fields are accepted), checked with validate_article_data
+and run through the analyzers in a process pool. It is then inserted with a
+Core executemany, or with COPY on PostgreSQL when ``--method copy`` is given.
+Rows that fail validation, repeat an existing url or are refused by the
+database go to the reject file as JSON lines with the error and source line,
+and the rest of their chunk is still loaded.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone
+from multiprocessing import Pool
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from database.database import engine
+from database.models import NewsArticle
+from database.partitions import archived_urls, ensure_partitions
+from utils.db_helpers import validate_article_data
+from utils.reprocess import analyze_texts
+
+# Accepted spellings of each column in the input files, in order of preference
+FIELD_ALIASES = {
+    'title': ('title',),
+    'content': ('content', 'description', 'body'),
+    'source': ('source', 'source_id'),
+    'url': ('url', 'link'),
+    'publish_date': ('publish_date', 'pubDate', 'published_at'),
+}
+TEXT_FIELDS = ('title', 'content', 'source', 'url')
+INSERT_COLUMNS = ('title', 'content', 'source', 'url', 'publish_date', 'relevance_score', 'region',
+                  'countries', 'event_type', 'processed', 'sentiment_score', 'created_at', 'updated_at')
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    raw = json.loads(line)
+                except ValueError as e:
+                    yield line_no, {'_error': f'invalid JSON: {e}', '_raw': line.rstrip('\n')}
+                    continue
+                if not isinstance(raw, dict):
+                    raw = {'_error': 'not a JSON object', '_raw': line.rstrip('\n')}
+                yield line_no, raw
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        for line_no, row in enumerate(csv.DictReader(f), 2):
+            yield line_no, row
+
+def read_parquet(path, batch_size=10_000):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Reading Parquet requires pyarrow (pip install pyarrow)")
+    line_no = 0
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+        for row in batch.to_pylist():
+            line_no += 1
+            yield line_no, row
+
+READERS = {'.jsonl': read_jsonl, '.ndjson': read_jsonl, '.json': read_jsonl, '.csv': read_csv,
+           '.parquet': read_parquet}
+
+def parse_publish_date(value):
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = datetime.fromisoformat(str(value).strip().replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def normalize_row(raw):
+    row = {}
+    for field, aliases in FIELD_ALIASES.items():
+        row[field] = next((raw[a] for a in aliases if raw.get(a) not in (None, '')), None)
+    return row
+
+def coerce_text_fields(row):
+    """Store numeric text fields as strings; return an error for any other non-string value"""
+    # JSON and Parquet values are typed, so a title can arrive as a number or an object
+    for field in TEXT_FIELDS:
+        value = row[field]
+        if value is None or isinstance(value, str):
+            continue
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            row[field] = str(value)
+        else:
+            return f'{field} must be text, not {type(value).__name__}'
+    return None
+
+def prepare_chunk(chunk):
+    """Worker: validate, normalize and analyze (line, raw) pairs; return (rows, rejects)"""
+    rows, rejects = [], []
+    now = datetime.utcnow()
+    for line_no, raw in chunk:
+        if '_error' in raw:
+            rejects.append((line_no, raw['_error'], raw.get('_raw')))
+            continue
+        row = normalize_row(raw)
+        error = coerce_text_fields(row)
+        if error:
+            rejects.append((line_no, error, raw))
+            continue
+        if not validate_article_data(row):
+            rejects.append((line_no, 'missing title, url or publish_date', raw))
+            continue
+        try:
+            row['publish_date'] = parse_publish_date(row['publish_date'])
+        except (TypeError, ValueError):
+            rejects.append((line_no, f"unparseable publish_date {row['publish_date']!r}", raw))
+            continue
+        if len(row['url']) > NewsArticle.url.type.length:
+            rejects.append((line_no, 'url too long', raw))
+            continue
+        row['title'] = row['title'][:NewsArticle.title.type.length]
+        row['source'] = row['source'][:NewsArticle.source.type.length] if row['source'] else None
+        row['created_at'] = row['updated_at'] = now
+        row['_line'] = line_no
+        rows.append(row)
+    for row, analysis in zip(rows, analyze_texts([(r['title'], r['content']) for r in rows])):
+        row.update(analysis)
+    return rows, rejects
+
+def drop_duplicates(conn, rows):
+    """Split rows into new ones and (row, reason) pairs for urls already stored or repeated in the chunk"""
+    urls = [r['url'] for r in rows]
+    existing = set(conn.execute(select(NewsArticle.url).where(NewsArticle.url.in_(urls))).scalars())
+    existing |= archived_urls(conn, set(urls) - existing)  # months moved out of the main SQLite file
+    fresh, duplicates, seen = [], [], set()
+    for row in rows:
+        if row['url'] in existing or row['url'] in seen:
+            duplicates.append((row, 'duplicate url'))
+        else:
+            seen.add(row['url'])
+            fresh.append(row)
+    return fresh, duplicates
+
+def _copy_rows(conn, rows):
+    """Load rows with PostgreSQL COPY through the raw DBAPI cursor"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            json.dumps(row[c]) if c == 'countries' else
+            ('t' if row[c] else 'f') if c == 'processed' else
+            '' if row[c] is None else row[c]
+            for c in INSERT_COLUMNS
+        ])
+    buffer.seek(0)
+    cursor = conn.connection.cursor()
+    cursor.copy_expert(
+        f"COPY {NewsArticle.__tablename__} ({', '.join(INSERT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer
+    )
+
+def load_rows(rows, method='executemany'):
+    """Insert one chunk; return (inserted, [(row, error), ...]) without losing the good rows"""
+    if not rows:
+        return 0, []
+    table = NewsArticle.__table__
+    with engine.connect() as conn:
+        fresh, rejected = drop_duplicates(conn, rows)
+    if not fresh:
+        return 0, rejected
+    values = [{c: row[c] for c in INSERT_COLUMNS} for row in fresh]
+    dates = [row['publish_date'] for row in fresh]
+    ensure_partitions(min(dates), max(dates))  # historical months may predate the migration's partitions
+    try:
+        with engine.begin() as conn:
+            if method == 'copy' and engine.dialect.name == 'postgresql':
+                _copy_rows(conn, values)
+            else:
+                conn.execute(table.insert(), values)
+        return len(fresh), rejected
+    except SQLAlchemyError:
+        pass  # fall through to isolate the offending rows
+    except Exception as e:
+        if method != 'copy':
+            raise
+        print(f"COPY failed ({e}); retrying chunk row by row")
+    inserted = 0
+    for row, value in zip(fresh, values):
+        try:
+            with engine.begin() as conn:
+                conn.execute(table.insert(), value)
+            inserted += 1
+        except SQLAlchemyError as e:
+            rejected.append((row, str(getattr(e, 'orig', e)).splitlines()[0]))
+    return inserted, rejected
+
+def iter_chunks(paths, chunk_size, file_format=None):
+    for path in paths:
+        ext = file_format or os.path.splitext(path)[1].lower()
+        reader = READERS.get(ext if ext.startswith('.') else '.' + ext)
+        if reader is None:
+            raise SystemExit(f"Unsupported file type for {path}; use --format jsonl|csv|parquet")
+        chunk = []
+        for line_no, raw in reader(path):
+            chunk.append((line_no, raw))
+            if len(chunk) >= chunk_size:
+                yield path, chunk
+                chunk = []
+        if chunk:
+            yield path, chunk
+
+def run(paths, rejects_path, workers=None, chunk_size=5000, method='executemany', file_format=None):
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    inserted = rejected = read = 0
+    in_flight = deque()
+
+    with open(rejects_path, 'a', encoding='utf-8') as rejects_file, Pool(workers) as pool:
+        def write_reject(path, line_no, error, raw):
+            rejects_file.write(json.dumps({'file': path, 'line': line_no, 'error': error, 'row': raw}, default=str) + '\n')
+
+        def finish_oldest():
+            nonlocal inserted, rejected
+            path, result = in_flight.popleft()
+            rows, invalid = result.get()
+            count, failed = load_rows(rows, method)
+            inserted += count
+            for line_no, error, raw in invalid:
+                write_reject(path, line_no, error, raw)
+            for row, error in failed:
+                write_reject(path, row['_line'], error, {k: row[k] for k in FIELD_ALIASES})
+            rejected += len(invalid) + len(failed)
+            rate = read / (time.perf_counter() - start)
+            print(f"{path}: {inserted} inserted, {rejected} rejected ({rate:,.0f} rows/s)")
+
+        for path, chunk in iter_chunks(paths, chunk_size, file_format):
+            read += len(chunk)
+            in_flight.append((path, pool.apply_async(prepare_chunk, (chunk,))))
+            if len(in_flight) >= 2 * workers:
+                finish_oldest()
+        while in_flight:
+            finish_oldest()
+
+    print(f"Done: {inserted} inserted, {rejected} rejected of {read} rows in {time.perf_counter() - start:.1f}s")
+    if rejected:
+        print(f"Rejected rows written to {rejects_path}")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bulk import news articles from JSONL, CSV or Parquet files')
+    parser.add_argument('paths', nargs='+', help='Files to import')
+    parser.add_argument('--format', choices=['jsonl', 'csv', 'parquet'], help='Input format (default: from extension)')
+    parser.add_argument('--rejects', help='Reject file (default: <first file>.rejects.jsonl)')
+    parser.add_argument('--workers', type=int, help='Processes for validation and analysis (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per validation and insert batch')
+    parser.add_argument('--method', choices=['executemany', 'copy'], default='executemany',
+                        help='Insert with Core executemany, or COPY (PostgreSQL only)')
+    args = parser.parse_args(argv)
+    rejects = args.rejects or args.paths[0] + '.rejects.jsonl'
+    return run(args.paths, rejects, args.workers, args.chunk_size, args.method, args.format)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Compute event-window market impacts for stored geopolitical events.
+
+Usage (from the repository root):
+    python -m utils.event_impacts --prices data/prices [--event-id 3 --event-id 7]
+
+``--prices`` may point at a directory of CSV/Parquet files or at a local
+price store built with ``backend/price_store.py``.
+"""
+
+import argparse
+import os
+
+from database.database import SessionLocal
+from database.models import GeopoliticalEvent
+from database.operations import save_event_stock_impacts
+from utils.backend_path import add_backend_to_path
+
+# After the database imports, which backend/database.py would otherwise shadow
+add_backend_to_path()
+
+from analyzers.event_study import (
+    DEFAULT_WINDOWS, PRIMARY_WINDOW, RECOVERY_HORIZON,
+    load_price_history, compute_event_impacts, build_stock_impacts,
+)
+from price_store import INDEX_FILE, get_price_store
+from config import get_all_stocks, get_sector_index
+
+def load_events(event_ids=None):
+    session = SessionLocal()
+    try:
+        query = session.query(GeopoliticalEvent.id, GeopoliticalEvent.event_date).filter(
+            GeopoliticalEvent.event_date.isnot(None)
+        )
+        if event_ids:
+            query = query.filter(GeopoliticalEvent.id.in_(event_ids))
+        return query.order_by(GeopoliticalEvent.id).all()
+    finally:
+        session.close()
+
+def run(price_dir, event_ids=None, benchmark=None, primary_window=PRIMARY_WINDOW, recovery_horizon=RECOVERY_HORIZON):
+    events = load_events(event_ids)
+    if not events:
+        print("No events with an event_date to analyze")
+        return 0
+    sectors = get_sector_index().sectors
+    symbols = sorted(get_all_stocks() | ({benchmark} if benchmark else set()))
+    if os.path.exists(os.path.join(price_dir, INDEX_FILE)):
+        prices = get_price_store(price_dir).closes(symbols)
+    else:
+        prices = load_price_history(price_dir, symbols)
+    if prices.empty:
+        print(f"No price files found in {price_dir}")
+        return 0
+    if benchmark and (benchmark not in prices.columns or prices[benchmark].isna().all()):
+        raise SystemExit(f"Benchmark {benchmark} has no prices in {price_dir}")
+    impacts = compute_event_impacts(
+        prices, [e.event_date for e in events], DEFAULT_WINDOWS, recovery_horizon, benchmark
+    )
+    by_event = build_stock_impacts(impacts, sectors, DEFAULT_WINDOWS, primary_window)
+    market_impact = impacts[f"car_{primary_window}"].groupby(level="event").mean()
+    stored = 0
+    for position, event in enumerate(events):
+        sector_impacts = by_event.get(position)
+        if not sector_impacts:
+            continue
+        overall = market_impact.get(position)
+        overall = None if overall is None or overall != overall else float(overall)
+        if save_event_stock_impacts(event.id, sector_impacts, sectors, overall):
+            stored += 1
+    print(f"Stored impacts for {stored}/{len(events)} events")
+    return stored
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--prices', required=True, help='Price store directory, or a directory of CSV/Parquet price files')
+    parser.add_argument('--event-id', type=int, action='append', dest='event_ids', help='Limit to these event ids')
+    parser.add_argument('--benchmark', help='Ticker column to use as the market benchmark')
+    parser.add_argument('--primary-window', default=PRIMARY_WINDOW, choices=list(DEFAULT_WINDOWS))
+    parser.add_argument('--recovery-horizon', type=int, default=RECOVERY_HORIZON)
+    args = parser.parse_args(argv)
+    run(args.prices, args.event_ids, args.benchmark, args.primary_window, args.recovery_horizon)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Maintain the monthly partitions of news_articles.
+
+Usage (from the repository root):
+    python -m utils.partitions maintain --ahead 3 --retain-months 24
+    python -m utils.partitions maintain --hot-months 3     # SQLite: archive months older than this
+    python -m utils.partitions list
+
+On PostgreSQL (after migrations/002_partition_news_articles.sql), ``maintain``
+creates the partitions for the next ``--ahead`` months and, with
+``--retain-months``, drops the months older than that. On SQLite it moves
+months older than ``--hot-months`` into per-month archive files and applies
+the same retention to them. Run it from cron, e.g. daily.
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from database.database import IS_SQLITE
+from database.partitions import (archive_months_before, drop_partitions_before, ensure_partitions,
+                                 is_partitioned, list_partitions, month_start, next_month)
+
+def months_back(moment, months):
+    index = moment.year * 12 + moment.month - 1 - months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+def maintain(ahead=3, retain_months=None, hot_months=3):
+    now = datetime.utcnow()
+    if IS_SQLITE:
+        for month, moved in archive_months_before(months_back(now, hot_months)):
+            print(f"Archived {moved} articles from {month:%Y-%m}")
+    elif is_partitioned():
+        end = month_start(now)
+        for _ in range(ahead):
+            end = next_month(end)
+        print(f"Created {ensure_partitions(now, end)} partitions")
+    else:
+        print("news_articles is not partitioned; apply database/migrations/002_partition_news_articles.sql first")
+        return 1
+    if retain_months:
+        for month in drop_partitions_before(months_back(now, retain_months)):
+            print(f"Dropped {month:%Y-%m}")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Create, archive and drop monthly news_articles partitions')
+    commands = parser.add_subparsers(dest='command', required=True)
+    maintain_parser = commands.add_parser('maintain', help='Create upcoming partitions and apply retention')
+    maintain_parser.add_argument('--ahead', type=int, default=3, help='Months of partitions to create ahead (PostgreSQL)')
+    maintain_parser.add_argument('--retain-months', type=int, help='Drop whole months older than this')
+    maintain_parser.add_argument('--hot-months', type=int, default=3,
+                                 help='Months kept in the main database file (SQLite)')
+    commands.add_parser('list', help='List partitions (PostgreSQL) or archive files (SQLite)')
+    args = parser.parse_args(argv)
+    if args.command == 'list':
+        for month in list_partitions():
+            print(f"{month:%Y-%m}")
+        return 0
+    return maintain(args.ahead, args.retain_months, args.hot_months)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Rerun the news analyzers over stored articles, e.g. after EVENT_TYPES,
+the sentiment lexicon or the keyword lists change.
+
+Usage (from the repository root):
+    python -m utils.reprocess [--workers 4] [--batch-size 1000] [--only-unprocessed]
+    python -m utils.reprocess --restart            # ignore the checkpoint and start over
+
+Articles are streamed in primary-key order (a server-side cursor on
+PostgreSQL/MySQL, keyset pages on SQLite), analyzed by a process pool and
+written back with one executemany UPDATE per batch. After every committed
+batch the last id is saved to the checkpoint file, so an interrupted run
+resumes where it stopped. At most ``2 * workers`` batches are in flight, so
+memory stays bounded however many rows there are.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from multiprocessing import Pool
+
+from sqlalchemy import bindparam, select, or_, update
+
+from database.database import engine
+from database.models import NewsArticle
+from utils.backend_path import add_backend_to_path
+
+# After the database imports, which backend/database.py would otherwise shadow
+add_backend_to_path()
+
+DEFAULT_CHECKPOINT = 'reprocess.checkpoint.json'
+
+def analyze_texts(articles):
+    """Run the analyzers over (title, content) pairs and return the derived columns for each"""
+    from analyzers.news_processor import relevance_score, extract_countries_regions, categorize_event
+    from analyzers.sentiment import score_batch
+
+    texts = [((title or '') + ' ' + (content or '')).strip() for title, content in articles]
+    sentiment_scores, _ = score_batch(texts)
+    results = []
+    for text, sentiment_score in zip(texts, sentiment_scores):
+        countries, region = extract_countries_regions(text)
+        results.append({
+            'relevance_score': relevance_score(text),
+            'region': region,
+            'countries': sorted(countries),
+            'event_type': categorize_event(text),
+            'sentiment_score': sentiment_score,
+            'processed': True,
+        })
+    return results
+
+def analyze_text(title, content):
+    """Run the analyzers over one article and return the derived columns"""
+    return analyze_texts([(title, content)])[0]
+
+def analyze_batch(rows):
+    """Worker: run the analyzers over (id, title, content) rows and return update parameters"""
+    results = analyze_texts([(title, content) for _, title, content in rows])
+    return [dict(result, b_id=row[0]) for row, result in zip(rows, results)]
+
+def _article_query(start_id, end_id, only_unprocessed):
+    query = select(NewsArticle.id, NewsArticle.title, NewsArticle.content).where(NewsArticle.id > start_id)
+    if end_id is not None:
+        query = query.where(NewsArticle.id <= end_id)
+    if only_unprocessed:
+        query = query.where(or_(NewsArticle.processed.is_(False), NewsArticle.processed.is_(None)))
+    return query.order_by(NewsArticle.id)
+
+def iter_batches(start_id=0, batch_size=1000, end_id=None, only_unprocessed=False):
+    """Yield lists of (id, title, content) rows in primary-key order"""
+    if engine.dialect.name == 'sqlite':
+        # SQLite cannot commit the updates while a read cursor is open on
+        # another connection, so read short keyset pages instead
+        while True:
+            with engine.connect() as conn:
+                rows = conn.execute(_article_query(start_id, end_id, only_unprocessed).limit(batch_size)).all()
+            if not rows:
+                return
+            yield [tuple(r) for r in rows]
+            start_id = rows[-1][0]
+    else:
+        with engine.connect().execution_options(stream_results=True, yield_per=batch_size) as conn:
+            result = conn.execute(_article_query(start_id, end_id, only_unprocessed))
+            for rows in result.partitions():
+                yield [tuple(r) for r in rows]
+
+def write_batch(updates):
+    """Apply one batch of analyzer results in a single transaction"""
+    stmt = (
+        update(NewsArticle.__table__)
+        .where(NewsArticle.__table__.c.id == bindparam('b_id'))
+        .values(
+            relevance_score=bindparam('relevance_score'),
+            region=bindparam('region'),
+            countries=bindparam('countries'),
+            event_type=bindparam('event_type'),
+            sentiment_score=bindparam('sentiment_score'),
+            processed=bindparam('processed'),
+            updated_at=datetime.utcnow(),
+        )
+    )
+    with engine.begin() as conn:
+        conn.execute(stmt, updates)
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_checkpoint(path, state):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)  # atomic, so a crash never leaves a torn checkpoint
+
+def run(workers=None, batch_size=1000, checkpoint=DEFAULT_CHECKPOINT, restart=False,
+        only_unprocessed=False, end_id=None):
+    state = None if restart else load_checkpoint(checkpoint)
+    if state and state.get('finished'):
+        print(f"Checkpoint {checkpoint} is from a finished run; use --restart to reprocess again")
+        return 0
+    state = state or {'last_id': 0, 'rows': 0, 'started_at': datetime.utcnow().isoformat()}
+    if state['last_id']:
+        print(f"Resuming after id {state['last_id']} ({state['rows']} rows already reprocessed)")
+
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    done = 0
+    in_flight = deque()
+
+    def finish_oldest():
+        nonlocal done
+        last_id, result = in_flight.popleft()
+        updates = result.get()
+        if updates:
+            write_batch(updates)
+        done += len(updates)
+        state.update(last_id=last_id, rows=state['rows'] + len(updates), updated_at=datetime.utcnow().isoformat())
+        save_checkpoint(checkpoint, state)
+        rate = done / (time.perf_counter() - start)
+        print(f"Reprocessed up to id {last_id}: {state['rows']} rows ({rate:,.0f} rows/s)")
+
+    with Pool(workers) as pool:
+        for rows in iter_batches(state['last_id'], batch_size, end_id, only_unprocessed):
+            in_flight.append((rows[-1][0], pool.apply_async(analyze_batch, (rows,))))
+            # Results are written in submission order so the checkpoint only
+            # ever advances past fully committed batches
+            if len(in_flight) >= 2 * workers:
+                finish_oldest()
+        while in_flight:
+            finish_oldest()
+
+    state.update(finished=True, updated_at=datetime.utcnow().isoformat())
+    save_checkpoint(checkpoint, state)
+    print(f"Done: {done} rows in {time.perf_counter() - start:.1f}s")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Reprocess stored news articles with the current analyzers')
+    parser.add_argument('--workers', type=int, help='Analyzer processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows per read, analyze and update batch')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, help='Progress file used to resume')
+    parser.add_argument('--restart', action='store_true', help='Ignore an existing checkpoint')
+    parser.add_argument('--only-unprocessed', action='store_true', help='Skip articles already marked processed')
+    parser.add_argument('--end-id', type=int, help='Stop after this article id')
+    args = parser.parse_args(argv)
+    return run(args.workers, args.batch_size, args.checkpoint, args.restart, args.only_unprocessed, args.end_id)
+
+if __name__ == '__main__':
+    sys.exit(main())